@@ -0,0 +1,66 @@
+"""Find the value of a monotone scaling parameter that yields a target runtime."""
+
+import logging
+import math
+import statistics
+
+
+def get_median_runtime(runtimes):
+    """Return the median runtime. Unsolved tasks (None) count as infinitely hard."""
+    return statistics.median(math.inf if runtime is None else runtime for runtime in runtimes)
+
+
+def _get_distance(runtime, target_runtime):
+    if runtime == math.inf:
+        return math.inf
+    return abs(math.log(runtime) - math.log(target_runtime))
+
+
+def find_value_for_runtime(values, evaluate, target_runtime):
+    """
+    Search the sorted list *values* for the value whose runtime is closest to
+    *target_runtime* (in log space) and return (value, runtime).
+
+    *evaluate(value)* must return the (median) runtime for the value and
+    math.inf if the tasks could not be solved. We assume that runtimes grow
+    monotonically with the value. First, we use exponential search starting
+    from the smallest value to find an interval containing the target
+    runtime, then we bisect this interval. Each value is evaluated at most once.
+    """
+    if not values:
+        raise ValueError("no values to search")
+
+    runtimes = {}
+
+    def get_runtime(index):
+        if index not in runtimes:
+            runtimes[index] = evaluate(values[index])
+            logging.info(f"Median runtime for value {values[index]}: {runtimes[index]}")
+        return runtimes[index]
+
+    # Find smallest "too easy" and largest "too hard" index.
+    last = len(values) - 1
+    lower = -1
+    upper = len(values)
+    index = 0
+    step = 1
+    while True:
+        if get_runtime(index) >= target_runtime:
+            upper = index
+            break
+        lower = index
+        if index == last:
+            break
+        index = min(index + step, last)
+        step *= 2
+
+    while upper - lower > 1:
+        middle = (lower + upper) // 2
+        if get_runtime(middle) >= target_runtime:
+            upper = middle
+        else:
+            lower = middle
+
+    best_index = min(runtimes, key=lambda i: (_get_distance(runtimes[i], target_runtime), i))
+    logging.info(f"Evaluated {len(runtimes)} of {len(values)} values")
+    return values[best_index], runtimes[best_index]
@@ -2,19 +2,19 @@
 
 import argparse
 from collections import defaultdict
-import hashlib
-import json
+from concurrent.futures import ThreadPoolExecutor
+import os
 from pathlib import Path
-import random
-import shutil
 
 import domains
+import features
+from run_index import DEFAULT_INDEX_FILENAME, RunIndex
+import selection
 import utils
 
 
 DIR = Path(__file__).resolve().parent
 REPO = DIR.parent
-RUNTIME_BOUNDS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 50000, float("inf")]
 
 
 def parse_args():
@@ -22,35 +22,54 @@ def parse_args():
     parser.add_argument("expdir", help="Experiment directory")
     parser.add_argument("destdir", help="Destination directory for benchmarks")
     parser.add_argument("--max-tasks-per-runtime-block", type=int, default=float("inf"))
+    parser.add_argument(
+        "--selection",
+        choices=selection.SELECTION_METHODS,
+        default="random",
+        help="How to choose among the tasks of an overrepresented runtime block: "
+        "random tasks (random) or tasks that are spread over the parameter space "
+        "by farthest-point sampling (coverage). Default: %(default)s",
+    )
     parser.add_argument("--logs", action="store_true", help="Copy the planner output to destdir")
     parser.add_argument("--min-runtime", type=float, default=0., help="Minimum planner runtime")
+    parser.add_argument(
+        "--random-seed",
+        type=int,
+        default=0,
+        help="Random seed for selecting tasks (default: %(default)d)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of processes for indexing runs and threads for copying tasks (default: %(default)d)",
+    )
+    parser.add_argument(
+        "--features",
+        action="store_true",
+        help=f"Store size features of all tasks in destdir/{features.DEFAULT_FEATURE_FILENAME} "
+        "(see extract-features.py)",
+    )
+    parser.add_argument(
+        "--index",
+        default=None,
+        help=f"SQLite index of the evaluated runs, which is updated incrementally "
+        f"before selecting tasks (default: expdir/{DEFAULT_INDEX_FILENAME})",
+    )
+    parser.add_argument(
+        "--no-update",
+        action="store_true",
+        help="Select the tasks from the existing index without scanning expdir for new runs",
+    )
     return parser.parse_args()
 
 
-def _compute_md5_hash(s):
-    m = hashlib.md5()
-    m.update(s.encode("utf-8"))
-    return m.hexdigest()
-
-
-def hash_task(plan_dir):
-    with open(plan_dir / "problem.pddl") as f:
-        content = f.read()
-    return _compute_md5_hash(content)
-
-
 def record_max_values(parameters, max_domain_values):
     for key, value in parameters.items():
         if key not in max_domain_values or value > max_domain_values[key]:
             max_domain_values[key] = value
 
 
-def get_runtime_bound(runtime):
-    for bound in RUNTIME_BOUNDS:
-        if runtime <= bound:
-            return bound
-
-
 def record_runtime(domain_runtimes, bound):
     if bound not in domain_runtimes:
         domain_runtimes[bound] = 0
@@ -83,48 +102,55 @@ def main():
     args = parse_args()
     expdir = Path(args.expdir)
     destdir = Path(args.destdir)
-    properties_files = list(expdir.glob("smac-output-*/run_*/plan/*/*/properties.json"))
-    print(f"Found {len(properties_files)} properties files")
-    # Avoid bias when selecting instances.
-    random.shuffle(properties_files)
+    index = RunIndex(args.index or expdir / DEFAULT_INDEX_FILENAME)
+    if not args.no_update:
+        num_updated, num_removed = index.update(expdir, jobs=args.jobs)
+        print(f"Updated {num_updated} and removed {num_removed} entries in {index.path}")
+    runs = index.get_solved_runs(min_runtime=args.min_runtime)
+    index.close()
+    print(f"Found {len(runs)} solved tasks with runtime at least {args.min_runtime}s")
+    runs_with_problem = [run for run in runs if run.problem_hash is not None]
+    if len(runs_with_problem) < len(runs):
+        print(f"Skip {len(runs) - len(runs_with_problem)} tasks without problem file")
+    # Avoid bias when selecting instances. The runs are sorted by path, so the
+    # selection only depends on the random seed.
+    distinct_runs = selection.drop_duplicates(runs_with_problem, args.random_seed)
+    print(f"Skip {len(runs_with_problem) - len(distinct_runs)} duplicate tasks")
     max_values = defaultdict(dict)
-    seen_task_hashes = defaultdict(set)
+    for run in distinct_runs:
+        values = run.parameters.copy()
+        values["planner_runtime"] = run.runtime
+        record_max_values(values, max_values[run.domain])
+
+    selected_runs = selection.select_runs(distinct_runs, args.max_tasks_per_runtime_block, args.selection)
+    print(f"Skip {len(distinct_runs) - len(selected_runs)} tasks with overrepresented runtime")
     seen_runtimes = defaultdict(dict)
-    for properties_file in properties_files:
-        plan_dir = properties_file.parent
-        with open(properties_file) as f:
-            props = json.load(f)
-        if props["planner_exitcode"] != 0:
-            continue
-        print(f"Found {props}")
-        domain_name = props["domain"]
-        runtime = props["runtime"]
-
-        if runtime < args.min_runtime:
-            print(f"Skip easy task with runtime {runtime}")
-            continue
-
-        # Skip duplicate tasks.
-        hash = hash_task(plan_dir)
-        if hash in seen_task_hashes[domain_name]:
-            print("Skip duplicate task")
-            continue
-        else:
-            seen_task_hashes[domain_name].add(hash)
-
-        values = props["parameters"].copy()
-        values["planner_runtime"] = runtime
-        record_max_values(values, max_values[domain_name])
-
-        runtime_bound = get_runtime_bound(runtime)
-        if seen_runtimes[domain_name].get(runtime_bound, 0) >= args.max_tasks_per_runtime_block:
-            print("Skip task with overrepresented runtime")
-            continue
-        record_runtime(seen_runtimes[domain_name], runtime_bound)
-
-        domain = domains.get_domains()[domain_name]
+    for run in selected_runs:
+        record_runtime(seen_runtimes[run.domain], utils.get_runtime_bound(run.runtime))
+
+    all_domains = domains.get_domains()
+
+    def collect(run):
         utils.collect_task(
-            domain, props["parameters"], props["seed"], srcdir=plan_dir, destdir=destdir, copy_logs=args.logs)
+            all_domains[run.domain], run.parameters, run.seed, srcdir=expdir / run.plan_dir,
+            destdir=destdir, copy_logs=args.logs, write_readme=False, copy_domain=False)
+
+    # Copy shared domain files once instead of once per task.
+    for run in {run.domain: run for run in selected_runs}.values():
+        domain = all_domains[run.domain]
+        if not domain.uses_per_instance_domain_file():
+            utils.copy_domain_file(domain, run.parameters, run.seed, expdir / run.plan_dir, destdir)
+
+    print(f"Copying {len(selected_runs)} tasks")
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        # Consume the results to propagate exceptions.
+        list(executor.map(collect, selected_runs))
+    for domain_name, parameters in {run.domain: run.parameters for run in selected_runs}.items():
+        utils.write_readme_file(destdir / domain_name, parameters)
+    if args.features:
+        feature_file = destdir / features.DEFAULT_FEATURE_FILENAME
+        num_tasks, num_scanned = features.update_feature_file(destdir, feature_file, jobs=args.jobs)
+        print(f"Stored features of {num_tasks} tasks ({num_scanned} newly scanned) in {feature_file}")
 
     print_max_values(max_values)
     print_task_count(seen_runtimes)
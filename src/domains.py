@@ -5,6 +5,7 @@ import subprocess
 import sys
 
 from ConfigSpace.hyperparameters import CategoricalHyperparameter
+from ConfigSpace.hyperparameters import OrdinalHyperparameter
 from ConfigSpace.hyperparameters import UniformFloatHyperparameter
 from ConfigSpace.hyperparameters import UniformIntegerHyperparameter
 
@@ -35,12 +36,36 @@ def get_enum(name, choices, default_value=None):
     return CategoricalHyperparameter(name, choices, default_value=default_value)
 
 
+def get_ordinal(name, values, default_value=None):
+    """Use this instead of get_enum() for values ordered by difficulty (e.g., sizes).
+
+    Unlike categorical parameters, SMAC's model can exploit the ordering.
+    """
+    if default_value is None:
+        default_value = values[0]
+    return OrdinalHyperparameter(name, values, default_value=default_value)
+
+
+def get_log_int(name, lower, upper, num_values):
+    """Return an ordinal parameter with (at most) num_values integers spaced evenly on a log scale.
+
+    For floats, use get_float(..., log=True).
+    """
+    if not 1 <= lower < upper or num_values < 2:
+        raise ValueError(f"invalid log-scaled range for parameter {name}")
+    values = sorted({
+        round(lower * (upper / lower) ** (i / (num_values - 1))) for i in range(num_values)})
+    return get_ordinal(name, values)
+
+
 class Domain:
-    def __init__(self, name, generator_command, attributes, adapt_parameters=None):
+    def __init__(self, name, generator_command, attributes, adapt_parameters=None, scaling_parameter=None):
         self.name = name
         self.attributes = attributes
         self.command_template = generator_command
         self._adapt_parameters = adapt_parameters
+        # Parameter whose value (roughly) monotonically increases the task difficulty.
+        self.scaling_parameter = scaling_parameter
 
     def get_domain_file(self, generators_dir):
         return Path(generators_dir) / self.name / "domain.pddl"
@@ -73,6 +98,29 @@ class Domain:
     def uses_per_instance_domain_file(self):
         return TMP_DOMAIN in self.command_template
 
+    def uses_tmp_files(self):
+        """Return True if the generator writes to fixed files in the working directory."""
+        return TMP_PROBLEM in self.command_template or self.uses_per_instance_domain_file()
+
+    def get_attribute(self, name):
+        for attribute in self.attributes:
+            if attribute.name == name:
+                return attribute
+        raise KeyError(f"{self.name} has no parameter {name}")
+
+    def get_default_parameters(self):
+        return {attribute.name: attribute.default_value for attribute in self.attributes}
+
+
+def get_values(attribute):
+    """Return the sorted list of values that the given integer or ordinal parameter can take."""
+    if isinstance(attribute, OrdinalHyperparameter):
+        return list(attribute.sequence)
+    if not isinstance(attribute, UniformIntegerHyperparameter):
+        raise ValueError(f"cannot enumerate values of parameter {attribute.name}")
+    step_size = attribute.q or 1
+    return list(range(attribute.lower, attribute.upper + 1, step_size))
+
 
 def adapt_parameters_barman(parameters):
     if parameters["shots"] < parameters["cocktails"]:
@@ -157,6 +205,7 @@ DOMAINS = [
         "blocksworld",
         "blocksworld 4 {n} {seed}",
         [get_int("n", lower=2, upper=100)],
+        scaling_parameter="n",
     ),
     Domain(
         "childsnack",
@@ -235,11 +284,11 @@ DOMAINS = [
             #get_int("maxspace", lower=1, upper=3, step_size=1),  # 1,2,3
             #get_int("vehicles", lower=1, upper=16, step_size=1),  # 1,2,3,4,5,6,7,8,9,11,16
             #get_int("cargos", lower=2, upper=46, step_size=1),  # 2,3,4,5,6,7,8,9,10,11,13,14,15,16,18,20,22,24,34,37,39,40,44,46
-            get_enum("locations", [3,4,5,6,8,10]),
-            get_enum("maxfuel", [3,4,5,6,8,10]),
-            get_enum("maxspace", [1,2,3]),
-            get_enum("vehicles", [1,2,3,4,6,8]),
-            get_enum("cargos", [1,2,3,4,5,6,8,10,12]),
+            get_ordinal("locations", [3,4,5,6,8,10]),
+            get_ordinal("maxfuel", [3,4,5,6,8,10]),
+            get_ordinal("maxspace", [1,2,3]),
+            get_ordinal("vehicles", [1,2,3,4,6,8]),
+            get_ordinal("cargos", [1,2,3,4,5,6,8,10,12]),
             # satisficing planning
             #get_int("locations", lower=5, upper=25, step_size=5),
             #get_int("maxfuel", lower=10, upper=15, step_size=5),
@@ -268,7 +317,7 @@ DOMAINS = [
             #get_int("goals", lower=1, upper=31, step_size=3),  # IPC: 1-40
             #get_int("substances", lower=1, upper=22, step_size=3),  # IPC: 3-35
             # satisficing planning
-            get_int("reactions", lower=10, upper=1010, step_size=50),  # IPC: 12-480
+            get_log_int("reactions", lower=10, upper=1000, num_values=21),  # IPC: 12-480
             get_int("goals", lower=10, upper=90, step_size=10),  # IPC: 1-40
             get_int("substances", lower=10, upper=80, step_size=10),  # IPC: 3-35
         ],
@@ -281,6 +330,7 @@ DOMAINS = [
             get_enum("block_type", ["1", "2", "3", "4"], "1"),
         ],
         adapt_parameters=adapt_parameters_tetris,
+        scaling_parameter="rows",
     ),
     Domain(
         "tidybot",
@@ -357,6 +407,7 @@ DOMAINS = [
         [
             get_int("locations", lower=2, upper=20),
         ],
+        scaling_parameter="locations",
     ),
     Domain(
         "visitall",
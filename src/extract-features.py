@@ -0,0 +1,40 @@
+#! /usr/bin/env python3
+
+"""Extract size features of the tasks in a benchmark directory.
+
+The features (numbers of objects, init facts, goal atoms, predicates and
+actions, and file sizes) are stored in a compressed NumPy file. Only tasks
+without stored features are scanned.
+"""
+
+import argparse
+import os
+from pathlib import Path
+
+import features
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("benchmarks_dir", help="directory with PDDL tasks, e.g., created by generate-instances.py")
+    parser.add_argument(
+        "--output",
+        default=None,
+        help=f"feature file (default: benchmarks_dir/{features.DEFAULT_FEATURE_FILENAME})",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="number of worker processes for scanning tasks (default: %(default)d)",
+    )
+    args = parser.parse_args()
+
+    benchmarks_dir = Path(args.benchmarks_dir)
+    feature_file = args.output or benchmarks_dir / features.DEFAULT_FEATURE_FILENAME
+    num_tasks, num_scanned = features.update_feature_file(benchmarks_dir, feature_file, jobs=args.jobs)
+    print(f"Stored features of {num_tasks} tasks ({num_scanned} newly scanned) in {feature_file}")
+
+
+if __name__ == "__main__":
+    main()
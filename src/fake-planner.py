@@ -0,0 +1,41 @@
+#! /usr/bin/env python3
+
+"""Stand-in for a real planner for testing the search locally.
+
+Use it with --planner-backend=local. It burns CPU time proportional to the
+number of init facts and goal atoms of the task and writes a dummy plan.
+Like real planners, it is killed when it exceeds the CPU time limit.
+"""
+
+import argparse
+import os
+import time
+
+import pddl_scanner
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("domain", help="path to domain file")
+    parser.add_argument("problem", help="path to problem file")
+    parser.add_argument("plan", help="path to plan file")
+    parser.add_argument(
+        "--seconds-per-atom",
+        type=float,
+        default=float(os.environ.get("FAKE_PLANNER_SECONDS_PER_ATOM", 0.001)),
+        help="CPU time per init fact and goal atom "
+        "(default: $FAKE_PLANNER_SECONDS_PER_ATOM or 0.001)",
+    )
+    args = parser.parse_args()
+
+    _, num_init_facts, num_goal_atoms = pddl_scanner.scan_problem(args.problem)
+    cpu_time = (num_init_facts + num_goal_atoms) * args.seconds_per_atom
+    while time.process_time() < cpu_time:
+        pass
+    with open(args.plan, "w") as f:
+        print("; fake plan", file=f)
+    print("Solution found.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Extract size features of PDDL tasks and store them in a columnar .npz file.
+
+The file contains an array "task" with the paths of the problem files
+relative to the benchmark directory and one integer array per feature.
+Features of tasks that cannot be scanned are -1. The array "file_key" holds
+the sizes and modification times of the problem and domain files, so that
+changed files are scanned again.
+"""
+
+import multiprocessing
+import os
+from pathlib import Path
+
+import numpy as np
+
+import pddl_scanner
+import task_finder
+
+
+DEFAULT_FEATURE_FILENAME = "features.npz"
+PROBLEM_FEATURES = ["objects", "init_facts", "goal_atoms", "problem_bytes"]
+DOMAIN_FEATURES = ["domain_predicates", "domain_actions", "domain_bytes"]
+FEATURES = PROBLEM_FEATURES + DOMAIN_FEATURES
+
+# Features of domain files, indexed by path. Each worker process has its own cache.
+_DOMAIN_FEATURES = {}
+
+
+def get_domain_features(domain_file):
+    domain_file = str(domain_file)
+    if domain_file not in _DOMAIN_FEATURES:
+        num_predicates = 0
+        num_actions = 0
+        for keyword, elements in pddl_scanner.parse_sections(domain_file):
+            if keyword == ":predicates":
+                num_predicates += len(elements)
+            elif keyword in [":action", ":durative-action"]:
+                num_actions += 1
+        _DOMAIN_FEATURES[domain_file] = (num_predicates, num_actions, os.path.getsize(domain_file))
+    return _DOMAIN_FEATURES[domain_file]
+
+
+def extract_features(domain_file, problem_file):
+    """Return the values of FEATURES for the task."""
+    num_objects, num_init_facts, num_goal_atoms = pddl_scanner.scan_problem(problem_file)
+    return (
+        num_objects, num_init_facts, num_goal_atoms, os.path.getsize(problem_file)
+    ) + get_domain_features(domain_file)
+
+
+def try_to_extract_features(indexed_files):
+    """Return (index, features) or (index, None) if the task cannot be scanned."""
+    index, (domain_file, problem_file) = indexed_files
+    try:
+        return index, extract_features(domain_file, problem_file)
+    except (OSError, pddl_scanner.PDDLError):
+        return index, None
+
+
+def load_features(feature_file):
+    """Return the task keys and a dict mapping each feature to its array."""
+    with np.load(feature_file) as data:
+        return [str(key) for key in data["task"]], {name: data[name] for name in FEATURES}
+
+
+def _load_file_keys(feature_file):
+    with np.load(feature_file) as data:
+        if "file_key" not in data:
+            # Files written by older versions have no file keys.
+            return None
+        return [str(key) for key in data["file_key"]]
+
+
+def save_features(feature_file, keys, columns, file_keys):
+    np.savez_compressed(
+        feature_file, task=np.array(keys, dtype=str), file_key=np.array(file_keys, dtype=str), **columns)
+
+
+def update_feature_file(benchmarks_dir, feature_file, jobs=None):
+    """Extract the features of all tasks below benchmarks_dir that are missing in feature_file.
+
+    Tasks whose problem or domain file changed are scanned again and entries
+    of tasks that no longer exist are dropped. Return the numbers of tasks
+    and of newly scanned tasks.
+    """
+    benchmarks_dir = Path(benchmarks_dir)
+    feature_file = Path(feature_file)
+    old_rows = {}
+    if feature_file.is_file():
+        old_keys, old_columns = load_features(feature_file)
+        old_file_keys = _load_file_keys(feature_file)
+        if old_file_keys is not None:
+            old_matrix = np.column_stack([old_columns[name] for name in FEATURES])
+            old_rows = dict(zip(old_keys, zip(old_file_keys, old_matrix)))
+
+    keys = []
+    file_keys = []
+    rows = []
+    new_keys = []
+    new_file_keys = []
+    new_files = []
+    for task in task_finder.find_tasks([benchmarks_dir]):
+        key = str(task.problem_file.relative_to(benchmarks_dir))
+        file_key = "/".join(task.get_file_keys())
+        old_file_key, old_row = old_rows.get(key, (None, None))
+        if file_key == old_file_key:
+            keys.append(key)
+            file_keys.append(file_key)
+            rows.append(old_row)
+        else:
+            new_keys.append(key)
+            new_file_keys.append(file_key)
+            new_files.append((str(task.domain_file), str(task.problem_file)))
+
+    if new_files:
+        new_rows = [None] * len(new_files)
+        with multiprocessing.Pool(jobs) as pool:
+            for index, features in pool.imap_unordered(
+                    try_to_extract_features, enumerate(new_files), chunksize=16):
+                new_rows[index] = features or (-1,) * len(FEATURES)
+        keys.extend(new_keys)
+        file_keys.extend(new_file_keys)
+        rows.extend(new_rows)
+
+    matrix = np.array(rows, dtype=np.int64).reshape(len(rows), len(FEATURES))
+    save_features(feature_file, keys, {name: matrix[:, i] for i, name in enumerate(FEATURES)}, file_keys)
+    return len(keys), len(new_keys)
@@ -3,94 +3,162 @@
 """Find duplicate PDDL instances."""
 
 import argparse
-from collections import defaultdict
-import hashlib
+from collections import defaultdict, deque
+import multiprocessing
+import os
 from pathlib import Path
 import shlex
-import subprocess
-import sys
-
-
-DIR = Path(__file__).resolve().parent
-
-
-def hash_unparsed_task(task):
-    m = hashlib.md5()
-    for path in [task.domain_file, task.problem_file]:
-        with path.open() as f:
-            m.update(f.read().encode("utf-8"))
-    return m.hexdigest()
-
-
-def parse_pddl_and_hash_task(task):
-    return subprocess.check_output(
-        [sys.executable, DIR / "hash-instance.py", str(task.domain_file), str(task.problem_file)],
-        encoding="utf-8")
-
-
-def find_tasks(paths):
-    for path in paths:
-        path = Path(path)
-        if path.is_file() and path.suffix == ".pddl" and "domain" not in path.name:
-            yield Task(path)
-        elif path.is_dir():
-            yield from find_tasks(list(path.iterdir()))
-
-
-def find_file(filenames, dir: Path):
-    for filename in filenames:
-        path = dir / filename
-        if path.is_file():
-            return path
-    raise OSError(f"none found in {dir!r}: {filenames!r}")
-
-
-def find_domain_file(task_path: Path):
-    domain_basenames = [
-        "domain.pddl",
-        task_path.stem + "-domain" + task_path.suffix,
-        task_path.stem[:3] + "-domain.pddl",  # for airport and psr-small
-        "domain_" + task_path.name,
-        "domain-" + task_path.name,
-    ]
-    return find_file(domain_basenames, task_path.parent)
-
-
-class Task:
-    def __init__(self, path):
-        self.problem_file = path
-        self.domain_file = find_domain_file(path)
-
-    def __lt__(self, other):
-        return self.problem_file < other.problem_file
-
-    def __le__(self, other):
-        return self.problem_file <= other.problem_file
-
-    def __repr__(self):
-        return str(self)
-
-    def __str__(self):
-        return f"<Task {self.problem_file}>"
-
-
-def get_equivalent_problems(tasks, hash_unparsed_files):
-    equivalent_tasks = defaultdict(list)
-    for index, task in enumerate(tasks, start=1):
-        if index % 100 == 0:
-            print(f"Hashing task {index}/{len(tasks)}")
-        if hash_unparsed_files:
-            hash = hash_unparsed_task(task)
-        else:
-            try:
-                hash = parse_pddl_and_hash_task(task)
-            except subprocess.CalledProcessError as err:
-                print(f"Task couldn't be parsed: {get_relative_path(task.problem_file)}")
+import time
+
+import fingerprint
+from hash_cache import DEFAULT_CACHE_FILE, HashCache
+import hashing
+import near_duplicates
+from task_finder import find_tasks
+
+
+# Number of uncached tasks that we send to a worker process at once.
+BATCH_SIZE = 64
+
+
+def process_tasks(func, tasks, jobs, cache, kind):
+    """Apply func to the task files in parallel and yield (task, result) pairs.
+
+    *tasks* may be a lazy iterable. Uncached tasks are sent to the worker
+    processes in batches while the remaining tasks are still being found.
+    Cached values for the given kind are reused and new values are stored.
+    """
+    num_tasks = 0
+    num_cached = 0
+    pending = deque()
+
+    def get_results(batch, async_result):
+        for index, value in async_result.get():
+            task = batch[index]
+            if cache and value is not None:
+                cache.put(task, kind, value)
+            yield task, value
+
+    with multiprocessing.Pool(jobs) as pool:
+
+        def submit(batch):
+            files = [(str(task.domain_file), str(task.problem_file)) for task in batch]
+            pending.append((batch, pool.map_async(func, enumerate(files))))
+
+        batch = []
+        for task in tasks:
+            num_tasks += 1
+            value = cache.get(task, kind) if cache else None
+            if value is not None:
+                num_cached += 1
+                yield task, value
                 continue
+            batch.append(task)
+            if len(batch) == BATCH_SIZE:
+                submit(batch)
+                batch = []
+            while pending and pending[0][1].ready():
+                yield from get_results(*pending.popleft())
+        if batch:
+            submit(batch)
+        if cache:
+            print(f"Found {num_tasks} tasks, {num_cached} with cached {kind} values")
+        else:
+            print(f"Found {num_tasks} tasks")
+        while pending:
+            yield from get_results(*pending.popleft())
+
+
+def parse_pddl_and_hash_tasks(tasks, jobs, cache):
+    """Hash tasks in parallel and yield (task, hash) pairs in completion order.
+
+    Each worker process caches the hashes of the domain files. The hash is
+    None for tasks that cannot be parsed.
+    """
+    return process_tasks(hashing.try_to_hash_task, tasks, jobs, cache, "parsed")
+
+
+def get_duplicate_candidates(tasks, jobs, cache):
+    """Return the tasks that share their cheap signature with at least one other task.
+
+    Tasks with different signatures cannot have the same hash. Tasks that
+    cannot be scanned are always returned.
+    """
+    tasks_by_signature = defaultdict(list)
+    for task, signature in process_tasks(
+            hashing.try_to_compute_signature, tasks, jobs, cache, "signature"):
+        tasks_by_signature[signature].append(task)
+    candidates = []
+    for signature, bucket in tasks_by_signature.items():
+        if signature is None or len(bucket) > 1:
+            candidates.extend(bucket)
+    return sorted(candidates)
+
+
+def get_renaming_invariant_classes(tasks, jobs, cache):
+    """Group tasks by fingerprint and split each group into classes of isomorphic tasks."""
+    fingerprinted_tasks = process_tasks(
+        fingerprint.try_to_compute_fingerprint, tasks, jobs, cache, "renaming-invariant")
+    groups = [sorted(group) for group in get_hash_groups(fingerprinted_tasks) if len(group) > 1]
+    print(f"Checking {len(groups)} groups of tasks with equal fingerprints")
+    group_files = [
+        [(str(task.domain_file), str(task.problem_file)) for task in group] for group in groups]
+    classes = []
+    with multiprocessing.Pool(jobs) as pool:
+        for index, partition in pool.imap_unordered(
+                fingerprint.try_to_partition_group, enumerate(group_files)):
+            classes.extend([groups[index][i] for i in cls] for cls in partition)
+    return classes
+
+
+def get_near_duplicate_clusters(tasks, jobs, cache, threshold):
+    sketched_tasks = []
+    domain_hashes = []
+    sketches = []
+    for task, value in process_tasks(near_duplicates.try_to_compute_sketch, tasks, jobs, cache, "minhash"):
+        if value is None:
+            print(f"Task couldn't be parsed: {get_relative_path(task.problem_file)}")
+            continue
+        domain_hash, sketch = value
+        sketched_tasks.append(task)
+        domain_hashes.append(domain_hash)
+        sketches.append(sketch)
+    print(f"Computed MinHash sketches for {len(sketched_tasks)} tasks")
+    clusters = near_duplicates.find_clusters(domain_hashes, sketches, threshold)
+    return [[sketched_tasks[index] for index in cluster] for cluster in clusters]
+
+
+def get_hash_groups(hashed_tasks):
+    equivalent_tasks = defaultdict(list)
+    start_time = time.perf_counter()
+    num_hashed = 0
+    for task, hash in hashed_tasks:
+        num_hashed += 1
+        if num_hashed % 100 == 0:
+            elapsed = time.perf_counter() - start_time
+            print(f"Hashed {num_hashed} tasks ({num_hashed / max(elapsed, 1e-9):.1f} tasks/s)")
+        if hash is None:
+            print(f"Task couldn't be parsed: {get_relative_path(task.problem_file)}")
+            continue
         equivalent_tasks[hash].append(task)
+    print(f"Hashed {num_hashed} tasks in {time.perf_counter() - start_time:.1f}s")
     return equivalent_tasks.values()
 
 
+def get_equivalent_problems(tasks, mode, jobs, cache, threshold):
+    if mode == "near-duplicates":
+        return get_near_duplicate_clusters(tasks, jobs, cache, threshold)
+    elif mode == "renaming-invariant":
+        return get_renaming_invariant_classes(tasks, jobs, cache)
+    elif mode == "raw":
+        hashed_tasks = process_tasks(hashing.try_to_hash_unparsed_task, tasks, jobs, cache, "raw")
+    else:
+        tasks = get_duplicate_candidates(tasks, jobs, cache)
+        print(f"{len(tasks)} tasks share their signature with other tasks")
+        hashed_tasks = parse_pddl_and_hash_tasks(tasks, jobs, cache)
+    return get_hash_groups(hashed_tasks)
+
+
 def get_relative_path(path):
     try:
         return path.relative_to(Path.cwd())
@@ -131,17 +199,55 @@ def main():
         nargs="+",
         help="one or more paths to PDDL files or directories containing PDDL files",
     )
+    parser.add_argument(
+        "--mode",
+        choices=["parsed", "raw", "renaming-invariant", "near-duplicates"],
+        default="parsed",
+        help="compare tasks based on the hash of the parsed task (parsed), "
+        "the MD5 hash of the unparsed file contents, which is faster but less "
+        "accurate (raw), a fingerprint that ignores object names, followed "
+        "by an exact isomorphism check (renaming-invariant), or the estimated "
+        "Jaccard similarity of their init facts and goal atoms (near-duplicates). "
+        "Default: %(default)s",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.9,
+        help="minimum Jaccard similarity for --mode=near-duplicates (default: %(default)s)",
+    )
     parser.add_argument(
         "--raw",
+        dest="mode",
+        action="store_const",
+        const="raw",
+        help="same as --mode=raw",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="number of worker processes for parsing and hashing tasks (default: %(default)d)",
+    )
+    parser.add_argument(
+        "--cache",
+        default=DEFAULT_CACHE_FILE,
+        help="SQLite file for caching hashes across runs (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-cache",
         action="store_true",
-        help="compare tasks based on the MD5 hash of the unparsed file contents (this is faster but less accurate)",
+        help="neither read nor write cached hashes",
     )
     args = parser.parse_args()
 
-    tasks = list(find_tasks(args.paths))
-    print(f"Found {len(tasks)} tasks")
-    equivalence_partition = get_equivalent_problems(tasks, args.raw)
+    cache = None if args.no_cache else HashCache(args.cache, hashing.VERSIONS)
+    tasks = find_tasks(args.paths)
+    equivalence_partition = get_equivalent_problems(tasks, args.mode, args.jobs, cache, args.threshold)
+    if cache:
+        cache.close()
     print_duplicates(equivalence_partition)
 
 
-main()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""Compute task fingerprints that are invariant under renaming objects.
+
+We view a task as a graph whose nodes are the objects and facts (init
+facts, goal atoms and metric) of the problem file. Each fact node has a
+label (e.g., "init ( on ? ? )") and edges to its object arguments. Colour
+refinement (1-dimensional Weisfeiler-Leman) assigns each node a colour
+that only depends on the graph structure, so the multiset of final colours
+is a fingerprint that ignores object names. Different tasks can share a
+fingerprint, so find_isomorphism() checks candidates exactly.
+"""
+
+from collections import defaultdict
+import hashlib
+
+import hashing
+import pddl_scanner
+
+
+# Goal formulas are compared as sets of atoms, each labelled with the path
+# of connectives leading to it.
+GOAL_CONNECTIVES = ["or", "not", "imply"]
+GOAL_QUANTIFIERS = ["forall", "exists"]
+
+
+class ObjectGraph:
+    def __init__(self, objects, facts):
+        # Map from object names to their declared types.
+        self.objects = objects
+        # Set of (label, arguments) pairs.
+        self.facts = facts
+
+
+def _get_stable_hash(value):
+    return hashlib.blake2b(repr(value).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _split_atom(atom, objects):
+    """Replace the objects in an atom by "?" and return (label, objects)."""
+    label = []
+    args = []
+
+    def visit(part, is_head):
+        if isinstance(part, tuple):
+            label.append("(")
+            for index, subpart in enumerate(part):
+                visit(subpart, index == 0)
+            label.append(")")
+        elif part in objects and not is_head:
+            label.append("?")
+            args.append(part)
+        else:
+            label.append(part)
+
+    visit(atom, False)
+    return " ".join(label), tuple(args)
+
+
+def _iter_goal_atoms(formula, path):
+    head = formula[0] if isinstance(formula, tuple) and formula else None
+    if head == "and":
+        for subformula in formula[1:]:
+            yield from _iter_goal_atoms(subformula, path)
+    elif head in GOAL_CONNECTIVES:
+        for index, subformula in enumerate(formula[1:]):
+            yield from _iter_goal_atoms(subformula, path + (f"{head}{index}",))
+    elif head in GOAL_QUANTIFIERS and len(formula) == 3:
+        yield from _iter_goal_atoms(formula[2], path + (head, repr(formula[1])))
+    else:
+        yield path, formula
+
+
+def build_object_graph(problem_file):
+    object_names = []
+    init = []
+    goals = []
+    metric = []
+    for keyword, element in pddl_scanner.iter_sections(problem_file):
+        if keyword == ":objects":
+            object_names.append(element)
+        elif keyword == ":init":
+            init.append(element)
+        elif keyword == ":goal":
+            goals.append(element)
+        elif keyword == ":metric":
+            metric.append(element)
+
+    objects = {
+        name: hashing.canonicalize(object_type)
+        for name, object_type in pddl_scanner.iter_typed_list(object_names)}
+
+    facts = set()
+    for fact in init:
+        label, args = _split_atom(fact, objects)
+        facts.add(("init " + label, args))
+    for goal in goals:
+        for path, atom in _iter_goal_atoms(goal, ()):
+            label, args = _split_atom(atom, objects)
+            facts.add((" ".join(("goal",) + path + (label,)), args))
+    label, args = _split_atom(tuple(metric), objects)
+    facts.add(("metric " + label, args))
+    return ObjectGraph(objects, facts)
+
+
+def compute_colours(graph):
+    """Run colour refinement until the partition of the objects is stable."""
+    colours = {obj: _get_stable_hash(("object", obj_type)) for obj, obj_type in graph.objects.items()}
+    facts = sorted(graph.facts)
+    fact_labels = [_get_stable_hash(("fact", label)) for label, _ in facts]
+    occurrences = defaultdict(list)
+    for index, (_, args) in enumerate(facts):
+        for position, arg in enumerate(args):
+            occurrences[arg].append((index, position))
+
+    num_colours = len(set(colours.values()))
+    while True:
+        fact_colours = [
+            _get_stable_hash((fact_labels[index], tuple(colours[arg] for arg in args)))
+            for index, (_, args) in enumerate(facts)]
+        colours = {
+            obj: _get_stable_hash((colour, sorted(
+                (fact_colours[index], position) for index, position in occurrences[obj])))
+            for obj, colour in colours.items()}
+        new_num_colours = len(set(colours.values()))
+        if new_num_colours == num_colours:
+            return colours, fact_colours
+        num_colours = new_num_colours
+
+
+def compute_fingerprint(domain_file, problem_file):
+    object_colours, fact_colours = compute_colours(build_object_graph(problem_file))
+    return _get_stable_hash((
+        hashing.get_domain_file_hash(domain_file),
+        sorted(object_colours.values()),
+        sorted(fact_colours)))
+
+
+def find_isomorphism(graph1, graph2, max_steps=100000):
+    """
+    Return a mapping from the objects of graph1 to the objects of graph2
+    that maps the facts of graph1 to the facts of graph2, or None if there
+    is no such mapping or we cannot find one within *max_steps*.
+    """
+    if len(graph1.objects) != len(graph2.objects) or len(graph1.facts) != len(graph2.facts):
+        return None
+    if {fact for fact in graph1.facts if not fact[1]} != {fact for fact in graph2.facts if not fact[1]}:
+        return None
+    colours1, _ = compute_colours(graph1)
+    colours2, _ = compute_colours(graph2)
+    if sorted(colours1.values()) != sorted(colours2.values()):
+        return None
+    if not colours1:
+        return {}
+
+    candidates = defaultdict(list)
+    for obj, colour in sorted(colours2.items()):
+        candidates[colour].append(obj)
+    facts_by_object = defaultdict(list)
+    for label, args in graph1.facts:
+        for arg in set(args):
+            facts_by_object[arg].append((label, args))
+    # Map objects with few candidates first.
+    order = sorted(colours1, key=lambda obj: (len(candidates[colours1[obj]]), obj))
+
+    mapping = {}
+    used = set()
+
+    def is_consistent(obj):
+        for label, args in facts_by_object[obj]:
+            if all(arg in mapping for arg in args):
+                if (label, tuple(mapping[arg] for arg in args)) not in graph2.facts:
+                    return False
+        return True
+
+    # Iterative backtracking search: one candidate iterator per mapped object.
+    steps = 0
+    stack = [iter(candidates[colours1[order[0]]])]
+    while stack:
+        obj = order[len(stack) - 1]
+        if obj in mapping:
+            used.remove(mapping.pop(obj))
+        for image in stack[-1]:
+            if image in used:
+                continue
+            steps += 1
+            if steps > max_steps:
+                return None
+            mapping[obj] = image
+            used.add(image)
+            if is_consistent(obj):
+                break
+            used.remove(mapping.pop(obj))
+        else:
+            stack.pop()
+            continue
+        if len(stack) == len(order):
+            return mapping
+        stack.append(iter(candidates[colours1[order[len(stack)]]]))
+    return None
+
+
+def try_to_compute_fingerprint(indexed_files):
+    """Return (index, fingerprint) or (index, None) if the task cannot be scanned."""
+    index, (domain_file, problem_file) = indexed_files
+    try:
+        return index, compute_fingerprint(domain_file, problem_file)
+    except (OSError, pddl_scanner.PDDLError):
+        return index, None
+
+
+def try_to_partition_group(indexed_group):
+    """Partition a group of tasks with equal fingerprints into classes of isomorphic tasks.
+
+    Return (index, partition), where the partition is a list of lists of
+    task indices. Tasks are only compared to the first task of each class.
+    """
+    index, files = indexed_group
+    graphs = [build_object_graph(problem_file) for _, problem_file in files]
+    partition = []
+    for task_index, graph in enumerate(graphs):
+        for cls in partition:
+            if find_isomorphism(graphs[cls[0]], graph) is not None:
+                cls.append(task_index)
+                break
+        else:
+            partition.append([task_index])
+    return index, partition
@@ -10,6 +10,8 @@ import ConfigSpace
 from ConfigSpace.util import generate_grid
 
 import domains
+import seen_tasks
+import syntax_check
 import utils
 
 
@@ -38,27 +40,65 @@ def parse_args():
         help="Number of random seeds used for each parameter configuration (default: %(default)d)",
     )
 
+    parser.add_argument(
+        "--max-seed-redraws",
+        type=int,
+        default=10,
+        help="Generated tasks that are duplicates of previously generated tasks are "
+        "skipped and replaced by tasks generated with new random seeds. Give up on a "
+        "parameter configuration after this many duplicates (default: %(default)d)",
+    )
+
     return parser.parse_args()
 
 
-def generate_task(generators_dir, domain, cfg, seed, tmp_dir, output_dir, time_limit=None):
-    try:
-        cfg = domain.adapt_parameters(cfg)
-    except domains.IllegalConfiguration as err:
-        logging.warning(f"Skipping illegal configuration {cfg}: {err}")
-        return
-
+def generate_task(generators_dir, domain, cfg, seed, tmp_dir, time_limit=None):
+    """Generate a task in tmp_dir and return its plan dir or None on failure."""
     logging.info(f"Create instance for configuration {cfg} with seed {seed}")
     try:
         plan_dir = utils.generate_input_files(generators_dir, domain, cfg, seed, tmp_dir, timeout=time_limit)
     except subprocess.CalledProcessError as err:
         logging.error(f"Failed to generate task: {err}")
-        return
+        return None
     except subprocess.TimeoutExpired as err:
         logging.error(f"Failed to generate task: {err}")
+        return None
+    error = syntax_check.try_to_check_generated_task(plan_dir)
+    if error:
+        logging.error(f"Generator produced malformed task: {error}")
+        return None
+    return plan_dir
+
+
+def generate_tasks(args, generators_dir, domain, cfg, tmp_dir, output_dir, seen_hashes):
+    """Generate and collect tasks for --num-random-seeds seeds, redrawing seeds for duplicates."""
+    try:
+        cfg = domain.adapt_parameters(cfg)
+    except domains.IllegalConfiguration as err:
+        logging.warning(f"Skipping illegal configuration {cfg}: {err}")
         return
 
-    utils.collect_task(domain, cfg, seed, srcdir=plan_dir, destdir=output_dir, copy_logs=False)
+    num_seeds = 0
+    num_redraws = 0
+    seed = 0
+    while num_seeds < args.num_random_seeds:
+        plan_dir = generate_task(
+            generators_dir, domain, cfg, seed, tmp_dir, time_limit=args.generator_time_limit)
+        if plan_dir:
+            task_hash = seen_tasks.try_to_hash_generated_task(plan_dir)
+            if task_hash in seen_hashes:
+                if num_redraws == args.max_seed_redraws:
+                    logging.warning(f"Giving up on configuration {cfg} after {num_redraws} duplicates")
+                    return
+                logging.info(f"Skipping duplicate task for configuration {cfg} with seed {seed}")
+                num_redraws += 1
+                seed += 1
+                continue
+            if task_hash:
+                seen_hashes.add(task_hash)
+            utils.collect_task(domain, cfg, seed, srcdir=plan_dir, destdir=output_dir, copy_logs=False)
+        num_seeds += 1
+        seed += 1
 
 
 def main():
@@ -79,12 +119,9 @@ def main():
     print(f"Number of configurations: {len(grid)}")
     if args.dry_run:
         return
+    seen_hashes = set()
     for cfg in grid:
-        cfg = cfg.get_dictionary()
-        for seed in range(args.num_random_seeds):
-            generate_task(
-                generators_dir, domain, cfg, seed, tmp_dir, destdir,
-                time_limit=args.generator_time_limit)
+        generate_tasks(args, generators_dir, domain, cfg.get_dictionary(), tmp_dir, destdir, seen_hashes)
     shutil.rmtree(tmp_dir, ignore_errors=False)
 
 
@@ -0,0 +1,72 @@
+"""Persistent record of the tasks whose generation failed."""
+
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+
+
+class GeneratorFailures:
+    """
+    Remember (domain, cfg, seed) combinations for which the generator failed,
+    timed out or produced a malformed task.
+
+    Records are appended to a JSON lines file. Runs sharing the file pick up
+    each other's records on the next lookup.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._records = {}
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_key(domain, cfg, seed):
+        return domain, json.dumps(cfg, sort_keys=True), int(seed)
+
+    def _read_new_records(self):
+        try:
+            if os.path.getsize(self.path) == self._offset:
+                return
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        # Ignore a partially written last line.
+        complete = data[:data.rfind(b"\n") + 1]
+        self._offset += len(complete)
+        for line in complete.decode("utf-8").splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A run may have been killed while writing.
+                logging.warning(f"Ignoring corrupt line in {self.path}: {line}")
+                continue
+            self._records[self._get_key(record["domain"], record["parameters"], record["seed"])] = record
+
+    def get(self, domain, cfg, seed, time_limit=None):
+        """Return the reason why generating the task failed before or None.
+
+        Timeouts only count if they happened with at least the given time limit.
+        """
+        with self._lock:
+            self._read_new_records()
+            record = self._records.get(self._get_key(domain, cfg, seed))
+        if record is None:
+            return None
+        if record["timeout"] is not None and (time_limit is None or time_limit > record["timeout"]):
+            return None
+        return record["reason"]
+
+    def add(self, domain, cfg, seed, reason, timeout=None):
+        """Record a failure. Pass the time limit as *timeout* if the generator timed out."""
+        record = {"domain": domain, "parameters": cfg, "seed": int(seed), "reason": reason, "timeout": timeout}
+        line = json.dumps(record, sort_keys=True) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(line)
+            self._records[self._get_key(domain, cfg, seed)] = record
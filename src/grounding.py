@@ -0,0 +1,87 @@
+"""Estimate the size of the grounded task from the types of its objects.
+
+We count the objects of each type (including the objects of subtypes) and
+assume that each predicate and action is instantiated with all
+type-consistent combinations of objects. Planners that only instantiate
+reachable atoms and actions need less, but the estimate is cheap and
+catches tasks whose grounding cannot fit into memory.
+"""
+
+from collections import defaultdict
+import math
+
+import pddl_scanner
+
+
+ACTION_KEYWORDS = [":action", ":durative-action"]
+
+
+class DomainSignature:
+    def __init__(self, supertypes, constants, predicates, actions):
+        # Map from each type to its direct supertype.
+        self.supertypes = supertypes
+        # List of (name, type) pairs.
+        self.constants = constants
+        # Lists of parameter types, one list per predicate or action.
+        self.predicates = predicates
+        self.actions = actions
+
+
+def _get_parameter_types(parameters):
+    return [parameter_type for _, parameter_type in pddl_scanner.iter_typed_list(parameters)]
+
+
+def parse_domain(domain_file):
+    supertypes = {}
+    constants = []
+    predicates = []
+    actions = []
+    for keyword, elements in pddl_scanner.parse_sections(domain_file):
+        if keyword == ":types":
+            supertypes.update(pddl_scanner.iter_typed_list(elements))
+        elif keyword == ":constants":
+            constants.extend(pddl_scanner.iter_typed_list(elements))
+        elif keyword == ":predicates":
+            predicates.extend(_get_parameter_types(predicate[1:]) for predicate in elements)
+        elif keyword in ACTION_KEYWORDS:
+            elements = list(elements)
+            if ":parameters" in elements[:-1]:
+                actions.append(_get_parameter_types(elements[elements.index(":parameters") + 1]))
+            else:
+                actions.append([])
+    return DomainSignature(supertypes, constants, predicates, actions)
+
+
+def count_objects_by_type(domain, objects):
+    """Return a mapping from each type to the number of its objects (including those of subtypes)."""
+    counts = defaultdict(int)
+    for _, object_type in objects:
+        types = {"object"}
+        # Supertypes of the form (either t1 t2) are ignored.
+        while not isinstance(object_type, tuple) and object_type not in types:
+            types.add(object_type)
+            object_type = domain.supertypes.get(object_type, "object")
+        for object_type in types:
+            counts[object_type] += 1
+    return counts
+
+
+def _count_instantiations(parameter_types, counts):
+    def get_count(parameter_type):
+        if isinstance(parameter_type, tuple) and parameter_type[:1] == ("either",):
+            return sum(counts[option] for option in parameter_type[1:])
+        return counts[parameter_type]
+
+    return math.prod(get_count(parameter_type) for parameter_type in parameter_types)
+
+
+def estimate_grounding_size(domain_file, problem_file):
+    """Return upper bounds for the numbers of ground atoms and ground actions."""
+    domain = parse_domain(domain_file)
+    object_names = [
+        element for keyword, element in pddl_scanner.iter_sections(problem_file) if keyword == ":objects"]
+    objects = domain.constants + list(pddl_scanner.iter_typed_list(object_names))
+    counts = count_objects_by_type(domain, objects)
+    num_atoms = sum(_count_instantiations(types, counts) for types in domain.predicates)
+    num_actions = sum(_count_instantiations(types, counts) for types in domain.actions)
+    return num_atoms, num_actions
@@ -0,0 +1,72 @@
+"""Persistent cache for task hashes and signatures."""
+
+import json
+from pathlib import Path
+import sqlite3
+
+
+DEFAULT_CACHE_FILE = Path.home() / ".cache" / "batch-pddl-generator" / "task-hashes.sqlite"
+
+
+class HashCache:
+    """
+    Store one value per (problem file, domain file, kind) in an SQLite
+    database. Entries are only returned if the size and modification time of
+    both files and the version of the hashing logic are unchanged.
+
+    *versions* maps each kind (e.g., "raw" or "parsed") to the version of
+    the code that computes it. Bump the version whenever the hashing logic
+    changes to invalidate old entries.
+    """
+
+    def __init__(self, path, versions):
+        self.path = Path(path)
+        self.versions = versions
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            "problem_file TEXT, domain_file TEXT, kind TEXT, "
+            "problem_key TEXT, domain_key TEXT, version TEXT, value TEXT, "
+            "PRIMARY KEY (problem_file, domain_file, kind))")
+        self._pending_writes = 0
+
+    def _get_keys(self, task):
+        """Return the paths as given and the file keys of the task.
+
+        We don't resolve the paths, since this needs additional file system
+        calls for each task. Tasks found by task_finder.scan_directory()
+        reuse the stat results of their directory entries.
+        """
+        problem_key, domain_key = task.get_file_keys()
+        return str(task.problem_file), str(task.domain_file), problem_key, domain_key
+
+    def get(self, task, kind):
+        """Return the cached value or None if there is no valid entry."""
+        problem_file, domain_file, problem_key, domain_key = self._get_keys(task)
+        row = self._connection.execute(
+            "SELECT problem_key, domain_key, version, value FROM hashes "
+            "WHERE problem_file = ? AND domain_file = ? AND kind = ?",
+            (problem_file, domain_file, kind)).fetchone()
+        if row is None or row[:3] != (problem_key, domain_key, str(self.versions[kind])):
+            return None
+        value = json.loads(row[3])
+        return tuple(value) if isinstance(value, list) else value
+
+    def put(self, task, kind, value):
+        problem_file, domain_file, problem_key, domain_key = self._get_keys(task)
+        self._connection.execute(
+            "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (problem_file, domain_file, kind, problem_key, domain_key,
+             str(self.versions[kind]), json.dumps(value)))
+        self._pending_writes += 1
+        if self._pending_writes >= 1000:
+            self.commit()
+
+    def commit(self):
+        self._connection.commit()
+        self._pending_writes = 0
+
+    def close(self):
+        self.commit()
+        self._connection.close()
@@ -0,0 +1,157 @@
+"""Compute hashes of PDDL tasks that ignore formatting and element order.
+
+We parse tasks with the streaming scanner in pddl_scanner and serialize
+each element (object, init fact, goal, action, ...) canonically, e.g., with
+sorted conjunctions. The digests of the elements are summed up, so the hash
+does not depend on the order of the elements and we never need to hold the
+whole task in memory. Like before, we ignore the domain and problem names,
+requirements and types.
+"""
+
+import hashlib
+
+import pddl_scanner
+
+
+# Versions of the code computing each kind of value. Bump the version
+# whenever the computation changes to invalidate cached values.
+VERSIONS = {"raw": 1, "parsed": 2, "signature": 2, "renaming-invariant": 2, "minhash": 1}
+
+IGNORED_SECTIONS = {"domain", "problem", ":domain", ":requirements", ":types"}
+COMMUTATIVE_OPERATORS = {"and", "or"}
+
+# Hashes of domain files, indexed by path. Each worker process has its own cache.
+_DOMAIN_FILE_HASHES = {}
+
+
+class MultisetHash:
+    """Order-independent hash of a multiset of strings."""
+
+    def __init__(self):
+        self.count = 0
+        self.value = 0
+
+    def add(self, string):
+        digest = hashlib.blake2b(string.encode("utf-8"), digest_size=16).digest()
+        self.value = (self.value + int.from_bytes(digest, "big")) % 2 ** 128
+        self.count += 1
+
+    def hexdigest(self):
+        return f"{self.count}-{self.value:032x}"
+
+
+def canonicalize(element):
+    """Serialize an element, sorting the arguments of commutative operators."""
+    if not isinstance(element, tuple):
+        return element
+    parts = [canonicalize(part) for part in element]
+    if parts and parts[0] in COMMUTATIVE_OPERATORS:
+        parts = parts[:1] + sorted(parts[1:])
+    return "(" + " ".join(parts) + ")"
+
+
+def _add_section(multiset, keyword, elements, trace):
+    if keyword in [":objects", ":constants"]:
+        entries = (f"object {name} {canonicalize(obj_type)}"
+                   for name, obj_type in pddl_scanner.iter_typed_list(elements))
+    elif keyword in [":predicates", ":functions", ":init"]:
+        entries = (f"{keyword} {canonicalize(element)}" for element in elements)
+    else:
+        entries = [f"{keyword} {' '.join(canonicalize(element) for element in elements)}"]
+    for entry in entries:
+        if trace:
+            trace(entry)
+        multiset.add(entry)
+
+
+def get_domain_file_hash(domain_file, trace=None):
+    domain_file = str(domain_file)
+    if domain_file not in _DOMAIN_FILE_HASHES or trace:
+        multiset = MultisetHash()
+        for keyword, elements in pddl_scanner.parse_sections(domain_file):
+            if keyword not in IGNORED_SECTIONS:
+                _add_section(multiset, keyword, elements, trace)
+        _DOMAIN_FILE_HASHES[domain_file] = multiset.hexdigest()
+    return _DOMAIN_FILE_HASHES[domain_file]
+
+
+def _iter_problem_sections(problem_file):
+    """Group the streamed problem elements into sections, yielding (keyword, element iterator) pairs."""
+    elements = pddl_scanner.iter_sections(problem_file)
+    pending = next(elements, None)
+    while pending is not None:
+        keyword = pending[0]
+
+        def iter_section_elements():
+            nonlocal pending
+            while pending is not None and pending[0] == keyword:
+                yield pending[1]
+                pending = next(elements, None)
+
+        yield keyword, iter_section_elements()
+
+
+def hash_task(domain_file, problem_file, trace=None):
+    """Return a hash for the task. *trace(entry)* is called for each hashed entry."""
+    multiset = MultisetHash()
+    for keyword, section_elements in _iter_problem_sections(problem_file):
+        if keyword in IGNORED_SECTIONS:
+            for _ in section_elements:
+                pass
+        elif keyword in [":objects", ":init"]:
+            _add_section(multiset, keyword, section_elements, trace)
+        else:
+            _add_section(multiset, keyword, list(section_elements), trace)
+    return compute_hash(f"{get_domain_file_hash(domain_file, trace)} {multiset.hexdigest()}")
+
+
+def compute_hash(task_string):
+    m = hashlib.md5()
+    m.update(task_string.encode("utf-8"))
+    return m.hexdigest()
+
+
+def hash_unparsed_task(domain_file, problem_file):
+    m = hashlib.md5()
+    for path in [domain_file, problem_file]:
+        with open(path) as f:
+            m.update(f.read().encode("utf-8"))
+    return m.hexdigest()
+
+
+def try_to_hash_unparsed_task(indexed_files):
+    index, (domain_file, problem_file) = indexed_files
+    try:
+        return index, hash_unparsed_task(domain_file, problem_file)
+    except (OSError, UnicodeDecodeError):
+        return index, None
+
+
+def try_to_hash_task(indexed_files):
+    """Return (index, hash) or (index, None) if the task cannot be parsed.
+
+    Meant to be used with multiprocessing.Pool.imap_unordered().
+    """
+    index, (domain_file, problem_file) = indexed_files
+    try:
+        return index, hash_task(domain_file, problem_file)
+    except (OSError, pddl_scanner.PDDLError):
+        return index, None
+
+
+def get_task_signature(domain_file, problem_file):
+    """Return a cheap signature that all tasks with the same hash share.
+
+    The signature consists of the domain file hash and the numbers of
+    objects, init facts and goal atoms.
+    """
+    return (get_domain_file_hash(domain_file),) + pddl_scanner.scan_problem(problem_file)
+
+
+def try_to_compute_signature(indexed_files):
+    """Return (index, signature) or (index, None) if the task cannot be scanned."""
+    index, (domain_file, problem_file) = indexed_files
+    try:
+        return index, get_task_signature(domain_file, problem_file)
+    except (OSError, pddl_scanner.PDDLError):
+        return index, None
@@ -0,0 +1,133 @@
+"""Find clusters of similar tasks with MinHash sketches and locality-sensitive hashing.
+
+The similarity of two tasks is the Jaccard similarity of their sets of init
+facts and goal atoms. A MinHash sketch estimates it from NUM_PERMUTATIONS
+integers per task. LSH splits each sketch into bands and only compares
+tasks that agree on all values of at least one band, which avoids
+comparing all pairs of tasks.
+"""
+
+from collections import defaultdict
+import hashlib
+
+import numpy as np
+
+import hashing
+import pddl_scanner
+
+
+NUM_PERMUTATIONS = 128
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+_RNG = np.random.RandomState(0)
+# Factors and offsets of the hash functions (a * x + b) % MERSENNE_PRIME.
+# Small enough to avoid overflows for 32-bit inputs.
+_A = _RNG.randint(1, 1 << 31, size=NUM_PERMUTATIONS).astype(np.uint64)
+_B = _RNG.randint(0, 1 << 31, size=NUM_PERMUTATIONS).astype(np.uint64)
+
+
+def _hash_atom(atom):
+    digest = hashlib.blake2b(atom.encode("utf-8"), digest_size=4).digest()
+    return int.from_bytes(digest, "big")
+
+
+def get_atoms(problem_file):
+    """Return the set of canonical init facts and goal atoms."""
+    atoms = set()
+    for keyword, element in pddl_scanner.iter_sections(problem_file):
+        if keyword == ":init":
+            atoms.add(f"init {hashing.canonicalize(element)}")
+        elif keyword == ":goal":
+            for atom in pddl_scanner.iter_atoms(element):
+                atoms.add(f"goal {hashing.canonicalize(atom)}")
+    return atoms
+
+
+def compute_sketch(atoms, chunk_size=10000):
+    """Return the MinHash sketch of a set of strings as an array of integers."""
+    values = np.array([_hash_atom(atom) for atom in atoms], dtype=np.uint64)
+    sketch = np.full(NUM_PERMUTATIONS, MAX_HASH, dtype=np.uint64)
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start:start + chunk_size]
+        hashes = (np.outer(chunk, _A) + _B) % MERSENNE_PRIME & MAX_HASH
+        sketch = np.minimum(sketch, hashes.min(axis=0))
+    return sketch
+
+
+def try_to_compute_sketch(indexed_files):
+    """Return (index, (domain hash, sketch)) or (index, None) if the task cannot be scanned."""
+    index, (domain_file, problem_file) = indexed_files
+    try:
+        sketch = compute_sketch(get_atoms(problem_file))
+        return index, (hashing.get_domain_file_hash(domain_file), sketch.tolist())
+    except (OSError, pddl_scanner.PDDLError):
+        return index, None
+
+
+def get_band_size(threshold):
+    """Choose the number of rows per band such that pairs with the given
+    similarity become candidates with probability around 1/2."""
+    best_rows = 1
+    best_error = None
+    for rows in range(1, NUM_PERMUTATIONS + 1):
+        if NUM_PERMUTATIONS % rows:
+            continue
+        bands = NUM_PERMUTATIONS // rows
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if best_error is None or error < best_error:
+            best_rows, best_error = rows, error
+    return best_rows
+
+
+def is_empty_sketch(sketch):
+    """Return True for the sketch of a task without init facts and goal atoms."""
+    return bool(np.all(np.asarray(sketch, dtype=np.uint64) == MAX_HASH))
+
+
+def find_similar_pairs(domain_hashes, sketches, threshold):
+    """Return a mapping from each task to the set of tasks whose estimated
+    Jaccard similarity with it is at least *threshold*.
+
+    Only tasks with the same domain that share a bucket in at least one LSH
+    band are compared. Tasks with empty sketches are never similar.
+    """
+    sketches = np.asarray(sketches, dtype=np.uint64)
+    rows = get_band_size(threshold)
+    non_empty = [index for index in range(len(sketches)) if not is_empty_sketch(sketches[index])]
+    similar = defaultdict(set)
+    for start in range(0, NUM_PERMUTATIONS, rows):
+        buckets = defaultdict(list)
+        band = np.ascontiguousarray(sketches[:, start:start + rows])
+        for index in non_empty:
+            buckets[(domain_hashes[index], band[index].tobytes())].append(index)
+        for bucket in buckets.values():
+            for position, index in enumerate(bucket[:-1]):
+                others = np.array([other for other in bucket[position + 1:] if other not in similar[index]])
+                if not len(others):
+                    continue
+                similarities = (sketches[others] == sketches[index]).mean(axis=1)
+                for other in others[similarities >= threshold]:
+                    similar[index].add(int(other))
+                    similar[int(other)].add(index)
+    return similar
+
+
+def find_clusters(domain_hashes, sketches, threshold):
+    """
+    Return clusters (lists of indices) of tasks with the same domain whose
+    estimated Jaccard similarity with the first task of the cluster (its
+    representative) is at least *threshold*. Similarity is not transitive,
+    so we don't merge clusters via chains of similar tasks. Each task
+    belongs to the cluster of the first similar representative.
+    """
+    similar = find_similar_pairs(domain_hashes, sketches, threshold)
+    cluster_of = {}
+    clusters = []
+    for index in range(len(sketches)):
+        if index in cluster_of:
+            continue
+        cluster = [index] + sorted(other for other in similar[index] if other not in cluster_of)
+        for member in cluster:
+            cluster_of[member] = len(clusters)
+        clusters.append(cluster)
+    return clusters
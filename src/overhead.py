@@ -0,0 +1,45 @@
+"""Measure how much time the SMAC driver spends between evaluations."""
+
+import logging
+import time
+
+
+class DriverOverhead:
+    """
+    Everything that happens between the end of one evaluation and the start
+    of the next one (fitting the random forest, optimizing the acquisition
+    function, intensification) counts as driver overhead.
+    """
+
+    def __init__(self):
+        self.overhead = 0.0
+        self.evaluation_time = 0.0
+        self.evaluations = 0
+        self._last_end = None
+        self._evaluation_start = None
+
+    def start(self):
+        """Start measuring, e.g., directly before calling smac.optimize()."""
+        self._last_end = time.perf_counter()
+
+    def start_evaluation(self):
+        now = time.perf_counter()
+        if self._last_end is not None:
+            overhead = now - self._last_end
+            self.overhead += overhead
+            logging.info(
+                f"Driver overhead before evaluation {self.evaluations + 1}: {overhead:.2f}s "
+                f"(total: {self.overhead:.0f}s overhead, {self.evaluation_time:.0f}s evaluations)")
+        self._evaluation_start = now
+
+    def end_evaluation(self):
+        now = time.perf_counter()
+        self.evaluation_time += now - self._evaluation_start
+        self.evaluations += 1
+        self._last_end = now
+
+    def __str__(self):
+        total = self.overhead + self.evaluation_time
+        percentage = 100 * self.overhead / total if total else 0
+        return (f"{self.evaluations} evaluations took {self.evaluation_time:.0f}s, "
+                f"driver overhead: {self.overhead:.0f}s ({percentage:.1f}%)")
@@ -0,0 +1,152 @@
+"""Lightweight, streaming scanner for PDDL files."""
+
+import re
+
+
+TOKEN_REGEX = re.compile(r"[()]|[^\s()]+")
+
+
+class PDDLError(Exception):
+    pass
+
+
+def tokenize(path):
+    """Yield the lower-cased tokens of a PDDL file, skipping comments."""
+    with open(path, encoding="ISO-8859-1") as f:
+        for line in f:
+            line = line.split(";", 1)[0]
+            yield from TOKEN_REGEX.findall(line.lower())
+
+
+def _read_list(tokens):
+    """Read the remainder of a list whose "(" has already been consumed."""
+    items = []
+    for token in tokens:
+        if token == "(":
+            items.append(_read_list(tokens))
+        elif token == ")":
+            return tuple(items)
+        else:
+            items.append(token)
+    raise PDDLError("missing closing parenthesis")
+
+
+def _expect(tokens, expected):
+    token = next(tokens, None)
+    if token != expected:
+        raise PDDLError(f"expected {expected!r}, found {token!r}")
+
+
+def iter_sections(path):
+    """
+    Yield (keyword, element) pairs for the elements of all top-level sections
+    of a PDDL file. Elements are names or nested tuples, e.g., (":init",
+    ("on", "a", "b")) or (":objects", "a"). Only one element is held in
+    memory at a time, so this works for arbitrarily large problem files.
+    """
+    tokens = tokenize(path)
+    _expect(tokens, "(")
+    _expect(tokens, "define")
+    for token in tokens:
+        if token == ")":
+            break
+        if token != "(":
+            raise PDDLError(f"expected section, found {token!r}")
+        keyword = next(tokens, None)
+        if keyword in [None, "(", ")"]:
+            raise PDDLError(f"expected section keyword, found {keyword!r}")
+        for token in tokens:
+            if token == ")":
+                break
+            elif token == "(":
+                yield keyword, _read_list(tokens)
+            else:
+                yield keyword, token
+        else:
+            raise PDDLError(f"unterminated section {keyword}")
+    else:
+        raise PDDLError("missing closing parenthesis")
+    trailing = next(tokens, None)
+    if trailing is not None:
+        raise PDDLError(f"unexpected token after end of definition: {trailing!r}")
+
+
+def parse_sections(path):
+    """
+    Return a list of (keyword, elements) pairs for all top-level sections of
+    a PDDL file. In contrast to iter_sections(), this reads the whole file
+    into memory, so use it for small files like domains.
+    """
+    tokens = tokenize(path)
+    _expect(tokens, "(")
+    _expect(tokens, "define")
+    definition = _read_list(tokens)
+    trailing = next(tokens, None)
+    if trailing is not None:
+        raise PDDLError(f"unexpected token after end of definition: {trailing!r}")
+    sections = []
+    for section in definition:
+        if not isinstance(section, tuple) or not section or isinstance(section[0], tuple):
+            raise PDDLError(f"expected section, found {section!r}")
+        sections.append((section[0], section[1:]))
+    return sections
+
+
+def iter_typed_list(elements):
+    """Yield (name, type) pairs for a typed list like "a b - block c"."""
+    pending = []
+    elements = iter(elements)
+    for element in elements:
+        if element == "-":
+            element_type = next(elements, "object")
+            for name in pending:
+                yield name, element_type
+            pending = []
+        else:
+            pending.append(element)
+    for name in pending:
+        yield name, "object"
+
+
+def iter_typed_names(names):
+    """Yield the names of a typed list like "a b - block c", skipping the types."""
+    skip_next = False
+    for name in names:
+        if skip_next:
+            skip_next = False
+        elif name == "-":
+            skip_next = True
+        else:
+            yield name
+
+
+def iter_atoms(formula):
+    """Yield the atoms (lists without sublists) in a formula."""
+    if not isinstance(formula, tuple):
+        return
+    sublists = [part for part in formula if isinstance(part, tuple)]
+    if not sublists:
+        yield formula
+    for part in sublists:
+        yield from iter_atoms(part)
+
+
+def count_atoms(formula):
+    """Count the atoms (lists without sublists) in a formula."""
+    return sum(1 for _ in iter_atoms(formula))
+
+
+def scan_problem(path):
+    """Return the numbers of distinct objects, distinct init facts and goal atoms."""
+    object_names = []
+    init = set()
+    goal_atoms = 0
+    for keyword, element in iter_sections(path):
+        if keyword == ":objects":
+            object_names.append(element)
+        elif keyword == ":init":
+            init.add(element)
+        elif keyword == ":goal":
+            goal_atoms += count_atoms(element)
+    objects = set(iter_typed_names(object_names))
+    return len(objects), len(init), goal_atoms
@@ -0,0 +1,136 @@
+"""Decide which plan directories to keep during a search."""
+
+from collections import defaultdict, deque
+import heapq
+import itertools
+import os
+import threading
+
+import utils
+
+
+KEEP = "keep"  # Keep all files.
+KEEP_PROPERTIES = "keep-properties"  # Keep only properties.json.
+PRUNE = "prune"  # Only keep a summary record.
+
+POLICIES = ["all", "solved", "top-k"]
+
+
+def get_size(path, seen_inodes=None):
+    """Return the total size of all files below *path* in bytes.
+
+    Hard links, e.g., of the task files in the planner subdirectories of
+    portfolio runs, are only counted once.
+    """
+    if seen_inodes is None:
+        seen_inodes = set()
+    size = 0
+    for entry in os.scandir(path):
+        if entry.is_dir(follow_symlinks=False):
+            size += get_size(entry.path, seen_inodes)
+        else:
+            stat = entry.stat(follow_symlinks=False)
+            if (stat.st_dev, stat.st_ino) not in seen_inodes:
+                seen_inodes.add((stat.st_dev, stat.st_ino))
+                size += stat.st_size
+    return size
+
+
+def is_solved(props):
+    return props["planner_exitcode"] == 0 and props.get("plan_valid") is not False
+
+
+class RetentionPolicy:
+    """
+    Policies:
+
+    * all: keep all files of all runs
+    * solved: keep all files of solved runs and properties.json of failed runs
+    * top-k: like "solved", but only keep the *top_k* solved runs with the
+      highest runtimes per runtime bucket (see utils.RUNTIME_BOUNDS)
+
+    If *prune_failed* is True, failed runs are reduced to a summary record.
+    If a *disk_quota* (in bytes) is given, we prune kept runs until the
+    quota is met: first failed runs (oldest first) and then the fastest
+    solved run from the runtime bucket with the most kept runs.
+
+    Evaluations may finish in different threads, so all methods are
+    thread-safe.
+    """
+
+    def __init__(self, policy="all", top_k=None, prune_failed=False, disk_quota=None):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown retention policy: {policy}")
+        if policy == "top-k" and not top_k:
+            raise ValueError("top-k retention policy needs top_k > 0")
+        self.policy = policy
+        self.top_k = top_k
+        self.prune_failed = prune_failed
+        self.disk_quota = disk_quota
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+        # Map from kept plan dirs to (props, size).
+        self._kept = {}
+        self._total_size = 0
+        self._failed = deque()
+        # Map from runtime bounds to heaps of (runtime, counter, plan_dir).
+        self._buckets = defaultdict(list)
+
+    def add(self, plan_dir, props):
+        """
+        Register a finished evaluation and return a list of (action,
+        plan_dir, props) triples for the new plan dir and for previously
+        kept plan dirs that must be pruned now.
+        """
+        with self._lock:
+            actions = []
+            if is_solved(props):
+                action = KEEP
+            elif self.prune_failed:
+                action = PRUNE
+            elif self.policy == "all":
+                action = KEEP
+            else:
+                action = KEEP_PROPERTIES
+
+            if action != PRUNE:
+                if action == KEEP:
+                    size = get_size(plan_dir)
+                else:
+                    size = (plan_dir / "properties.json").stat().st_size
+                self._kept[plan_dir] = (props, size)
+                self._total_size += size
+                if is_solved(props):
+                    bucket = self._buckets[utils.get_runtime_bound(props["runtime"])]
+                    heapq.heappush(bucket, (props["runtime"], next(self._counter), plan_dir))
+                    if self.policy == "top-k" and len(bucket) > self.top_k:
+                        actions.append(self._evict(heapq.heappop(bucket)[2]))
+                else:
+                    self._failed.append(plan_dir)
+            actions.extend(self._enforce_quota())
+
+            # Report the action for the new plan dir first.
+            if any(path == plan_dir for _, path, _ in actions):
+                actions = [(PRUNE, plan_dir, props)] + [
+                    (a, path, p) for a, path, p in actions if path != plan_dir]
+            else:
+                actions.insert(0, (action, plan_dir, props))
+            return actions
+
+    def _evict(self, plan_dir):
+        props, size = self._kept.pop(plan_dir)
+        self._total_size -= size
+        return (PRUNE, plan_dir, props)
+
+    def _enforce_quota(self):
+        actions = []
+        while self.disk_quota is not None and self._total_size > self.disk_quota and self._kept:
+            if self._failed:
+                actions.append(self._evict(self._failed.popleft()))
+            else:
+                bucket = max(self._buckets.values(), key=len)
+                actions.append(self._evict(heapq.heappop(bucket)[2]))
+        return actions
+
+    def get_total_size(self):
+        return self._total_size
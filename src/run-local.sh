@@ -0,0 +1,46 @@
+#!/bin/bash
+
+set -euo pipefail
+
+if [[ $# != 4 ]]; then
+    echo "usage: $(basename "$0") planner domain_file problem_file plan_file" 1>&2
+    exit 2
+fi
+
+if [ -f $PWD/$4 ]; then
+    echo "Error: remove $PWD/$4" 1>&2
+    exit 2
+fi
+
+# Ensure that the strings "CPU time limit exceeded" and "Killed" are in English.
+export LANG=C
+
+# Validate plans with VAL ("inline") or leave validation to the caller ("off", "deferred").
+VALIDATE="${VALIDATE:-inline}"
+
+set +e
+/usr/bin/time -o /dev/stdout -f "Local runtime: %es real, %Us user, %Ss sys" \
+  "$1" "$PWD/$2" "$PWD/$3" "$4"
+set -e
+
+if [[ "$VALIDATE" != "inline" ]]; then
+    if [ -f $PWD/$4 ]; then
+        echo "Found plan file. Skip VAL (validation: $VALIDATE)."
+        exit 0
+    else
+        echo "No plan file."
+        exit 99
+    fi
+fi
+
+printf "\nRun VAL\n\n"
+
+if [ -f $PWD/$4 ]; then
+    echo "Found plan file."
+    validate "$PWD/$2" "$PWD/$3" "$PWD/$4"
+    exit 0
+else
+    echo "No plan file."
+    validate "$PWD/$2" "$PWD/$3"
+    exit 99
+fi
@@ -15,13 +15,34 @@ fi
 # Ensure that the strings "CPU time limit exceeded" and "Killed" are in English.
 export LANG=C
 
+# Validate plans with VAL ("inline") or leave validation to the caller ("off", "deferred").
+VALIDATE="${VALIDATE:-inline}"
+
+# Run the planner in a fresh container or in a running instance started by
+# "singularity instance start" (set PLANNER_INSTANCE to the instance name).
+if [[ -n "${PLANNER_INSTANCE:-}" ]]; then
+    CONTAINER=(--pwd "$PWD" "instance://$PLANNER_INSTANCE")
+else
+    CONTAINER=(-C -H "$PWD" "$1")
+fi
+
 set +e
 # Ignore some "expected" stderr output.
 /usr/bin/time -o /dev/stdout -f "Singularity runtime: %es real, %Us user, %Ss sys" \
-  singularity run -C -H "$PWD" "$1" "$PWD/$2" "$PWD/$3" "$4" 2> \
+  singularity run "${CONTAINER[@]}" "$PWD/$2" "$PWD/$3" "$4" 2> \
   >(grep -v "CPU time limit exceeded\|WARNING: will ignore action costs\|differs from the one in the portfolio file" >&2)
 set -e
 
+if [[ "$VALIDATE" != "inline" ]]; then
+    if [ -f $PWD/$4 ]; then
+        echo "Found plan file. Skip VAL (validation: $VALIDATE)."
+        exit 0
+    else
+        echo "No plan file."
+        exit 99
+    fi
+fi
+
 printf "\nRun VAL\n\n"
 
 if [ -f $PWD/$4 ]; then
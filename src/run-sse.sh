@@ -14,9 +14,16 @@ FSTMPDIR=fs-tmp
 
 export LANG=C
 
+# Use the running instance started by "singularity instance start" if PLANNER_INSTANCE is set.
+if [[ -n "${PLANNER_INSTANCE:-}" ]]; then
+    CONTAINER=(--pwd "$(pwd)" "instance://$PLANNER_INSTANCE")
+else
+    CONTAINER=("$SSE")
+fi
+
 /usr/bin/time -o /dev/stdout -f "SSE runtime: %es real, %Us user, %Ss sys" \
   singularity run \
-    "$SSE" \
+    "${CONTAINER[@]}" \
     --workspace "$(pwd)" \
     --tag "$FSTMPDIR" \
     --domain "$DOMAIN" \
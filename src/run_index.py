@@ -0,0 +1,167 @@
+"""Persistent SQLite index of the runs evaluated in an experiment directory."""
+
+from collections import deque, namedtuple
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+from pathlib import Path
+import sqlite3
+
+
+# Bump the version whenever the schema or the stored values change.
+INDEX_VERSION = 2
+DEFAULT_INDEX_FILENAME = "run-index.sqlite"
+RUN_DIR_PATTERN = "smac-output-*/run_*"
+# Number of properties files that we send to a worker process at once.
+BATCH_SIZE = 64
+
+Run = namedtuple("Run", ["plan_dir", "domain", "parameters", "seed", "runtime", "problem_hash"])
+
+
+def _iter_subdirs(directory):
+    try:
+        with os.scandir(directory) as entries:
+            return [entry for entry in entries if entry.is_dir()]
+    except FileNotFoundError:
+        return []
+
+
+def find_plan_dirs(expdir):
+    """Yield (relative properties file, plan dir key) pairs for all plan dirs below expdir.
+
+    The key is the modification time of the plan dir. We only list the
+    directories above the plan dirs and stat each plan dir once.
+    """
+    for run_dir in sorted(expdir.glob(RUN_DIR_PATTERN)):
+        for config_dir in _iter_subdirs(run_dir / "plan"):
+            for plan_dir in _iter_subdirs(config_dir.path):
+                try:
+                    dir_key = str(plan_dir.stat().st_mtime_ns)
+                except FileNotFoundError:
+                    continue
+                properties_file = Path(plan_dir.path) / "properties.json"
+                yield str(properties_file.relative_to(expdir)), dir_key
+
+
+def hash_problem_file(path):
+    with open(path) as f:
+        content = f.read()
+    return hashlib.md5(content.encode("utf-8")).hexdigest()
+
+
+def _read_run(indexed_file):
+    """Return (relative path, values to store) or (relative path, None) if the file cannot be read."""
+    relative_path, properties_file, dir_key = indexed_file
+    properties_file = Path(properties_file)
+    try:
+        with open(properties_file) as f:
+            props = json.load(f)
+    except FileNotFoundError:
+        # The run has not finished yet.
+        return relative_path, None
+    except (OSError, json.JSONDecodeError) as err:
+        # The search may be pruning the run.
+        logging.warning(f"Skipping unreadable properties file {properties_file}: {err}")
+        return relative_path, None
+    problem_hash = None
+    if props["planner_exitcode"] == 0:
+        try:
+            problem_hash = hash_problem_file(properties_file.parent / "problem.pddl")
+        except FileNotFoundError:
+            pass
+    return relative_path, (
+        dir_key,
+        props["domain"],
+        json.dumps(props["parameters"], sort_keys=True),
+        props["seed"],
+        props["planner_exitcode"],
+        props["runtime"],
+        props.get("plan_valid"),
+        problem_hash,
+    )
+
+
+class RunIndex:
+    """
+    Store the properties of each run (domain, parameters, seed, exit code,
+    runtime, plan validity and problem hash) in an SQLite database. Paths are
+    relative to the experiment directory. update() only reads the properties
+    files of plan dirs that are new or whose modification time changed since
+    the last update. The search replaces properties files atomically, which
+    updates the modification time of the plan dir.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._connection = sqlite3.connect(self.path)
+        [version] = self._connection.execute("PRAGMA user_version").fetchone()
+        if version != INDEX_VERSION:
+            self._connection.execute("DROP TABLE IF EXISTS runs")
+            self._connection.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            "properties_file TEXT PRIMARY KEY, dir_key TEXT, domain TEXT, parameters TEXT, "
+            "seed INTEGER, exitcode INTEGER, runtime REAL, plan_valid INTEGER, problem_hash TEXT)")
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS runs_by_domain ON runs (domain, exitcode, runtime)")
+
+    def update(self, expdir, jobs=None):
+        """Index new and changed runs below expdir and forget deleted runs.
+
+        Properties files are parsed and problem files are hashed by *jobs*
+        worker processes, while the main process keeps scanning the
+        directory tree. Return the numbers of updated and removed entries.
+        """
+        expdir = Path(expdir)
+        jobs = jobs or os.cpu_count()
+        known_keys = dict(self._connection.execute("SELECT properties_file, dir_key FROM runs"))
+        found = set()
+        num_updated = 0
+        pending = deque()
+
+        def store(async_result):
+            nonlocal num_updated
+            for relative_path, values in async_result.get():
+                if values is not None:
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (relative_path,) + values)
+                    num_updated += 1
+
+        with multiprocessing.Pool(jobs) as pool:
+            batch = []
+            for relative_path, dir_key in find_plan_dirs(expdir):
+                found.add(relative_path)
+                if known_keys.get(relative_path) == dir_key:
+                    continue
+                batch.append((relative_path, str(expdir / relative_path), dir_key))
+                if len(batch) == BATCH_SIZE:
+                    pending.append(pool.map_async(_read_run, batch))
+                    batch = []
+                # Bound the number of queued batches.
+                while pending and (pending[0].ready() or len(pending) > 2 * jobs):
+                    store(pending.popleft())
+            if batch:
+                pending.append(pool.map_async(_read_run, batch))
+            while pending:
+                store(pending.popleft())
+        removed = [(path,) for path in known_keys if path not in found]
+        self._connection.executemany("DELETE FROM runs WHERE properties_file = ?", removed)
+        self._connection.commit()
+        return num_updated, len(removed)
+
+    def get_solved_runs(self, min_runtime=0.0):
+        """Return the solved runs whose plans are valid or have not been validated."""
+        rows = self._connection.execute(
+            "SELECT properties_file, domain, parameters, seed, runtime, problem_hash FROM runs "
+            "WHERE exitcode = 0 AND plan_valid IS NOT 0 AND runtime >= ? "
+            "ORDER BY properties_file",
+            (min_runtime,))
+        return [
+            Run(str(Path(properties_file).parent), domain, json.loads(parameters), seed, runtime, problem_hash)
+            for properties_file, domain, parameters, seed, runtime, problem_hash in rows]
+
+    def close(self):
+        self._connection.close()
@@ -1,38 +1,136 @@
-import resource
+import contextlib
+import itertools
+import logging
+import math
+import os
+from pathlib import Path
 import subprocess
+import threading
+import time
+
+
+class Backend:
+    """Start a fresh planner process (e.g., a cold Singularity container) for each task."""
+
+    def __init__(self, command, env=None):
+        self.command = command
+        self.env = env
+        # Seconds needed for starting the backend once (not included in the planner runtimes).
+        self.startup_time = None
+
+    def start(self, work_dir):
+        pass
+
+    def stop(self):
+        pass
+
+
+class SingularityInstanceBackend(Backend):
+    """
+    Start a persistent Singularity instance of the planner image once and
+    execute each task inside it. The run scripts use the instance if the
+    PLANNER_INSTANCE environment variable is set.
+    """
+
+    _counter = itertools.count()
+
+    def __init__(self, command, image, env=None):
+        self.image = image
+        self.instance = f"bpg-{os.getpid()}-{next(self._counter)}"
+        super().__init__(command, env=dict(env or os.environ, PLANNER_INSTANCE=self.instance))
+
+    def start(self, work_dir):
+        """Start the instance with the directory containing the plan dirs as home dir.
+
+        Like "singularity run -C -H $PWD" for single tasks, the instance only
+        sees its home dir, which is mounted at the same path as on the host.
+        """
+        work_dir = Path(work_dir).resolve()
+        # Plan dirs are created lazily, but the home dir must exist.
+        work_dir.mkdir(parents=True, exist_ok=True)
+        start_time = time.perf_counter()
+        subprocess.run(
+            ["singularity", "instance", "start", "-C", "-H", str(work_dir), self.image, self.instance],
+            check=True,
+        )
+        self.startup_time = time.perf_counter() - start_time
+        logging.info(f"Started Singularity instance {self.instance} in {self.startup_time:.2f}s")
+
+    def stop(self):
+        subprocess.run(["singularity", "instance", "stop", self.instance])
+
+
+class CorePool:
+    """
+    Hand out the CPU cores available to this process to concurrent planner
+    runs, one core per run, so that their runtimes are not skewed by
+    competing for the same cores. Runs wait until a core is free.
+    """
+
+    def __init__(self, cores=None):
+        self.cores = sorted(cores or os.sched_getaffinity(0))
+        self._free = list(self.cores)
+        self._condition = threading.Condition()
+
+    @contextlib.contextmanager
+    def reserve(self):
+        with self._condition:
+            self._condition.wait_for(lambda: self._free)
+            core = self._free.pop(0)
+        try:
+            yield core
+        finally:
+            with self._condition:
+                self._free.append(core)
+                self._condition.notify()
 
 
 class Runner:
-    def __init__(self, domain, command, time_limit, memory_limit, generators_dir):
+    def __init__(self, domain, backend, time_limit, memory_limit, generators_dir, cores=None):
         self.domain = domain
-        self.command = command
+        self.backend = backend
         self.time_limit = time_limit
         self.memory_limit = memory_limit
         self.generators_dir = generators_dir
+        # Optional CorePool for pinning each run to its own core.
+        self.cores = cores
 
-    def run_planner(self, plan_dir):
-        """Run the planner in the given directory on the prepared task."""
+    def start(self, work_dir):
+        self.backend.start(work_dir)
+
+    def stop(self):
+        self.backend.stop()
 
-        def set_limit(limit_type, soft, hard=None):
-            if hard is None:
-                hard = soft
-            resource.setrlimit(limit_type, (soft, hard))
+    def get_limited_command(self):
+        """Return the planner command, wrapped in prlimit to set the resource limits.
 
-        def prepare_call():
-            set_limit(resource.RLIMIT_CPU, self.time_limit, hard=self.time_limit + 1)
-            set_limit(resource.RLIMIT_AS, self.memory_limit * 1024 ** 2)  # bytes
-            set_limit(resource.RLIMIT_CORE, 0)
+        We don't set the limits in a preexec_fn, because that is unsafe when
+        several threads start planners at the same time.
+        """
+        time_limit = math.ceil(self.time_limit)
+        memory_limit = int(self.memory_limit * 1024 ** 2)  # bytes
+        return [
+            "prlimit", f"--cpu={time_limit}:{time_limit + 1}", f"--as={memory_limit}", "--core=0", "--",
+        ] + [str(part) for part in self.backend.command]
 
+    def run_planner(self, plan_dir):
+        """Run the planner in the given directory on the prepared task."""
         logfilename = plan_dir / "run.log"
         errfilename = plan_dir / "run.err"
 
-        with open(logfilename, "w") as logfile, open(errfilename, "w") as errfile:
+        with contextlib.ExitStack() as stack:
+            command = self.get_limited_command()
+            if self.cores:
+                core = stack.enter_context(self.cores.reserve())
+                command = ["taskset", "--cpu-list", str(core)] + command
+            logfile = stack.enter_context(open(logfilename, "w"))
+            errfile = stack.enter_context(open(errfilename, "w"))
             p = subprocess.Popen(
-                self.command,
+                command,
                 cwd=plan_dir,
                 stdout=logfile,
                 stderr=errfile,
-                preexec_fn=prepare_call,
+                env=self.backend.env,
             )
             retcode = p.wait()
 
@@ -1,14 +1,21 @@
 #! /usr/bin/env python3
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
 import json
 import logging
+import math
+import os
 from pathlib import Path
 import random
 import re
 import resource
+import shutil
 import subprocess
 import sys
+import tempfile
+import threading
 import warnings
 
 import numpy as np
@@ -18,9 +25,21 @@ from smac.scenario.scenario import Scenario
 from smac.facade.smac_hpo_facade import SMAC4AC as SMAC
 from smac.initial_design.default_configuration_design import DefaultConfiguration
 
+import bisection
 import domains
-from runner import Runner
+import features
+from generator_failures import GeneratorFailures
+import grounding
+from overhead import DriverOverhead
+import pddl_scanner
+import retention
+from runner import Backend, CorePool, Runner, SingularityInstanceBackend
+import seen_tasks
+import storage
+import syntax_check
+import timeout_predictor
 import utils
+import validation
 
 
 warnings.simplefilter(action="ignore", category=FutureWarning)
@@ -30,6 +49,11 @@ warnings.simplefilter(action="ignore", category=DeprecationWarning)
 DIR = Path(__file__).resolve().parent
 REPO = DIR.parent
 DOMAINS = domains.get_domains()
+FAILURE_COST = 100
+
+
+def writes_plans(planner):
+    return Path(planner).name != "sse.sif"
 
 
 def parse_args():
@@ -40,9 +64,36 @@ def parse_args():
     )
     parser.add_argument("domain", choices=DOMAINS, help="Domain name")
     parser.add_argument(
-        "planner",
-        help="Path to Singularity-based planner or path to sse.sif file. "
-        "Planners must accept three parameters: domain_file problem_file plan_file",
+        "planners",
+        nargs="+",
+        metavar="planner",
+        help="Path to Singularity-based planner or path to sse.sif file (or to an "
+        "executable for --planner-backend=local). "
+        "Planners must accept three parameters: domain_file problem_file plan_file. "
+        "If multiple planners are given, each generated task is solved by all "
+        "of them concurrently (each one using the given time and memory limits "
+        "and pinned to its own CPU core).",
+    )
+
+    parser.add_argument(
+        "--planner-backend",
+        choices=["container", "instance", "local"],
+        default="container",
+        help="How to run the planners: in a fresh Singularity container for each "
+        "task (container), in a persistent Singularity instance that is started "
+        "once per search run (instance), or as local executables, e.g., "
+        "fake-planner.py for testing (local). Default: %(default)s",
+    )
+
+    parser.add_argument(
+        "--portfolio-objective",
+        choices=["min", "max", "disagreement"],
+        default="min",
+        help="How to combine the runtimes of multiple planners into the value that "
+        "is maximized: runtime of the fastest planner (min), runtime of the slowest "
+        "planner that solves the task (max), or log-ratio between the slowest and "
+        "fastest runtime, where unsolved tasks count as the planner time limit "
+        "(disagreement). Default: %(default)s",
     )
 
     parser.add_argument(
@@ -66,6 +117,13 @@ def parse_args():
         help="Maximum time in seconds for each configuration (default: %(default)ss)",
     )
 
+    parser.add_argument(
+        "--generator-time-limit",
+        type=float,
+        default=None,
+        help="Maximum time in seconds for each generator call (default: the planner time limit)",
+    )
+
     parser.add_argument(
         "--planner-memory-limit",
         type=float,
@@ -88,13 +146,220 @@ def parse_args():
         help="Run each parameter configuration only once (with seed 0).",
     )
 
+    parser.add_argument(
+        "--seed-batches",
+        type=int,
+        default=None,
+        help="Pass this many batches of --seeds-per-batch generator seeds to SMAC "
+        "as instances. Each evaluation generates and solves the tasks for all seeds "
+        "of one batch concurrently and aggregates their costs. Use --deterministic "
+        "to keep the seeds of each batch fixed across evaluations and parallel "
+        "SMAC runs (default: evaluate a single seed per evaluation)",
+    )
+
+    parser.add_argument(
+        "--seeds-per-batch",
+        type=int,
+        default=3,
+        help="Number of generator seeds per batch for --seed-batches (default: %(default)d)",
+    )
+
+    parser.add_argument(
+        "--parallel-seeds",
+        type=int,
+        default=None,
+        help="Maximum number of seeds of a batch that are evaluated concurrently. "
+        "Each seed runs all planners, so make sure that enough cores are available "
+        "(default: --seeds-per-batch)",
+    )
+
+    parser.add_argument(
+        "--batch-cost-quantile",
+        type=float,
+        default=0.5,
+        help="Quantile of the seed costs that is reported to SMAC for a batch, e.g., "
+        "0.5 for the median or 0.75 to require that most seeds yield hard tasks "
+        "(default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--model-points-per-tree",
+        type=int,
+        default=None,
+        help="Train each tree of SMAC's random forest on at most this many "
+        "(bootstrapped) runs. This bounds the time for refitting the model in "
+        "long searches with large runhistories (default: use all runs)",
+    )
+
+    parser.add_argument(
+        "--acq-opt-challengers",
+        type=int,
+        default=None,
+        help="Number of random configurations evaluated by the acquisition function "
+        "optimizer in each SMAC iteration (default: SMAC's default of 5000)",
+    )
+
+    parser.add_argument(
+        "--acq-opt-max-steps",
+        type=int,
+        default=None,
+        help="Maximum number of local search steps of the acquisition function "
+        "optimizer in each SMAC iteration (default: unlimited)",
+    )
+
     parser.add_argument(
         "--smac-output-dir",
         default="smac",
         help="Directory where to store logs and temporary files (default: %(default)s)",
     )
 
-    return parser.parse_args()
+    parser.add_argument(
+        "--scratch-dir",
+        default=None,
+        help="Create plan directories below this (ideally node-local) directory "
+        "and only copy the results that the --retention policy keeps to the SMAC "
+        "output dir in the background (default: write directly to the SMAC output dir)",
+    )
+
+    parser.add_argument(
+        "--retention",
+        choices=retention.POLICIES,
+        default=None,
+        help="Which plan directories to keep: all files of all runs (all), all files "
+        "of solved runs and properties.json of failed runs (solved), or like "
+        "\"solved\", but only the --keep-per-runtime-bucket solved runs with the "
+        "highest runtimes per runtime bucket (top-k). Default: \"all\" or "
+        "\"solved\" if --scratch-dir is used",
+    )
+
+    parser.add_argument(
+        "--keep-per-runtime-bucket",
+        type=int,
+        default=10,
+        help="Number of solved runs per runtime bucket to keep for --retention=top-k "
+        "(default: %(default)d)",
+    )
+
+    parser.add_argument(
+        "--prune-failed",
+        action="store_true",
+        help="Delete the plan directories of failed runs and only store a summary "
+        "record in pruned-runs.jsonl in the SMAC run dir",
+    )
+
+    parser.add_argument(
+        "--disk-quota",
+        type=float,
+        default=None,
+        help="Maximum disk space in MiB for the plan directories of one SMAC run. "
+        "When exceeded, kept runs are pruned: failed runs first, then the fastest "
+        "solved runs from the most populated runtime buckets (default: unlimited)",
+    )
+
+    parser.add_argument(
+        "--validation",
+        choices=validation.VALIDATION_MODES,
+        default=None,
+        help="Validate plans with VAL directly after each planner run (inline), "
+        "not at all (off), or in a background thread pool that only validates "
+        "solved tasks, the only ones that can be collected (deferred). Plans "
+        "are only validated for planners that write plans (not for sse.sif). "
+        "Default: inline, or off if no planner writes plans",
+    )
+
+    parser.add_argument(
+        "--validation-jobs",
+        type=int,
+        default=1,
+        help="Number of parallel VAL calls for --validation=deferred (default: %(default)d)",
+    )
+
+    parser.add_argument(
+        "--bisect",
+        action="store_true",
+        help="Instead of using SMAC, search along the scaling parameter of the "
+        "domain for tasks that take --target-runtime seconds to solve. All other "
+        "parameters use their default values.",
+    )
+
+    parser.add_argument(
+        "--target-runtime",
+        type=float,
+        default=None,
+        help="Desired planner runtime in seconds for --bisect (default: half the planner time limit)",
+    )
+
+    parser.add_argument(
+        "--seeds-per-value",
+        type=int,
+        default=3,
+        help="Number of random seeds evaluated for each value in --bisect mode (default: %(default)d)",
+    )
+
+    parser.add_argument(
+        "--allow-duplicates",
+        action="store_true",
+        help="Evaluate every generated task. By default, we hash each generated "
+        "task and skip tasks that any run using the same SMAC output dir has "
+        "already evaluated, reusing the cost of the first evaluation.",
+    )
+    parser.add_argument(
+        "--duplicate-wait",
+        type=float,
+        default=0,
+        help="Seconds to wait for the cost of a duplicate task that another run is "
+        "still evaluating. Afterwards, the duplicate gets the failure cost "
+        "(default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--timeout-skip-threshold",
+        type=float,
+        default=None,
+        help="Skip the planner runs for tasks that no planner solves with at least "
+        "this predicted probability, e.g., 0.95. The predictor is a random forest "
+        "that is trained online on the parameters and size features of the tasks "
+        "evaluated so far, including the tasks of earlier runs in the SMAC output "
+        "dir. Skipped runs are marked in properties.json and count as "
+        "failures for SMAC (default: never skip runs)",
+    )
+
+    parser.add_argument(
+        "--max-ground-atoms",
+        type=int,
+        default=None,
+        help="Skip the planner runs for tasks with more ground atoms. The number is "
+        "estimated from the object counts per type and the predicate arities "
+        "(default: no limit)",
+    )
+
+    parser.add_argument(
+        "--max-ground-actions",
+        type=int,
+        default=None,
+        help="Skip the planner runs for tasks with more ground actions. The number is "
+        "estimated from the object counts per type and the action arities "
+        "(default: no limit)",
+    )
+
+    args = parser.parse_args()
+    if args.validation is None:
+        args.validation = "inline" if any(map(writes_plans, args.planners)) else "off"
+    elif args.validation != "off" and not any(map(writes_plans, args.planners)):
+        parser.error("--validation needs a planner that writes plans (sse.sif doesn't)")
+    if not 0 <= args.batch_cost_quantile <= 1:
+        parser.error("--batch-cost-quantile must be between 0 and 1")
+    if args.seed_batches and args.bisect:
+        parser.error("--seed-batches only works with SMAC")
+    if args.parallel_seeds is None:
+        args.parallel_seeds = args.seeds_per_batch
+    if args.generator_time_limit is None:
+        args.generator_time_limit = args.planner_time_limit
+    if args.target_runtime is None:
+        args.target_runtime = args.planner_time_limit / 2
+    if args.retention is None:
+        args.retention = "solved" if args.scratch_dir else "all"
+    return args
 
 
 ARGS = parse_args()
@@ -102,31 +367,85 @@ GENERATORS_DIR = Path(ARGS.generators_dir)
 SMAC_OUTPUT_DIR = Path(ARGS.smac_output_dir)
 SMAC_RUN_DIR = None  # Set after SMAC object is created.
 TMP_PLAN_DIR = "plan"
+STORAGE = None  # Set after SMAC_RUN_DIR is known.
+RETENTION = retention.RetentionPolicy(
+    ARGS.retention,
+    top_k=ARGS.keep_per_runtime_bucket,
+    prune_failed=ARGS.prune_failed,
+    disk_quota=None if ARGS.disk_quota is None else ARGS.disk_quota * 1024 ** 2,
+)
+# Claims older than this belong to killed runs (planner run, validation and some slack).
+SEEN_TASKS = None if ARGS.allow_duplicates else seen_tasks.SeenTasks(
+    SMAC_OUTPUT_DIR / "seen-tasks", max_age=2 * ARGS.planner_time_limit + 600)
+# Shared by all runs using the same SMAC output dir.
+GENERATOR_FAILURES = GeneratorFailures(SMAC_OUTPUT_DIR / "generator-failures.jsonl")
+PREDICTOR = None
+if ARGS.timeout_skip_threshold is not None:
+    PREDICTOR = timeout_predictor.TimeoutPredictor(random_seed=ARGS.random_seed)
+INSTANCE_FILE = SMAC_OUTPUT_DIR / "seed-batches.txt"
+DRIVER_OVERHEAD = DriverOverhead()
 random.seed(ARGS.random_seed)
 
 utils.setup_logging(ARGS.debug)
 
 logging.debug(f"{len(DOMAINS)} domains available: {sorted(DOMAINS)}")
 DOMAIN = DOMAINS[ARGS.domain]
+if ARGS.bisect and not DOMAIN.scaling_parameter:
+    sys.exit(f"Error: domain {DOMAIN.name} declares no scaling parameter")
+if ARGS.bisect and ARGS.portfolio_objective == "disagreement":
+    sys.exit("Error: --bisect needs a runtime objective")
 
 utils.check_generators_dir(GENERATORS_DIR, DOMAINS)
 
-PLANNER = Path(ARGS.planner)
-if not PLANNER.is_file():
-    sys.exit(f"planner not found: {PLANNER}")
-
-if PLANNER.name == "sse.sif":
-    COMMAND = ["bash", DIR / "run-sse.sh", PLANNER, "domain.pddl", "problem.pddl"]
-else:
-    COMMAND = ["bash", DIR / "run-singularity.sh", PLANNER, "domain.pddl", "problem.pddl", "sas_plan"]
-
-RUNNER = Runner(
-    DOMAIN,
-    COMMAND,
-    ARGS.planner_time_limit,
-    ARGS.planner_memory_limit,
-    GENERATORS_DIR,
-)
+# Generators writing to fixed files in the working directory must not run concurrently.
+GENERATION_LOCK = threading.Lock() if DOMAIN.uses_tmp_files() else contextlib.nullcontext()
+
+
+def get_planner_command(planner):
+    if planner.name == "sse.sif":
+        return ["bash", DIR / "run-sse.sh", planner, "domain.pddl", "problem.pddl"]
+    else:
+        return ["bash", DIR / "run-singularity.sh", planner, "domain.pddl", "problem.pddl", "sas_plan"]
+
+
+def get_planner_backend(planner):
+    env = dict(os.environ, VALIDATE=ARGS.validation)
+    if ARGS.planner_backend == "local":
+        command = ["bash", DIR / "run-local.sh", planner.resolve(), "domain.pddl", "problem.pddl", "sas_plan"]
+        return Backend(command, env=env)
+    elif ARGS.planner_backend == "instance":
+        return SingularityInstanceBackend(get_planner_command(planner), planner, env=env)
+    else:
+        return Backend(get_planner_command(planner), env=env)
+
+
+# Pin concurrent planner runs (portfolios, seed batches) to separate cores.
+CORES = None
+if len(ARGS.planners) > 1 or (ARGS.seed_batches and ARGS.parallel_seeds > 1):
+    CORES = CorePool()
+    logging.info(f"Pinning concurrent planner runs to the cores {CORES.cores}")
+    if len(CORES.cores) < len(ARGS.planners):
+        logging.warning(f"Only {len(CORES.cores)} cores for {len(ARGS.planners)} planners: some planners wait for a core")
+
+RUNNERS = {}
+# Names of the planners whose plans we validate.
+PLAN_WRITERS = set()
+for planner in ARGS.planners:
+    planner = Path(planner)
+    if not planner.is_file():
+        sys.exit(f"planner not found: {planner}")
+    if planner.stem in RUNNERS:
+        sys.exit(f"planner names must be unique: {planner.stem}")
+    RUNNERS[planner.stem] = Runner(
+        DOMAIN,
+        get_planner_backend(planner),
+        ARGS.planner_time_limit,
+        ARGS.planner_memory_limit,
+        GENERATORS_DIR,
+        cores=CORES,
+    )
+    if writes_plans(planner):
+        PLAN_WRITERS.add(planner.stem)
 
 
 def show_error_log(plan_dir):
@@ -149,7 +468,7 @@ def parse_runtime(plan_dir):
     return runtime
 
 
-def store_results(cfg, seed, plan_dir, exitcode, runtime):
+def store_results(cfg, seed, plan_dir, exitcode, runtime, **extra_properties):
     # Save results in JSON file.
     results = {
         "domain": ARGS.domain,
@@ -158,7 +477,15 @@ def store_results(cfg, seed, plan_dir, exitcode, runtime):
         "planner_exitcode": exitcode,
         "runtime": runtime,
     }
-    with open(plan_dir / "properties.json", "w") as props:
+    results.update(extra_properties)
+    write_properties(plan_dir, results)
+
+
+def write_properties(plan_dir, results):
+    # Replace the file atomically. This also updates the modification time
+    # of the plan dir, which the run index uses to detect changed runs.
+    tmp_file = plan_dir / "properties.json.tmp"
+    with open(tmp_file, "w") as props:
         json.dump(
             results,
             props,
@@ -166,82 +493,487 @@ def store_results(cfg, seed, plan_dir, exitcode, runtime):
             separators=(",", ": "),
             sort_keys=True,
         )
+    os.replace(tmp_file, plan_dir / "properties.json")
+
+
+def store_validation_result(plan_dir, valid):
+    with open(plan_dir / "properties.json") as props:
+        results = json.load(props)
+    results["plan_valid"] = valid
+    write_properties(plan_dir, results)
+    if valid is None:
+        logging.warning(f"Could not validate plan in {plan_dir}")
+    elif not valid:
+        logging.warning(f"VAL rejected plan in {plan_dir}")
+    keep_results(plan_dir)
+
+
+def setup_storage():
+    global STORAGE
+    output_dir = SMAC_RUN_DIR / TMP_PLAN_DIR
+    if ARGS.scratch_dir:
+        Path(ARGS.scratch_dir).mkdir(parents=True, exist_ok=True)
+        work_dir = tempfile.mkdtemp(dir=ARGS.scratch_dir, prefix=f"{DOMAIN.name}-")
+        logging.info(f"Plan directories are created in {work_dir}")
+    else:
+        work_dir = output_dir
+    STORAGE = storage.PlanStorage(work_dir, output_dir, SMAC_RUN_DIR / "pruned-runs.jsonl")
+
+
+def start_planners():
+    """Start persistent planner backends, which need to see the plan dirs."""
+    for runner in RUNNERS.values():
+        runner.start(STORAGE.work_dir)
+    if ARGS.planner_backend == "instance":
+        # The startup time is paid once per search run and not part of the runtimes.
+        startup_times = {name: runner.backend.startup_time for name, runner in RUNNERS.items()}
+        logging.info(f"Planner startup times: {startup_times}")
+        SMAC_RUN_DIR.mkdir(parents=True, exist_ok=True)
+        with open(SMAC_RUN_DIR / "planner-startup-times.json", "w") as f:
+            json.dump(startup_times, f, indent=2, sort_keys=True)
+
+
+def stop_planners():
+    for runner in RUNNERS.values():
+        runner.stop()
+
+
+def keep_results(plan_dir):
+    """Keep, promote or prune the plan dir according to the retention policy."""
+    with open(plan_dir / "properties.json") as props:
+        results = json.load(props)
+    for action, path, props in RETENTION.add(plan_dir, results):
+        if action == retention.KEEP:
+            STORAGE.keep(path)
+        elif action == retention.KEEP_PROPERTIES:
+            STORAGE.keep(path, ["properties.json"])
+        else:
+            STORAGE.prune(path, props)
+
+
+VALIDATOR = None
+if ARGS.validation == "deferred":
+    VALIDATOR = validation.DeferredValidator(ARGS.validation_jobs, store_validation_result)
+
+
+def prepare_planner_dirs(plan_dir):
+    """Return a mapping from planner names to the directories they run in.
+
+    A single planner runs directly in the plan dir. For multiple planners, we
+    use one subdirectory per planner and hard-link the task files into it.
+    """
+    if len(RUNNERS) == 1:
+        return {name: plan_dir for name in RUNNERS}
+    planner_dirs = {}
+    for name in RUNNERS:
+        planner_dir = plan_dir / name
+        planner_dir.mkdir()
+        for filename in ["domain.pddl", "problem.pddl"]:
+            os.link(plan_dir / filename, planner_dir / filename)
+        planner_dirs[name] = planner_dir
+    return planner_dirs
+
+
+def run_planner(name, planner_dir):
+    exitcode = RUNNERS[name].run_planner(planner_dir)
+    runtime = parse_runtime(planner_dir) if exitcode == 0 else None
+    show_error_log(planner_dir)
+    subprocess.run(["xz", "run.log"], cwd=planner_dir)
+    return exitcode, runtime
+
+
+def run_planners(plan_dir):
+    """Run all planners concurrently and return their directories, exit codes and runtimes."""
+    planner_dirs = prepare_planner_dirs(plan_dir)
+    with ThreadPoolExecutor(max_workers=len(planner_dirs)) as executor:
+        futures = {
+            name: executor.submit(run_planner, name, planner_dir)
+            for name, planner_dir in planner_dirs.items()
+        }
+        results = {name: future.result() for name, future in futures.items()}
+    exitcodes = {name: exitcode for name, (exitcode, _) in results.items()}
+    runtimes = {name: runtime for name, (_, runtime) in results.items()}
+    return planner_dirs, exitcodes, runtimes
+
+
+def get_objective_value(runtimes):
+    """Return the value to maximize or None if no planner solved the task."""
+    solved_runtimes = [runtime for runtime in runtimes.values() if runtime is not None]
+    if not solved_runtimes:
+        return None
+    if ARGS.portfolio_objective == "min":
+        return min(solved_runtimes)
+    elif ARGS.portfolio_objective == "max":
+        return max(solved_runtimes)
+    elif ARGS.portfolio_objective == "disagreement":
+        slowest = max(
+            ARGS.planner_time_limit if runtime is None else runtime
+            for runtime in runtimes.values())
+        return math.log(slowest / min(solved_runtimes))
+    raise ValueError(ARGS.portfolio_objective)
+
+
+def get_grounding_size(plan_dir):
+    """Return the estimated numbers of ground atoms and actions or None if the task cannot be parsed."""
+    try:
+        return grounding.estimate_grounding_size(plan_dir / "domain.pddl", plan_dir / "problem.pddl")
+    except (OSError, pddl_scanner.PDDLError) as err:
+        logging.warning(f"Failed to estimate grounding size of task in {plan_dir}: {err}")
+        return None
+
+
+def exceeds_grounding_limits(num_atoms, num_actions):
+    return ((ARGS.max_ground_atoms is not None and num_atoms > ARGS.max_ground_atoms) or
+            (ARGS.max_ground_actions is not None and num_actions > ARGS.max_ground_actions))
+
+
+def skip_task(cfg, seed, plan_dir, reason, **extra_properties):
+    """Record a task that we don't pass to the planners and return its cost."""
+    store_results(cfg, seed, plan_dir, exitcode=None, runtime=None, skipped=reason, **extra_properties)
+    keep_results(plan_dir)
+    return FAILURE_COST
+
+
+def record_generator_failure(cfg, seed, err):
+    """Pass the partially generated plan dir to the retention policy and return the cost."""
+    plan_dir = utils.get_plan_dir(STORAGE.work_dir, cfg, seed)
+    if plan_dir.is_dir():
+        store_results(cfg, seed, plan_dir, exitcode=None, runtime=None, generator_failure=str(err))
+        keep_results(plan_dir)
+    return FAILURE_COST
+
+
+def iter_stored_outcomes():
+    """Yield (cfg, task features, solved) triples of the tasks evaluated by
+    earlier runs that use the same SMAC output dir, including pruned runs."""
+    records = []
+    for properties_file in SMAC_OUTPUT_DIR.glob(f"run_*/{TMP_PLAN_DIR}/*/*/properties.json"):
+        try:
+            with open(properties_file) as f:
+                records.append(json.load(f))
+        except (OSError, json.JSONDecodeError):
+            continue
+    for summary_file in SMAC_OUTPUT_DIR.glob("run_*/pruned-runs.jsonl"):
+        with open(summary_file) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    for record in records:
+        # Skipped tasks have no planner outcome.
+        if record.get("task_features") is not None and "runtimes" in record:
+            yield record["parameters"], record["task_features"], record["objective"] is not None
+
+
+def seed_predictor():
+    """Train the timeout predictor on the tasks of earlier runs, e.g., before a restart."""
+    outcomes = list(iter_stored_outcomes())
+    PREDICTOR.add_many(outcomes)
+    logging.info(f"Seeded timeout predictor with {len(outcomes)} evaluated tasks")
+
+
+def get_task_features(plan_dir):
+    _, task_features = features.try_to_extract_features(
+        (0, (plan_dir / "domain.pddl", plan_dir / "problem.pddl")))
+    if task_features is None:
+        logging.warning(f"Failed to extract features of task in {plan_dir}")
+    return task_features
+
+
+def evaluate_configuration(cfg, seed=1, instance=None):
+    DRIVER_OVERHEAD.start_evaluation()
+    try:
+        if instance is None:
+            return evaluate_parameters(cfg.get_dictionary(), seed)
+        return evaluate_seed_batch(cfg.get_dictionary(), get_batch_seeds(instance, seed))
+    finally:
+        DRIVER_OVERHEAD.end_evaluation()
+
+
+def write_instance_file():
+    """Write the names of the seed batches that SMAC uses as instances."""
+    SMAC_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    with open(INSTANCE_FILE, "w") as f:
+        for batch in range(ARGS.seed_batches):
+            print(f"batch-{batch}", file=f)
+
+
+def get_batch_seeds(instance, seed):
+    """Return the generator seeds of a batch.
+
+    The seeds only depend on the batch name and the SMAC seed. With
+    --deterministic, SMAC always passes seed 0, so parallel SMAC runs sharing
+    their runhistories evaluate the same tasks for each instance. Otherwise,
+    SMAC draws a new seed for each repeated run of a configuration on an
+    instance, which yields a new set of tasks.
+    """
+    rng = random.Random(f"{instance}-{seed}")
+    return rng.sample(range(2 ** 31), ARGS.seeds_per_batch)
+
 
+def get_batch_cost(costs):
+    """Return the --batch-cost-quantile of the costs (without interpolation)."""
+    costs = sorted(costs)
+    index = max(0, math.ceil(ARGS.batch_cost_quantile * len(costs)) - 1)
+    return costs[index]
 
-def evaluate_configuration(cfg, seed=1):
+
+def evaluate_seed_batch(cfg, seeds):
+    with ThreadPoolExecutor(max_workers=ARGS.parallel_seeds) as executor:
+        costs = list(executor.map(lambda seed: evaluate_parameters(cfg, seed), seeds))
+    cost = get_batch_cost(costs)
+    logging.info(f"Costs for configuration {cfg} with seeds {seeds}: {costs} (aggregated: {cost})")
+    return cost
+
+
+def evaluate_parameters(cfg, seed):
     peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
-    cfg = cfg.get_dictionary()
 
     try:
         cfg = DOMAIN.adapt_parameters(cfg)
     except domains.IllegalConfiguration as err:
         logging.info(f"Skipping illegal configuration {cfg}: {err}")
-        return 100
+        return FAILURE_COST
 
     logging.info(f"[{peak_memory} KB] Evaluate configuration {cfg} with seed {seed}")
 
+    failure = GENERATOR_FAILURES.get(DOMAIN.name, cfg, seed, time_limit=ARGS.generator_time_limit)
+    if failure:
+        logging.info(f"Skipping task {cfg} with seed {seed} whose generation failed before: {failure}")
+        return FAILURE_COST
+
     try:
-        plan_dir = utils.generate_input_files(
-            GENERATORS_DIR, DOMAIN, cfg, seed, SMAC_RUN_DIR / TMP_PLAN_DIR)
+        with GENERATION_LOCK:
+            plan_dir = utils.generate_input_files(
+                GENERATORS_DIR, DOMAIN, cfg, seed, STORAGE.work_dir, timeout=ARGS.generator_time_limit)
     except subprocess.CalledProcessError as err:
         logging.error(f"Failed to generate task {cfg}: {err}")
-        return 100
-
-    exitcode = RUNNER.run_planner(plan_dir)
-    runtime = parse_runtime(plan_dir) if exitcode == 0 else None
-    store_results(cfg, seed, plan_dir, exitcode, runtime)
-    show_error_log(plan_dir)
-    subprocess.run(["xz", "run.log"], cwd=plan_dir)
-    if runtime is not None:
-        logging.info(f"Solved task {cfg} in {runtime}s")
+        GENERATOR_FAILURES.add(DOMAIN.name, cfg, seed, str(err))
+        return record_generator_failure(cfg, seed, err)
+    except subprocess.TimeoutExpired as err:
+        logging.error(f"Failed to generate task {cfg}: {err}")
+        GENERATOR_FAILURES.add(DOMAIN.name, cfg, seed, str(err), timeout=ARGS.generator_time_limit)
+        return record_generator_failure(cfg, seed, err)
+
+    error = syntax_check.try_to_check_generated_task(plan_dir)
+    if error:
+        logging.error(f"Generator produced malformed task {cfg}: {error}")
+        GENERATOR_FAILURES.add(DOMAIN.name, cfg, seed, f"malformed task: {error}")
+        store_results(cfg, seed, plan_dir, exitcode=None, runtime=None, malformed_task=error)
+        keep_results(plan_dir)
+        return FAILURE_COST
+
+    task_hash = seen_tasks.try_to_hash_generated_task(plan_dir) if SEEN_TASKS else None
+    if task_hash and not SEEN_TASKS.claim(task_hash):
+        # Another run may still be evaluating the task. Waiting for its result
+        # would block this evaluation slot for up to the planner time limit,
+        # so we only wait briefly and otherwise treat the task as a failed
+        # duplicate. If the other run gives up, we evaluate the task ourselves.
+        cost = SEEN_TASKS.get_result(task_hash, timeout=ARGS.duplicate_wait)
+        if cost is not None or not SEEN_TASKS.claim(task_hash):
+            shutil.rmtree(plan_dir)
+            logging.info(f"Skipping duplicate task {cfg} with seed {seed} (cost: {cost})")
+            return FAILURE_COST if cost is None else cost
+
+    try:
+        cost = evaluate_task(cfg, seed, plan_dir)
+    except BaseException:
+        # Don't let other runs wait for a result that never comes.
+        if task_hash:
+            SEEN_TASKS.release(task_hash)
+        raise
+    if task_hash:
+        SEEN_TASKS.set_result(task_hash, cost)
+    return cost
+
+
+def evaluate_task(cfg, seed, plan_dir):
+    """Run the planners on the generated task (unless we skip it) and return its cost."""
+    extra_properties = {}
+    if ARGS.max_ground_atoms is not None or ARGS.max_ground_actions is not None:
+        grounding_size = get_grounding_size(plan_dir)
+        if grounding_size:
+            num_atoms, num_actions = grounding_size
+            extra_properties.update(estimated_ground_atoms=num_atoms, estimated_ground_actions=num_actions)
+            if exceeds_grounding_limits(num_atoms, num_actions):
+                logging.info(f"Skipping task {cfg} with {num_atoms} ground atoms and {num_actions} ground actions")
+                return skip_task(cfg, seed, plan_dir, "grounding-size", **extra_properties)
+
+    task_features = get_task_features(plan_dir) if PREDICTOR else None
+    if task_features is not None:
+        probability = PREDICTOR.predict_failure_probability(cfg, task_features)
+        if probability is not None and probability >= ARGS.timeout_skip_threshold:
+            logging.info(f"Skipping task {cfg} with predicted failure probability {probability:.2f}")
+            return skip_task(
+                cfg, seed, plan_dir, "predicted-failure",
+                predicted_failure_probability=probability, **extra_properties)
+
+    planner_dirs, exitcodes, runtimes = run_planners(plan_dir)
+    # "runtime" is the runtime of the fastest planner, so the properties of
+    # single planners and portfolios have the same layout.
+    solved_runtimes = [runtime for runtime in runtimes.values() if runtime is not None]
+    store_results(
+        cfg, seed, plan_dir,
+        exitcode=0 if solved_runtimes else max(exitcodes.values()),
+        runtime=min(solved_runtimes, default=None),
+        planner_exitcodes=exitcodes,
+        runtimes=runtimes,
+        objective=get_objective_value(runtimes),
+        validation=ARGS.validation,
+        task_features=task_features,
+        **extra_properties,
+    )
+    solved_dirs = [
+        planner_dirs[name] for name, runtime in runtimes.items()
+        if runtime is not None and name in PLAN_WRITERS]
+    if VALIDATOR and solved_dirs:
+        # The validator calls keep_results() once it is done.
+        VALIDATOR.submit(plan_dir, solved_dirs)
+    else:
+        keep_results(plan_dir)
+    value = get_objective_value(runtimes)
+    if value is not None:
+        logging.info(f"Solved task {cfg}: {runtimes}")
         # Maximize runtime.
-        return -runtime
+        cost = -value
     else:
         logging.info(f"Failed to solve task {cfg}")
-        return 100
-
-
-# Build Configuration Space which defines all parameters and their ranges.
-cs = ConfigurationSpace()
-
-cs.add_hyperparameters(DOMAIN.attributes)
-
-scenario = Scenario(
-    {
-        "run_obj": "quality",
-        # max. number of function evaluations
-        "ta_run_limit": ARGS.max_configurations,
-        # maximum total runtime for function evaluations
-        "algo_runs_timelimit": ARGS.overall_time_limit,
-        "wallclock_limit": ARGS.overall_time_limit,
-        "cs": cs,
-        "deterministic": ARGS.deterministic,
-        # memory limit for evaluate_cfg (we set the limit ourselves)
-        "memory_limit": None,
-        # time limit for evaluate_cfg (we cut off planner runs ourselves)
-        "cutoff": None,
-        "output_dir": f"{SMAC_OUTPUT_DIR}",
-        # Disable pynisher.
-        "limit_resources": False,
-        # Run SMAC in parallel.
-        "shared_model": True,
-        "input_psmac_dirs": f"{SMAC_OUTPUT_DIR}/run_*",
-    }
-)
+        cost = FAILURE_COST
+    if task_features is not None:
+        PREDICTOR.add(cfg, task_features, solved=value is not None)
+    return cost
+
+
+def get_runtime(cost):
+    return None if cost == FAILURE_COST else -cost
+
+
+def get_legal_values(attribute):
+    """Return values of the scaling parameter that are legal in combination with the defaults."""
+    values = []
+    for value in domains.get_values(attribute):
+        cfg = DOMAIN.get_default_parameters()
+        cfg[attribute.name] = value
+        try:
+            DOMAIN.adapt_parameters(cfg)
+        except domains.IllegalConfiguration:
+            continue
+        values.append(value)
+    return values
+
+
+def run_bisection():
+    global SMAC_RUN_DIR
+    SMAC_RUN_DIR = SMAC_OUTPUT_DIR / f"run_{ARGS.random_seed}"
+    logging.info(f"Run dir: {SMAC_RUN_DIR}")
+    setup_storage()
+    if PREDICTOR:
+        seed_predictor()
+    start_planners()
+    attribute = DOMAIN.get_attribute(DOMAIN.scaling_parameter)
+    seeds = [random.randrange(2 ** 31) for _ in range(ARGS.seeds_per_value)]
+
+    def evaluate(value):
+        cfg = DOMAIN.get_default_parameters()
+        cfg[attribute.name] = value
+        runtimes = [get_runtime(evaluate_parameters(cfg, seed)) for seed in seeds]
+        return bisection.get_median_runtime(runtimes)
+
+    values = get_legal_values(attribute)
+    logging.info(f"Search {attribute.name} in {values} for target runtime {ARGS.target_runtime}s")
+    value, runtime = bisection.find_value_for_runtime(values, evaluate, ARGS.target_runtime)
+    logging.info(f"Best value: {attribute.name}={value} with median runtime {runtime}s")
+
+
+def get_model_kwargs():
+    if ARGS.model_points_per_tree is None:
+        return None
+    return {"n_points_per_tree": ARGS.model_points_per_tree}
+
+
+def get_acquisition_function_optimizer_kwargs():
+    if ARGS.acq_opt_max_steps is None:
+        return None
+    return {"max_steps": ARGS.acq_opt_max_steps}
+
+
+def run_smac():
+    global SMAC_RUN_DIR
+    # Build Configuration Space which defines all parameters and their ranges.
+    cs = ConfigurationSpace()
+
+    cs.add_hyperparameters(DOMAIN.attributes)
+
+    extra_options = {}
+    if ARGS.seed_batches:
+        write_instance_file()
+        extra_options["instance_file"] = str(INSTANCE_FILE)
+    if ARGS.acq_opt_challengers is not None:
+        extra_options["acq_opt_challengers"] = ARGS.acq_opt_challengers
+
+    scenario = Scenario(
+        {
+            "run_obj": "quality",
+            # max. number of function evaluations
+            "ta_run_limit": ARGS.max_configurations,
+            # maximum total runtime for function evaluations
+            "algo_runs_timelimit": ARGS.overall_time_limit,
+            "wallclock_limit": ARGS.overall_time_limit,
+            "cs": cs,
+            "deterministic": ARGS.deterministic,
+            # memory limit for evaluate_cfg (we set the limit ourselves)
+            "memory_limit": None,
+            # time limit for evaluate_cfg (we cut off planner runs ourselves)
+            "cutoff": None,
+            "output_dir": f"{SMAC_OUTPUT_DIR}",
+            # Disable pynisher.
+            "limit_resources": False,
+            # Run SMAC in parallel.
+            "shared_model": True,
+            "input_psmac_dirs": f"{SMAC_OUTPUT_DIR}/run_*",
+            **extra_options,
+        }
+    )
 
-# When using SMAC4HPO, the default configuration has to be requested explicitly
-# as first design (see https://github.com/automl/SMAC3/issues/533).
-smac = SMAC(
-    scenario=scenario,
-    initial_design=DefaultConfiguration,
-    rng=np.random.RandomState(ARGS.random_seed),
-    tae_runner=evaluate_configuration,
-)
-SMAC_RUN_DIR = Path(smac.output_dir)
-logging.info(f"SMAC run dir: {SMAC_RUN_DIR}")
+    # When using SMAC4HPO, the default configuration has to be requested explicitly
+    # as first design (see https://github.com/automl/SMAC3/issues/533).
+    smac = SMAC(
+        scenario=scenario,
+        initial_design=DefaultConfiguration,
+        rng=np.random.RandomState(ARGS.random_seed),
+        tae_runner=evaluate_configuration,
+        model_kwargs=get_model_kwargs(),
+        acquisition_function_optimizer_kwargs=get_acquisition_function_optimizer_kwargs(),
+    )
+    SMAC_RUN_DIR = Path(smac.output_dir)
+    logging.info(f"SMAC run dir: {SMAC_RUN_DIR}")
+    setup_storage()
+    if PREDICTOR:
+        seed_predictor()
+    start_planners()
+
+    default_cfg = cs.get_default_configuration()
+    logging.info(f"Default config: {default_cfg}")
+
+    logging.info("Optimizing...")
+    DRIVER_OVERHEAD.start()
+    try:
+        incumbent = smac.optimize()
+    finally:
+        logging.info(f"SMAC summary: {DRIVER_OVERHEAD}")
 
-default_cfg = cs.get_default_configuration()
-logging.info(f"Default config: {default_cfg}")
 
-logging.info("Optimizing...")
-incumbent = smac.optimize()
+try:
+    if ARGS.bisect:
+        run_bisection()
+    else:
+        run_smac()
+finally:
+    stop_planners()
+    # Flush the results even if the search is aborted.
+    if VALIDATOR:
+        logging.info("Waiting for deferred plan validation to finish...")
+        VALIDATOR.shutdown()
+    if STORAGE:
+        STORAGE.shutdown()
@@ -0,0 +1,147 @@
+"""Detect duplicate tasks directly after generating them."""
+
+import contextlib
+import fcntl
+import json
+import logging
+import os
+from pathlib import Path
+import socket
+import threading
+import time
+
+import hashing
+import pddl_scanner
+
+
+def try_to_hash_generated_task(plan_dir):
+    """Return the hash of the task in plan_dir or None if it cannot be parsed."""
+    try:
+        return hashing.hash_task(plan_dir / "domain.pddl", plan_dir / "problem.pddl")
+    except (OSError, pddl_scanner.PDDLError) as err:
+        logging.warning(f"Failed to hash task in {plan_dir}: {err}")
+        return None
+
+
+class SeenTasks:
+    """
+    Set of task hashes shared by all processes that use the same directory,
+    e.g., parallel SMAC runs with the same output dir.
+
+    Each hash is a marker file. The process that claims a task writes its
+    host and PID to the marker and later replaces them by the result of
+    evaluating the task, where the other processes can look it up. Claims
+    of processes that died before storing a result (or that are older than
+    *max_age* seconds) are stale and can be claimed again. All claims are
+    made while holding a lock on the directory, so exactly one process
+    claims each task.
+    """
+
+    def __init__(self, directory, max_age=None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self.owner = {"host": socket.gethostname(), "pid": os.getpid()}
+
+    def _get_path(self, task_hash):
+        return self.directory / task_hash[:2] / task_hash
+
+    @contextlib.contextmanager
+    def _lock(self):
+        with open(self.directory / ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _read(path):
+        content = path.read_text()
+        if not content:
+            return {}
+        data = json.loads(content)
+        if not isinstance(data, dict):
+            # Results of older versions are stored without a wrapper.
+            return {"result": data}
+        return data
+
+    @staticmethod
+    def _write(path, data):
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(data))
+        os.replace(tmp_path, path)
+
+    def _is_abandoned(self, path):
+        """Return True if nobody has claimed the task or the claim is stale."""
+        try:
+            data = self._read(path)
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return True
+        if "result" in data:
+            return False
+        if not data:
+            # Older versions created empty markers for claimed tasks.
+            return True
+        if data.get("host") == self.owner["host"] and not _is_running(data.get("pid")):
+            return True
+        return self.max_age is not None and time.time() - mtime > self.max_age
+
+    def claim(self, task_hash):
+        """Return True if no other living process has claimed the task."""
+        path = self._get_path(task_hash)
+        path.parent.mkdir(exist_ok=True)
+        with self._lock():
+            if not self._is_abandoned(path):
+                return False
+            if path.exists():
+                logging.info(f"Taking over stale claim for task {task_hash}")
+            self._write(path, self.owner)
+        return True
+
+    def release(self, task_hash):
+        """Give up a claim without storing a result, e.g., after an error."""
+        path = self._get_path(task_hash)
+        with self._lock():
+            try:
+                if self._read(path) == self.owner:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def set_result(self, task_hash, result):
+        self._write(self._get_path(task_hash), {"result": result})
+
+    def get_result(self, task_hash, interval=5, timeout=None):
+        """
+        Return the result stored for a claimed task. If the claiming process
+        is still evaluating the task, wait at most *timeout* seconds for the
+        result. Return None if there is no result by then or if the claim
+        is released or becomes stale before there is a result.
+        """
+        path = self._get_path(task_hash)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                data = self._read(path)
+            except FileNotFoundError:
+                return None
+            if "result" in data:
+                return data["result"]
+            if self._is_abandoned(path):
+                return None
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            sleep_time = interval if deadline is None else min(interval, deadline - time.monotonic())
+            time.sleep(max(0, sleep_time))
+
+
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
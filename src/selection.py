@@ -0,0 +1,95 @@
+"""Select a subset of the solved runs for the benchmark set.
+
+All runs are loaded into NumPy arrays. Each (domain, runtime bucket) group
+contributes at most a given number of tasks. Within a group, we either
+take the first tasks in random order (random) or use farthest-point
+sampling in the normalized parameter space of the domain (coverage), which
+greedily adds the task farthest away from all tasks selected so far.
+"""
+
+import math
+
+import numpy as np
+
+import utils
+
+
+SELECTION_METHODS = ["random", "coverage"]
+
+
+def get_runtime_buckets(runtimes):
+    """Return the index of utils.get_runtime_bound(runtime) in RUNTIME_BOUNDS for each runtime."""
+    return np.searchsorted(np.array(utils.RUNTIME_BOUNDS), runtimes, side="left")
+
+
+def drop_duplicates(runs, seed):
+    """Shuffle the runs and keep the first run for each problem hash in each domain."""
+    if not runs:
+        return []
+    order = np.random.RandomState(seed).permutation(len(runs))
+    keys = np.array([f"{runs[i].domain} {runs[i].problem_hash}" for i in order])
+    _, first = np.unique(keys, return_index=True)
+    return [runs[i] for i in order[np.sort(first)]]
+
+
+def get_parameter_matrix(parameter_dicts):
+    """Return one row per configuration with all values scaled to [0, 1].
+
+    Numeric parameters use one column each. Other parameters are one-hot
+    encoded, so different values have distance 1.
+    """
+    names = sorted(set().union(*parameter_dicts))
+    columns = []
+    for name in names:
+        values = [parameters.get(name) for parameters in parameter_dicts]
+        if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+            column = np.array(values, dtype=float)
+            span = column.max() - column.min()
+            columns.append((column - column.min()) / span if span else np.zeros(len(column)))
+        else:
+            _, codes = np.unique(np.array([str(value) for value in values]), return_inverse=True)
+            columns.extend(np.eye(codes.max() + 1)[codes].T)
+    if not columns:
+        return np.zeros((len(parameter_dicts), 0))
+    return np.column_stack(columns)
+
+
+def farthest_point_sampling(points, k):
+    """Return the indices of k points, starting with the first point."""
+    k = min(k, len(points))
+    if k <= 0:
+        return []
+    selected = [0]
+    distances = np.linalg.norm(points - points[0], axis=1)
+    distances[0] = -1
+    for _ in range(k - 1):
+        index = int(np.argmax(distances))
+        selected.append(index)
+        distances = np.minimum(distances, np.linalg.norm(points - points[index], axis=1))
+        distances[selected] = -1
+    return selected
+
+
+def select_runs(runs, max_tasks_per_bucket, method="random"):
+    """Select at most *max_tasks_per_bucket* runs per domain and runtime bucket.
+
+    The runs should be distinct and in random order (see drop_duplicates()).
+    The selected runs keep their relative order.
+    """
+    if not runs or not math.isfinite(max_tasks_per_bucket):
+        return list(runs)
+    quota = max(0, int(max_tasks_per_bucket))
+    _, domain_codes = np.unique(np.array([run.domain for run in runs]), return_inverse=True)
+    buckets = get_runtime_buckets(np.array([run.runtime for run in runs], dtype=float))
+    groups = domain_codes * len(utils.RUNTIME_BOUNDS) + buckets
+    # Group the runs without changing their order within each group.
+    order = np.argsort(groups, kind="stable")
+    group_starts = np.flatnonzero(np.diff(groups[order], prepend=-1))
+    selected = []
+    for members in np.split(order, group_starts[1:]):
+        if len(members) <= quota or method == "random":
+            selected.extend(members[:quota])
+        else:
+            points = get_parameter_matrix([runs[i].parameters for i in members])
+            selected.extend(members[farthest_point_sampling(points, quota)])
+    return [runs[i] for i in sorted(selected)]
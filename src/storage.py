@@ -0,0 +1,88 @@
+"""Keep plan directories in a local working area and promote them to the output dir."""
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import logging
+from pathlib import Path
+import shutil
+
+
+class PlanStorage:
+    """
+    Plan directories are created below *work_dir*. If *work_dir* differs from
+    *output_dir* (e.g., because it lives on a node-local tmpfs), kept
+    directories are copied to the corresponding location below *output_dir*
+    and then removed from the working area. All file operations run in a
+    single background thread, so they happen in the order they were
+    requested and never block the search.
+
+    Pruned plan directories are deleted and only a one-line JSON summary
+    is appended to *summary_file*.
+    """
+
+    def __init__(self, work_dir, output_dir, summary_file=None):
+        self.work_dir = Path(work_dir)
+        self.output_dir = Path(output_dir)
+        self.summary_file = summary_file
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def uses_work_dir(self):
+        return self.work_dir != self.output_dir
+
+    def get_output_dir(self, plan_dir):
+        return self.output_dir / Path(plan_dir).relative_to(self.work_dir)
+
+    def keep(self, plan_dir, filenames=None):
+        """Keep the given files (default: all files) of *plan_dir* in the output dir."""
+        if self.uses_work_dir():
+            self._submit(self._promote, plan_dir, filenames)
+        elif filenames is not None:
+            self._submit(self._remove_other_files, plan_dir, filenames)
+
+    def prune(self, plan_dir, record):
+        """Delete *plan_dir* (also from the output dir) and store a summary *record*."""
+        self._submit(self._prune, plan_dir, record)
+
+    def _submit(self, func, *args, **kwargs):
+        future = self._executor.submit(func, *args, **kwargs)
+        future.add_done_callback(_log_exception)
+
+    def _promote(self, plan_dir, filenames):
+        dest = self.get_output_dir(plan_dir)
+        if filenames is None:
+            shutil.copytree(plan_dir, dest, dirs_exist_ok=True)
+        else:
+            dest.mkdir(parents=True, exist_ok=True)
+            for filename in filenames:
+                if (plan_dir / filename).exists():
+                    shutil.copy2(plan_dir / filename, dest / filename)
+        shutil.rmtree(plan_dir)
+        logging.debug(f"Promoted {plan_dir} to {dest}")
+
+    def _remove_other_files(self, plan_dir, filenames):
+        for path in plan_dir.iterdir():
+            if path.name in filenames:
+                continue
+            if path.is_dir():
+                shutil.rmtree(path)
+            else:
+                path.unlink()
+
+    def _prune(self, plan_dir, record):
+        shutil.rmtree(plan_dir, ignore_errors=True)
+        shutil.rmtree(self.get_output_dir(plan_dir), ignore_errors=True)
+        if self.summary_file:
+            record = dict(record, plan_dir=str(self.get_output_dir(plan_dir)))
+            with open(self.summary_file, "a") as f:
+                print(json.dumps(record, sort_keys=True), file=f)
+        logging.debug(f"Pruned {plan_dir}")
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+        if self.uses_work_dir():
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+
+
+def _log_exception(future):
+    if future.exception():
+        logging.error(f"Plan storage operation failed: {future.exception()}")
@@ -0,0 +1,81 @@
+"""Fast syntactic check of generated PDDL tasks.
+
+We check that both files are balanced "(define ...)" expressions, that the
+required sections exist and that the init facts and goal atoms only use
+declared objects and constants. This catches empty and truncated generator
+outputs before any planner is started.
+"""
+
+import pddl_scanner
+
+
+REQUIRED_DOMAIN_SECTIONS = ["domain"]
+REQUIRED_PROBLEM_SECTIONS = ["problem", ":domain", ":init", ":goal"]
+
+
+def _is_object_argument(name):
+    return not name.startswith("?") and not _is_number(name)
+
+
+def _is_number(name):
+    try:
+        float(name)
+    except ValueError:
+        return False
+    return True
+
+
+def _iter_goal_atoms(formula):
+    """Like pddl_scanner.iter_atoms(), but skip the variable lists of quantifiers."""
+    if not isinstance(formula, tuple):
+        return
+    if formula[:1] in [("forall",), ("exists",)]:
+        sublists = formula[2:]
+    else:
+        sublists = [part for part in formula if isinstance(part, tuple)]
+        if not sublists:
+            yield formula
+    for part in sublists:
+        yield from _iter_goal_atoms(part)
+
+
+def check_task(domain_file, problem_file):
+    """Raise PDDLError if the task is malformed."""
+    constants = set()
+    sections = set()
+    for keyword, elements in pddl_scanner.parse_sections(domain_file):
+        sections.add(keyword)
+        if keyword == ":constants":
+            constants.update(pddl_scanner.iter_typed_names(elements))
+    for keyword in REQUIRED_DOMAIN_SECTIONS:
+        if keyword not in sections:
+            raise pddl_scanner.PDDLError(f"domain file has no {keyword} section")
+
+    object_names = []
+    declared = None
+    sections = set()
+    for keyword, element in pddl_scanner.iter_sections(problem_file):
+        sections.add(keyword)
+        if keyword == ":objects":
+            object_names.append(element)
+        elif keyword in [":init", ":goal"]:
+            # The objects are declared before the init and goal sections.
+            if declared is None:
+                declared = constants | set(pddl_scanner.iter_typed_names(object_names))
+            atoms = pddl_scanner.iter_atoms(element) if keyword == ":init" else _iter_goal_atoms(element)
+            for atom in atoms:
+                for argument in atom[1:]:
+                    if _is_object_argument(argument) and argument not in declared:
+                        raise pddl_scanner.PDDLError(f"undeclared object {argument!r} in {atom!r}")
+    for keyword in REQUIRED_PROBLEM_SECTIONS:
+        if keyword not in sections:
+            raise pddl_scanner.PDDLError(f"problem file has no {keyword} section")
+
+
+def try_to_check_generated_task(plan_dir):
+    """Return None if the task in plan_dir is well-formed and an error message otherwise."""
+    try:
+        check_task(plan_dir / "domain.pddl", plan_dir / "problem.pddl")
+    except (OSError, pddl_scanner.PDDLError) as err:
+        return str(err)
+    return None
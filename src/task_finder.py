@@ -0,0 +1,108 @@
+"""Find PDDL tasks, i.e., pairs of problem and domain files, in directory trees."""
+
+import logging
+import os
+from pathlib import Path
+
+
+def find_tasks(paths):
+    """Yield the tasks in the given files and directory trees lazily."""
+    for path in paths:
+        path = Path(path)
+        if path.is_file() and is_problem_file(path.name):
+            yield Task(path)
+        elif path.is_dir():
+            yield from scan_directory(path)
+
+
+def scan_directory(directory: Path):
+    """Yield the tasks below *directory*, listing each directory only once.
+
+    Domain files are looked up in the directory listing, so we don't need
+    any stat calls for finding them. Problem files without a domain file are
+    skipped with a warning.
+    """
+    files = {}
+    subdirs = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                subdirs.append(entry.name)
+            elif entry.is_file():
+                files[entry.name] = entry
+    filenames = files.keys()
+    for filename in sorted(filenames):
+        if is_problem_file(filename):
+            domain_basenames = get_domain_basenames(filename)
+            domain_basename = next((name for name in domain_basenames if name in filenames), None)
+            if domain_basename is None:
+                logging.warning(f"Skipping {directory / filename}: no domain file found ({domain_basenames})")
+                continue
+            yield Task(
+                directory / filename, directory / domain_basename,
+                problem_entry=files[filename], domain_entry=files[domain_basename])
+    for subdir in sorted(subdirs):
+        yield from scan_directory(directory / subdir)
+
+
+def is_problem_file(filename):
+    return filename.endswith(".pddl") and filename != ".pddl" and "domain" not in filename
+
+
+def get_domain_basenames(problem_filename):
+    stem, suffix = os.path.splitext(problem_filename)
+    return [
+        "domain.pddl",
+        stem + "-domain" + suffix,
+        stem[:3] + "-domain.pddl",  # for airport and psr-small
+        "domain_" + problem_filename,
+        "domain-" + problem_filename,
+    ]
+
+
+def find_file(filenames, dir: Path):
+    for filename in filenames:
+        path = dir / filename
+        if path.is_file():
+            return path
+    raise OSError(f"none found in {dir!r}: {filenames!r}")
+
+
+def find_domain_file(task_path: Path):
+    return find_file(get_domain_basenames(task_path.name), task_path.parent)
+
+
+def get_file_key(path_or_entry):
+    """Return a string that changes when the file is modified."""
+    if isinstance(path_or_entry, os.DirEntry):
+        stat = path_or_entry.stat()
+    else:
+        stat = os.stat(path_or_entry)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class Task:
+    def __init__(self, path, domain_file=None, problem_entry=None, domain_entry=None):
+        self.problem_file = path
+        self.domain_file = domain_file or find_domain_file(path)
+        # Directory entries from scan_directory() cache the stat results.
+        # All tasks in a directory share the entry of their domain file.
+        self._problem_entry = problem_entry
+        self._domain_entry = domain_entry
+
+    def get_file_keys(self):
+        """Return the file keys (see get_file_key()) of the problem and domain file."""
+        return (get_file_key(self._problem_entry or self.problem_file),
+                get_file_key(self._domain_entry or self.domain_file))
+
+    def __lt__(self, other):
+        return self.problem_file < other.problem_file
+
+    def __le__(self, other):
+        return self.problem_file <= other.problem_file
+
+    def __repr__(self):
+        return str(self)
+
+    def __str__(self):
+        return f"<Task {self.problem_file}>"
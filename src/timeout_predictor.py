@@ -0,0 +1,65 @@
+"""Predict whether the planners will fail to solve a generated task.
+
+The predictor is a random forest that is trained online on the tasks
+evaluated so far. Its inputs are the parameters of the configuration and
+the size features of the generated task (see features.py).
+"""
+
+import logging
+import threading
+
+from sklearn.ensemble import RandomForestClassifier
+
+
+class TimeoutPredictor:
+    def __init__(self, min_samples=20, retrain_interval=10, random_seed=0):
+        self.min_samples = min_samples
+        self.retrain_interval = retrain_interval
+        self.random_seed = random_seed
+        self._parameter_names = None
+        # Numeric codes for non-numeric parameter values.
+        self._codes = {}
+        self._inputs = []
+        self._labels = []
+        self._model = None
+        self._num_samples_at_training = 0
+        self._lock = threading.Lock()
+
+    def _encode_value(self, value):
+        if isinstance(value, (int, float)):
+            return float(value)
+        return float(self._codes.setdefault(str(value), len(self._codes)))
+
+    def _encode(self, cfg, task_features):
+        if self._parameter_names is None:
+            self._parameter_names = sorted(cfg)
+        parameters = [self._encode_value(cfg.get(name, -1)) for name in self._parameter_names]
+        return parameters + [float(value) for value in task_features]
+
+    def add(self, cfg, task_features, solved):
+        """Add the outcome of an evaluated task and retrain the model if needed."""
+        self.add_many([(cfg, task_features, solved)])
+
+    def add_many(self, outcomes):
+        """Add (cfg, task features, solved) triples and retrain the model at most once."""
+        with self._lock:
+            for cfg, task_features, solved in outcomes:
+                self._inputs.append(self._encode(cfg, task_features))
+                self._labels.append(not solved)
+            num_samples = len(self._labels)
+            if (num_samples >= self.min_samples and len(set(self._labels)) == 2 and
+                    num_samples - self._num_samples_at_training >= self.retrain_interval):
+                model = RandomForestClassifier(n_estimators=50, random_state=self.random_seed)
+                model.fit(self._inputs, self._labels)
+                self._model = model
+                self._num_samples_at_training = num_samples
+                logging.debug(f"Trained timeout predictor on {num_samples} tasks")
+
+    def predict_failure_probability(self, cfg, task_features):
+        """Return the predicted probability that no planner solves the task,
+        or None if there is not enough training data yet."""
+        with self._lock:
+            if self._model is None:
+                return None
+            [probabilities] = self._model.predict_proba([self._encode(cfg, task_features)])
+            return float(probabilities[list(self._model.classes_).index(True)])
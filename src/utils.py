@@ -4,10 +4,16 @@ import shutil
 import sys
 
 
+RUNTIME_BOUNDS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 50000, float("inf")]
+
+
+def get_plan_dir(output_dir, parameters, seed):
+    return Path(output_dir) / join_parameters(parameters) / str(seed)
+
+
 def generate_input_files(generators_dir, domain, parameters, seed, output_dir, timeout=None):
     # Write problem file.
-    task_name = join_parameters(parameters)
-    plan_dir = Path(output_dir) / task_name / str(seed)
+    plan_dir = get_plan_dir(output_dir, parameters, seed)
     shutil.rmtree(plan_dir, ignore_errors=True)
     plan_dir.mkdir(parents=True)
     problem_file = plan_dir / "problem.pddl"
@@ -27,24 +33,58 @@ def generate_input_files(generators_dir, domain, parameters, seed, output_dir, t
     return plan_dir
 
 
-def collect_task(domain, cfg, seed, srcdir, destdir, copy_logs=False):
+def collect_task(domain, cfg, seed, srcdir, destdir, copy_logs=False, write_readme=True, copy_domain=True):
+    """Copy the task to destdir/domain.
+
+    Pass copy_domain=False if the shared domain file of the domain has been
+    copied with copy_domain_file() already. Per-instance domain files are
+    always copied.
+    """
     cfg_string = join_parameters(cfg)
     problem_name = f"p-{cfg_string}-{seed}.pddl"
     target_dir = destdir / domain.name
     target_dir.mkdir(parents=True, exist_ok=True)
     shutil.copy2(srcdir / "problem.pddl", target_dir / problem_name)
     if copy_logs:
-        try:
-            shutil.copy2(srcdir / "run.log", target_dir / f"p-{cfg_string}-{seed}.log")
-        except FileNotFoundError:
-            shutil.copy2(srcdir / "run.log.xz", target_dir / f"p-{cfg_string}-{seed}.log.xz")
+        copy_planner_logs(srcdir, target_dir, f"p-{cfg_string}-{seed}")
+
+    if copy_domain or domain.uses_per_instance_domain_file():
+        copy_domain_file(domain, cfg, seed, srcdir, destdir)
+
+    if write_readme:
+        write_readme_file(target_dir, cfg)
 
-    # Copy domain file.
+
+def copy_planner_logs(srcdir, target_dir, prefix):
+    """Copy the planner logs to target_dir/prefix.log(.xz).
+
+    Portfolio runs have one subdirectory with a log per planner, which we
+    copy to target_dir/prefix-planner.log(.xz). Missing logs are skipped.
+    """
+    log_dirs = [(srcdir, prefix)] + [
+        (path, f"{prefix}-{path.name}") for path in sorted(srcdir.iterdir()) if path.is_dir()]
+    num_copied = 0
+    for log_dir, name in log_dirs:
+        for suffix in ["", ".xz"]:
+            log_file = log_dir / f"run.log{suffix}"
+            if log_file.is_file():
+                shutil.copy2(log_file, target_dir / f"{name}.log{suffix}")
+                num_copied += 1
+                break
+    if not num_copied:
+        logging.warning(f"No planner logs in {srcdir}")
+
+
+def copy_domain_file(domain, cfg, seed, srcdir, destdir):
+    target_dir = destdir / domain.name
+    target_dir.mkdir(parents=True, exist_ok=True)
     output_domain_filename = "domain.pddl"
     if domain.uses_per_instance_domain_file():
-        output_domain_filename = f"domain-p-{cfg_string}-{seed}.pddl"
+        output_domain_filename = f"domain-p-{join_parameters(cfg)}-{seed}.pddl"
     shutil.copy2(srcdir / "domain.pddl", target_dir / output_domain_filename)
 
+
+def write_readme_file(target_dir, cfg):
     # Write information about parameters.
     order = ", ".join(str(k) for k in sorted(cfg))
     with open(target_dir / "README", "w") as f:
@@ -63,6 +103,12 @@ def join_parameters(parameters: dict):
     return "-".join(format_value(value) for _, value in sorted(parameters.items()))
 
 
+def get_runtime_bound(runtime):
+    for bound in RUNTIME_BOUNDS:
+        if runtime <= bound:
+            return bound
+
+
 def check_generators_dir(generators_dir, domains):
     if not generators_dir.exists():
         sys.exit(f"Error: generators directory not found: {generators_dir}")
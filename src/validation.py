@@ -0,0 +1,50 @@
+"""Validate plans with VAL outside of the planner runs."""
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import subprocess
+
+
+VALIDATION_MODES = ["inline", "off", "deferred"]
+
+
+def validate_plan(plan_dir, plan_file="sas_plan"):
+    """Validate the plan in the given directory and return True iff VAL accepts it."""
+    with open(plan_dir / "validate.log", "w") as log:
+        retcode = subprocess.call(
+            ["validate", "domain.pddl", "problem.pddl", plan_file],
+            cwd=plan_dir,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+    return retcode == 0
+
+
+class DeferredValidator:
+    """Validate plans in a background thread pool.
+
+    *callback(plan_dir, valid)* is called from a worker thread once the
+    validation of *plan_dir* has finished. If VAL cannot be run, *valid*
+    is None, so the run is still kept.
+    """
+
+    def __init__(self, jobs, callback):
+        self._executor = ThreadPoolExecutor(max_workers=jobs)
+        self._callback = callback
+
+    def submit(self, plan_dir, planner_dirs):
+        self._executor.submit(self._validate, plan_dir, planner_dirs)
+
+    def _validate(self, plan_dir, planner_dirs):
+        try:
+            valid = all(validate_plan(planner_dir) for planner_dir in planner_dirs)
+        except Exception:
+            logging.exception(f"Failed to validate plans in {plan_dir}")
+            valid = None
+        try:
+            self._callback(plan_dir, valid)
+        except Exception:
+            logging.exception(f"Failed to store validation result for {plan_dir}")
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,56 @@
+from pathlib import Path
+import sys
+
+import pytest
+
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC))
+
+
+BLOCKSWORLD_DOMAIN = """\
+(define (domain blocksworld)
+  (:requirements :strips)
+  (:predicates (clear ?x) (on-table ?x) (arm-empty) (holding ?x) (on ?x ?y))
+  (:action pickup
+    :parameters (?ob)
+    :precondition (and (clear ?ob) (on-table ?ob) (arm-empty))
+    :effect (and (holding ?ob) (not (clear ?ob)) (not (on-table ?ob)) (not (arm-empty))))
+  (:action putdown
+    :parameters (?ob)
+    :precondition (holding ?ob)
+    :effect (and (clear ?ob) (arm-empty) (on-table ?ob) (not (holding ?ob))))
+  (:action stack
+    :parameters (?ob ?underob)
+    :precondition (and (clear ?underob) (holding ?ob))
+    :effect (and (arm-empty) (clear ?ob) (on ?ob ?underob) (not (clear ?underob)) (not (holding ?ob))))
+  (:action unstack
+    :parameters (?ob ?underob)
+    :precondition (and (on ?ob ?underob) (clear ?ob) (arm-empty))
+    :effect (and (holding ?ob) (clear ?underob) (not (on ?ob ?underob)) (not (clear ?ob)) (not (arm-empty)))))
+"""
+
+
+def make_blocksworld_problem(blocks, name="p"):
+    """Return a problem that stacks the given blocks (bottom first) from the table."""
+    objects = " ".join(blocks)
+    init = " ".join(f"(on-table {b}) (clear {b})" for b in blocks)
+    goal = " ".join(f"(on {upper} {lower})" for lower, upper in zip(blocks, blocks[1:]))
+    return (f"(define (problem {name}) (:domain blocksworld)\n"
+            f"  (:objects {objects})\n"
+            f"  (:init (arm-empty) {init})\n"
+            f"  (:goal (and {goal})))\n")
+
+
+@pytest.fixture
+def write_task(tmp_path):
+    """Write a Blocksworld task and return the paths of its domain and problem files."""
+    def write(blocks=("a", "b", "c"), directory=None, problem_name="problem.pddl", name="p"):
+        directory = Path(directory or tmp_path)
+        directory.mkdir(parents=True, exist_ok=True)
+        domain_file = directory / "domain.pddl"
+        problem_file = directory / problem_name
+        domain_file.write_text(BLOCKSWORLD_DOMAIN)
+        problem_file.write_text(make_blocksworld_problem(list(blocks), name=name))
+        return domain_file, problem_file
+    return write
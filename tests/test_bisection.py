@@ -0,0 +1,53 @@
+import math
+
+import pytest
+
+import bisection
+
+
+def _make_evaluate(runtimes):
+    evaluated = []
+
+    def evaluate(value):
+        evaluated.append(value)
+        return runtimes[value]
+    return evaluate, evaluated
+
+
+def test_median_runtime():
+    assert bisection.get_median_runtime([3, None, 1]) == 3
+    assert bisection.get_median_runtime([None, None, 1]) == math.inf
+
+
+def test_find_value_for_runtime():
+    values = list(range(1, 101))
+    evaluate, evaluated = _make_evaluate({value: 2 ** (value / 10) for value in values})
+    value, runtime = bisection.find_value_for_runtime(values, evaluate, target_runtime=100)
+    # 2 ** 6.6 is closest to 100.
+    assert value == 66
+    assert runtime == pytest.approx(2 ** 6.6)
+    assert len(evaluated) == len(set(evaluated)) < 20
+
+
+def test_unsolvable_values_are_too_hard():
+    values = [1, 2, 3, 4]
+    evaluate, _ = _make_evaluate({1: 1, 2: 5, 3: math.inf, 4: math.inf})
+    assert bisection.find_value_for_runtime(values, evaluate, target_runtime=100) == (2, 5)
+
+
+def test_all_values_too_easy():
+    values = [1, 2, 3]
+    evaluate, evaluated = _make_evaluate({1: 1, 2: 2, 3: 3})
+    assert bisection.find_value_for_runtime(values, evaluate, target_runtime=100) == (3, 3)
+    assert sorted(evaluated) == values
+
+
+def test_smallest_value_too_hard():
+    evaluate, evaluated = _make_evaluate({1: 500, 2: 1000})
+    assert bisection.find_value_for_runtime([1, 2], evaluate, target_runtime=10) == (1, 500)
+    assert evaluated == [1]
+
+
+def test_no_values():
+    with pytest.raises(ValueError):
+        bisection.find_value_for_runtime([], lambda value: 1, target_runtime=10)
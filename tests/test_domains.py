@@ -0,0 +1,46 @@
+import pytest
+
+pytest.importorskip("ConfigSpace")
+
+from ConfigSpace import ConfigurationSpace
+from ConfigSpace.util import generate_grid
+
+import domains
+
+
+def test_log_int_values():
+    attribute = domains.get_log_int("n", lower=1, upper=100, num_values=8)
+    assert domains.get_values(attribute) == [1, 2, 4, 7, 14, 27, 52, 100]
+    assert attribute.default_value == 1
+
+
+def test_log_int_drops_duplicate_values():
+    attribute = domains.get_log_int("n", lower=1, upper=4, num_values=10)
+    assert domains.get_values(attribute) == [1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("lower, upper, num_values", [(0, 10, 5), (10, 10, 5), (1, 10, 1)])
+def test_invalid_log_int(lower, upper, num_values):
+    with pytest.raises(ValueError):
+        domains.get_log_int("n", lower, upper, num_values)
+
+
+def test_get_values():
+    assert domains.get_values(domains.get_int("n", lower=2, upper=8, step_size=3)) == [2, 5, 8]
+    assert domains.get_values(domains.get_ordinal("n", [3, 5, 10])) == [3, 5, 10]
+    with pytest.raises(ValueError):
+        domains.get_values(domains.get_enum("kind", ["a", "b"]))
+
+
+def test_grid_over_ordinal_parameters():
+    cs = ConfigurationSpace()
+    cs.add_hyperparameters([domains.get_ordinal("a", [1, 2, 4]), domains.get_log_int("b", 1, 10, 3)])
+    grid = {(cfg["a"], cfg["b"]) for cfg in generate_grid(cs)}
+    assert grid == {(a, b) for a in [1, 2, 4] for b in [1, 3, 10]}
+
+
+def test_domains_use_tmp_files():
+    all_domains = domains.get_domains()
+    assert all_domains["pathways"].uses_tmp_files()
+    assert not all_domains["blocksworld"].uses_tmp_files()
+    assert domains.get_values(all_domains["pathways"].get_attribute("reactions"))[::10] == [10, 100, 1000]
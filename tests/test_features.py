@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+
+import features
+from conftest import make_blocksworld_problem
+
+
+def test_extract_features(write_task):
+    domain_file, problem_file = write_task(blocks=["a", "b", "c"])
+    values = dict(zip(features.FEATURES, features.extract_features(domain_file, problem_file)))
+    assert values["objects"] == 3
+    # arm-empty plus on-table and clear for each block.
+    assert values["init_facts"] == 7
+    assert values["goal_atoms"] == 2
+    assert values["domain_predicates"] == 5
+    assert values["domain_actions"] == 4
+    assert values["problem_bytes"] == os.path.getsize(problem_file)
+
+
+def _get_feature(feature_file, key, name):
+    keys, columns = features.load_features(feature_file)
+    return columns[name][keys.index(key)]
+
+
+def test_update_feature_file_is_incremental(tmp_path, write_task):
+    benchmarks = tmp_path / "benchmarks"
+    feature_file = tmp_path / "features.npz"
+    write_task(blocks=["a", "b"], directory=benchmarks / "bw", problem_name="p1.pddl")
+    assert features.update_feature_file(benchmarks, feature_file, jobs=1) == (1, 1)
+    assert features.update_feature_file(benchmarks, feature_file, jobs=1) == (1, 0)
+
+    (benchmarks / "bw" / "p2.pddl").write_text(make_blocksworld_problem(["a", "b", "c"]))
+    assert features.update_feature_file(benchmarks, feature_file, jobs=1) == (2, 1)
+
+    (benchmarks / "bw" / "p1.pddl").unlink()
+    assert features.update_feature_file(benchmarks, feature_file, jobs=1) == (1, 0)
+    keys, _ = features.load_features(feature_file)
+    assert keys == ["bw/p2.pddl"]
+
+
+def test_changed_files_are_scanned_again(tmp_path, write_task):
+    benchmarks = tmp_path / "benchmarks"
+    feature_file = tmp_path / "features.npz"
+    _, problem_file = write_task(blocks=["a", "b"], directory=benchmarks)
+    features.update_feature_file(benchmarks, feature_file, jobs=1)
+    assert _get_feature(feature_file, "problem.pddl", "objects") == 2
+
+    # Overwrite the problem in place, like collect-instances.py does.
+    problem_file.write_text(make_blocksworld_problem(["a", "b", "c", "d"]))
+    assert features.update_feature_file(benchmarks, feature_file, jobs=1) == (1, 1)
+    assert _get_feature(feature_file, "problem.pddl", "objects") == 4
+
+
+def test_changed_domain_file_invalidates_its_tasks(tmp_path, write_task):
+    benchmarks = tmp_path / "benchmarks"
+    feature_file = tmp_path / "features.npz"
+    domain_file, _ = write_task(directory=benchmarks)
+    features.update_feature_file(benchmarks, feature_file, jobs=1)
+    domain_file.write_text(domain_file.read_text().replace("(:action putdown", "(:action put-down"))
+    assert features.update_feature_file(benchmarks, feature_file, jobs=1) == (1, 1)
+
+
+def test_broken_and_orphaned_tasks(tmp_path, write_task):
+    benchmarks = tmp_path / "benchmarks"
+    feature_file = tmp_path / "features.npz"
+    write_task(directory=benchmarks)
+    (benchmarks / "broken.pddl").write_text("(define (problem broken")
+    (benchmarks / "orphan").mkdir()
+    (benchmarks / "orphan" / "p.pddl").write_text("(define (problem p))")
+    assert features.update_feature_file(benchmarks, feature_file, jobs=1) == (2, 2)
+    keys, columns = features.load_features(feature_file)
+    assert keys == ["broken.pddl", "problem.pddl"]
+    assert np.all(columns["objects"] == [-1, 3])
+
+
+def test_feature_files_without_file_keys_are_rebuilt(tmp_path, write_task):
+    benchmarks = tmp_path / "benchmarks"
+    feature_file = tmp_path / "features.npz"
+    write_task(directory=benchmarks)
+    features.update_feature_file(benchmarks, feature_file, jobs=1)
+    keys, columns = features.load_features(feature_file)
+    np.savez_compressed(feature_file, task=np.array(keys), **columns)
+    assert features.update_feature_file(benchmarks, feature_file, jobs=1) == (1, 1)
@@ -0,0 +1,69 @@
+import re
+
+import fingerprint
+
+
+def rename(content, mapping):
+    return re.sub(r"\b(" + "|".join(mapping) + r")\b", lambda match: mapping[match.group()], content)
+
+
+def write_problem(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content)
+    return path
+
+
+def test_renamed_objects_are_isomorphic(write_task, tmp_path):
+    domain_file, problem1 = write_task(["a", "b", "c"])
+    problem2 = write_problem(
+        tmp_path, "renamed.pddl", rename(problem1.read_text(), {"a": "x", "b": "y", "c": "z"}))
+    assert fingerprint.compute_fingerprint(domain_file, problem1) == \
+        fingerprint.compute_fingerprint(domain_file, problem2)
+    graph1 = fingerprint.build_object_graph(problem1)
+    graph2 = fingerprint.build_object_graph(problem2)
+    assert fingerprint.find_isomorphism(graph1, graph2) == {"a": "x", "b": "y", "c": "z"}
+
+
+def test_permuted_objects_are_isomorphic(write_task, tmp_path):
+    # Stacking c on b on a is the same task as stacking a on c on b up to renaming.
+    domain_file, problem1 = write_task(["a", "b", "c"], problem_name="p1.pddl")
+    _, problem2 = write_task(["b", "c", "a"], problem_name="p2.pddl")
+    graph1 = fingerprint.build_object_graph(problem1)
+    graph2 = fingerprint.build_object_graph(problem2)
+    assert fingerprint.find_isomorphism(graph1, graph2) == {"a": "b", "b": "c", "c": "a"}
+
+
+def test_different_structure_is_not_isomorphic(write_task, tmp_path):
+    domain_file, problem1 = write_task(["a", "b", "c"], problem_name="p1.pddl")
+    # Same objects and number of facts, but a block should be on itself.
+    problem2 = write_problem(tmp_path, "p2.pddl", problem1.read_text().replace("(on c b)", "(on c c)"))
+    assert fingerprint.compute_fingerprint(domain_file, problem1) != \
+        fingerprint.compute_fingerprint(domain_file, problem2)
+    graph1 = fingerprint.build_object_graph(problem1)
+    graph2 = fingerprint.build_object_graph(problem2)
+    assert fingerprint.find_isomorphism(graph1, graph2) is None
+
+
+def test_find_isomorphism_needs_search():
+    # Two triangles and a hexagon are indistinguishable by colour refinement.
+    def cycle(nodes):
+        return {("edge", (u, v)) for u, v in zip(nodes, nodes[1:] + nodes[:1])} | \
+            {("edge", (v, u)) for u, v in zip(nodes, nodes[1:] + nodes[:1])}
+    objects = {name: "object" for name in "abcdef"}
+    triangles = fingerprint.ObjectGraph(objects, cycle(list("abc")) | cycle(list("def")))
+    hexagon = fingerprint.ObjectGraph(objects, cycle(list("abcdef")))
+    relabelled = fingerprint.ObjectGraph(objects, cycle(list("bdf")) | cycle(list("ace")))
+    assert fingerprint.compute_colours(triangles)[0] == fingerprint.compute_colours(hexagon)[0]
+    assert fingerprint.find_isomorphism(triangles, hexagon) is None
+    mapping = fingerprint.find_isomorphism(triangles, relabelled)
+    assert {(mapping[u], mapping[v]) for _, (u, v) in triangles.facts} == \
+        {args for _, args in relabelled.facts}
+    assert fingerprint.find_isomorphism(triangles, relabelled, max_steps=1) is None
+
+
+def test_partition_group(write_task, tmp_path):
+    domain_file, problem1 = write_task(["a", "b", "c"], problem_name="p1.pddl")
+    _, problem2 = write_task(["c", "a", "b"], problem_name="p2.pddl")
+    problem3 = write_problem(tmp_path, "p3.pddl", problem1.read_text().replace("(on c b)", "(on c c)"))
+    files = [(domain_file, problem) for problem in [problem1, problem3, problem2]]
+    assert fingerprint.try_to_partition_group((7, files)) == (7, [[0, 2], [1]])
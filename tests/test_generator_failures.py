@@ -0,0 +1,44 @@
+from generator_failures import GeneratorFailures
+
+
+def test_add_and_get(tmp_path):
+    failures = GeneratorFailures(tmp_path / "failures.jsonl")
+    failures.add("blocks", {"n": 3, "m": 1}, 5, "malformed task")
+    assert failures.get("blocks", {"m": 1, "n": 3}, 5) == "malformed task"
+    assert failures.get("blocks", {"m": 1, "n": 3}, 6) is None
+    assert failures.get("gripper", {"m": 1, "n": 3}, 5) is None
+
+
+def test_timeouts_only_count_for_smaller_time_limits(tmp_path):
+    failures = GeneratorFailures(tmp_path / "failures.jsonl")
+    failures.add("blocks", {"n": 3}, 1, "timeout", timeout=60)
+    assert failures.get("blocks", {"n": 3}, 1, time_limit=30) == "timeout"
+    assert failures.get("blocks", {"n": 3}, 1, time_limit=60) == "timeout"
+    assert failures.get("blocks", {"n": 3}, 1, time_limit=120) is None
+    assert failures.get("blocks", {"n": 3}, 1) is None
+
+
+def test_reads_records_of_other_runs(tmp_path):
+    path = tmp_path / "failures.jsonl"
+    failures1 = GeneratorFailures(path)
+    failures2 = GeneratorFailures(path)
+    assert failures2.get("blocks", {"n": 3}, 1) is None
+    failures1.add("blocks", {"n": 3}, 1, "exit code 1")
+    assert failures2.get("blocks", {"n": 3}, 1) == "exit code 1"
+
+
+def test_ignores_corrupt_and_partial_lines(tmp_path):
+    path = tmp_path / "failures.jsonl"
+    GeneratorFailures(path).add("blocks", {"n": 1}, 1, "first")
+    with open(path, "a") as f:
+        f.write("{not json\n")
+    GeneratorFailures(path).add("blocks", {"n": 2}, 1, "second")
+    with open(path, "a") as f:
+        f.write('{"domain": "blocks"')
+    failures = GeneratorFailures(path)
+    assert failures.get("blocks", {"n": 1}, 1) == "first"
+    assert failures.get("blocks", {"n": 2}, 1) == "second"
+    # The partial line is read once it is complete.
+    with open(path, "a") as f:
+        f.write(', "parameters": {"n": 3}, "seed": 1, "reason": "third", "timeout": null}\n')
+    assert failures.get("blocks", {"n": 3}, 1) == "third"
@@ -0,0 +1,53 @@
+import grounding
+
+
+TYPED_DOMAIN = """\
+(define (domain logistics)
+  (:requirements :typing)
+  (:types truck airplane - vehicle package vehicle - physobj city location - object)
+  (:constants depot - location)
+  (:predicates (at ?o - physobj ?l - location) (in ?p - package ?v - vehicle) (city-of ?l - location ?c - city))
+  (:action drive
+    :parameters (?t - truck ?from ?to - location ?c - city)
+    :precondition (and (at ?t ?from) (city-of ?from ?c) (city-of ?to ?c))
+    :effect (and (not (at ?t ?from)) (at ?t ?to)))
+  (:action load
+    :parameters (?p - package ?v - (either truck airplane) ?l - location)
+    :precondition (and (at ?v ?l) (at ?p ?l))
+    :effect (and (not (at ?p ?l)) (in ?p ?v))))
+"""
+
+PROBLEM = """\
+(define (problem p) (:domain logistics)
+  (:objects t1 t2 - truck a1 - airplane p1 p2 p3 - package l1 l2 - location c1 - city)
+  (:init)
+  (:goal (and)))
+"""
+
+
+def test_count_objects_by_type(tmp_path):
+    domain_file = tmp_path / "domain.pddl"
+    domain_file.write_text(TYPED_DOMAIN)
+    domain = grounding.parse_domain(domain_file)
+    objects = domain.constants + [("t1", "truck"), ("a1", "airplane"), ("p1", "package")]
+    counts = grounding.count_objects_by_type(domain, objects)
+    assert counts == {"object": 4, "location": 1, "truck": 1, "airplane": 1, "vehicle": 2,
+                      "package": 1, "physobj": 3}
+
+
+def test_estimate_grounding_size(tmp_path):
+    domain_file = tmp_path / "domain.pddl"
+    problem_file = tmp_path / "problem.pddl"
+    domain_file.write_text(TYPED_DOMAIN)
+    problem_file.write_text(PROBLEM)
+    # 6 physobjs, 3 locations (including the constant), 3 packages, 3 vehicles, 1 city.
+    # Atoms: at 6 * 3 + in 3 * 3 + city-of 3 * 1 = 30.
+    # Actions: drive 2 * 3 * 3 * 1 + load 3 * (2 + 1) * 3 = 45.
+    assert grounding.estimate_grounding_size(domain_file, problem_file) == (30, 45)
+
+
+def test_untyped_domain(write_task):
+    domain_file, problem_file = write_task(["a", "b", "c"])
+    # 3 unary predicates, 1 binary predicate and the nullary arm-empty
+    # predicate with one instantiation. 2 unary and 2 binary actions.
+    assert grounding.estimate_grounding_size(domain_file, problem_file) == (3 * 3 + 1 + 9, 2 * 3 + 2 * 9)
@@ -0,0 +1,79 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from conftest import make_blocksworld_problem
+from hash_cache import HashCache
+import task_finder
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = HashCache(tmp_path / "cache" / "hashes.sqlite", {"raw": 1, "signature": 1})
+    yield cache
+    cache.close()
+
+
+def _find_task(directory):
+    [task] = task_finder.find_tasks([directory])
+    return task
+
+
+def test_get_cached_value(tmp_path, write_task, cache):
+    write_task(directory=tmp_path / "tasks")
+    task = _find_task(tmp_path / "tasks")
+    assert cache.get(task, "raw") is None
+    cache.put(task, "raw", "abc")
+    cache.put(task, "signature", [1, 2])
+    assert cache.get(_find_task(tmp_path / "tasks"), "raw") == "abc"
+    assert cache.get(_find_task(tmp_path / "tasks"), "signature") == (1, 2)
+
+
+def test_values_persist(tmp_path, write_task):
+    write_task(directory=tmp_path / "tasks")
+    cache = HashCache(tmp_path / "hashes.sqlite", {"raw": 1})
+    cache.put(_find_task(tmp_path / "tasks"), "raw", "abc")
+    cache.close()
+    cache = HashCache(tmp_path / "hashes.sqlite", {"raw": 1})
+    assert cache.get(_find_task(tmp_path / "tasks"), "raw") == "abc"
+    cache.close()
+
+
+def test_modified_files_invalidate_entries(tmp_path, write_task, cache):
+    domain_file, problem_file = write_task(directory=tmp_path / "tasks")
+    cache.put(_find_task(tmp_path / "tasks"), "raw", "abc")
+    problem_file.write_text(make_blocksworld_problem(["x", "y", "z"]))
+    assert cache.get(_find_task(tmp_path / "tasks"), "raw") is None
+
+    cache.put(_find_task(tmp_path / "tasks"), "raw", "def")
+    stat = domain_file.stat()
+    os.utime(domain_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert cache.get(_find_task(tmp_path / "tasks"), "raw") is None
+
+
+def test_version_bump_invalidates_entries(tmp_path, write_task):
+    write_task(directory=tmp_path / "tasks")
+    task = _find_task(tmp_path / "tasks")
+    cache = HashCache(tmp_path / "hashes.sqlite", {"raw": 1})
+    cache.put(task, "raw", "abc")
+    cache.close()
+    cache = HashCache(tmp_path / "hashes.sqlite", {"raw": 2})
+    assert cache.get(task, "raw") is None
+    cache.close()
+
+
+def test_no_extra_file_system_calls(tmp_path, write_task, cache, monkeypatch):
+    for name in ["p1.pddl", "p2.pddl", "p3.pddl"]:
+        write_task(directory=tmp_path / "tasks", problem_name=name)
+    tasks = list(task_finder.find_tasks([tmp_path / "tasks"]))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("unexpected file system call")
+
+    # All stat results come from the cached directory entries.
+    monkeypatch.setattr(Path, "resolve", fail)
+    monkeypatch.setattr(task_finder.os, "stat", fail)
+    for task in tasks:
+        cache.put(task, "raw", task.problem_file.name)
+    assert [cache.get(task, "raw") for task in tasks] == ["p1.pddl", "p2.pddl", "p3.pddl"]
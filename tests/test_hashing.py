@@ -0,0 +1,68 @@
+import hashing
+
+
+def test_multiset_hash_ignores_order():
+    hash1 = hashing.MultisetHash()
+    hash2 = hashing.MultisetHash()
+    for entry in ["a", "b", "c"]:
+        hash1.add(entry)
+    for entry in ["c", "a", "b"]:
+        hash2.add(entry)
+    assert hash1.hexdigest() == hash2.hexdigest()
+    hash2.add("a")
+    assert hash1.hexdigest() != hash2.hexdigest()
+
+
+def test_canonicalize_sorts_commutative_operators():
+    assert hashing.canonicalize(("and", ("on", "b", "a"), ("clear", "b"))) == \
+        hashing.canonicalize(("and", ("clear", "b"), ("on", "b", "a")))
+    assert hashing.canonicalize(("on", "a", "b")) != hashing.canonicalize(("on", "b", "a"))
+
+
+def test_hash_task_distinguishes_tasks(write_task, tmp_path):
+    task1 = write_task(["a", "b", "c"], directory=tmp_path / "1")
+    task2 = write_task(["a", "c", "b"], directory=tmp_path / "2")
+    assert hashing.hash_task(*task1) != hashing.hash_task(*task2)
+
+
+def test_try_to_hash_task(write_task, tmp_path):
+    domain_file, problem_file = write_task()
+    assert hashing.try_to_hash_task((3, (domain_file, problem_file))) == \
+        (3, hashing.hash_task(domain_file, problem_file))
+    broken = tmp_path / "broken.pddl"
+    broken.write_text("(define (problem p) (:init (on a b)")
+    assert hashing.try_to_hash_task((4, (domain_file, broken))) == (4, None)
+    assert hashing.try_to_hash_task((5, (domain_file, tmp_path / "missing.pddl"))) == (5, None)
+
+
+def test_try_to_hash_unparsed_task(write_task, tmp_path):
+    domain_file, problem_file = write_task()
+    index, task_hash = hashing.try_to_hash_unparsed_task((0, (domain_file, problem_file)))
+    assert index == 0 and task_hash == hashing.hash_unparsed_task(domain_file, problem_file)
+    assert hashing.try_to_hash_unparsed_task((1, (domain_file, tmp_path / "missing.pddl"))) == (1, None)
+
+
+def test_hash_task_ignores_order_and_formatting(write_task, tmp_path):
+    domain_file, problem_file = write_task(["a", "b", "c"], problem_name="p1.pddl")
+    reordered = tmp_path / "p2.pddl"
+    reordered.write_text("""\
+; Same task with other names, case, comments, whitespace and element order.
+(DEFINE (PROBLEM other) (:domain blocksworld)
+  (:objects c
+            b a)
+  (:INIT (clear c) (on-table c) (clear b) (on-table b)
+         (clear a) (on-table a) (arm-empty))  ; comment
+  (:goal (and (on c b)
+              (on b a))))
+""")
+    assert hashing.hash_task(domain_file, problem_file) == hashing.hash_task(domain_file, reordered)
+
+
+def test_hash_task_ignores_domain_formatting(write_task, tmp_path):
+    domain_file, problem_file = write_task()
+    formatted = tmp_path / "formatted-domain.pddl"
+    formatted.write_text(domain_file.read_text().upper().replace("  ", "\t"))
+    assert hashing.hash_task(domain_file, problem_file) == hashing.hash_task(formatted, problem_file)
+    changed = tmp_path / "changed-domain.pddl"
+    changed.write_text(domain_file.read_text().replace("(clear ?underob) (holding ?ob)", "(holding ?ob)"))
+    assert hashing.hash_task(domain_file, problem_file) != hashing.hash_task(changed, problem_file)
@@ -0,0 +1,72 @@
+import numpy as np
+
+import near_duplicates
+from near_duplicates import NUM_PERMUTATIONS
+
+
+def test_sketch_estimates_jaccard_similarity():
+    atoms1 = {f"init (at p{i})" for i in range(1000)}
+    atoms2 = {f"init (at p{i})" for i in range(200, 1200)}
+    similarity = (near_duplicates.compute_sketch(atoms1) == near_duplicates.compute_sketch(atoms2)).mean()
+    # The exact Jaccard similarity is 800 / 1200.
+    assert abs(similarity - 2 / 3) < 0.15
+
+
+def test_sketch_does_not_depend_on_chunk_size():
+    atoms = {f"init (at p{i})" for i in range(100)}
+    assert np.array_equal(
+        near_duplicates.compute_sketch(atoms), near_duplicates.compute_sketch(atoms, chunk_size=7))
+    assert len(near_duplicates.compute_sketch(atoms)) == NUM_PERMUTATIONS
+
+
+def test_get_atoms(write_task):
+    _, problem_file = write_task(["a", "b"])
+    assert near_duplicates.get_atoms(problem_file) == {
+        "init (arm-empty)", "init (on-table a)", "init (clear a)",
+        "init (on-table b)", "init (clear b)", "goal (on b a)"}
+
+
+def test_get_band_size():
+    assert NUM_PERMUTATIONS % near_duplicates.get_band_size(0.9) == 0
+    assert near_duplicates.get_band_size(0.5) < near_duplicates.get_band_size(0.9)
+
+
+def test_find_clusters():
+    base = {f"init (at p{i})" for i in range(500)}
+    similar = base - {"init (at p0)"} | {"init (at q0)"}
+    different = {f"init (at q{i})" for i in range(500)}
+    sketches = [near_duplicates.compute_sketch(atoms) for atoms in [base, different, similar, base]]
+    clusters = near_duplicates.find_clusters(["d"] * 4, sketches, threshold=0.9)
+    assert sorted(clusters) == [[0, 2, 3], [1]]
+
+
+def test_find_clusters_only_compares_tasks_of_same_domain():
+    sketch = near_duplicates.compute_sketch({"init (at p)"})
+    clusters = near_duplicates.find_clusters(["d1", "d2", "d1"], [sketch] * 3, threshold=0.9)
+    assert sorted(clusters) == [[0, 2], [1]]
+
+
+def test_try_to_compute_sketch(write_task, tmp_path):
+    domain_file, problem_file = write_task()
+    index, (domain_hash, sketch) = near_duplicates.try_to_compute_sketch((2, (domain_file, problem_file)))
+    assert index == 2 and len(sketch) == NUM_PERMUTATIONS
+    assert near_duplicates.try_to_compute_sketch((3, (domain_file, tmp_path / "missing.pddl"))) == (3, None)
+
+
+def test_find_clusters_does_not_chain_similar_tasks():
+    # Consecutive sketches agree on 116 of 128 values (0.91), but the first
+    # and the last sketch only agree on 104 values (0.81).
+    sketch0 = np.arange(NUM_PERMUTATIONS, dtype=np.uint64)
+    sketch1 = sketch0.copy()
+    sketch1[-12:] += 1000
+    sketch2 = sketch1.copy()
+    sketch2[:12] += 1000
+    clusters = near_duplicates.find_clusters(["d"] * 3, [sketch0, sketch1, sketch2], threshold=0.85)
+    assert clusters == [[0, 1], [2]]
+
+
+def test_find_clusters_ignores_empty_tasks():
+    empty = near_duplicates.compute_sketch(set())
+    assert near_duplicates.is_empty_sketch(empty)
+    assert not near_duplicates.is_empty_sketch(near_duplicates.compute_sketch({"goal (at p)"}))
+    assert near_duplicates.find_clusters(["d"] * 3, [empty] * 3, threshold=0.9) == [[0], [1], [2]]
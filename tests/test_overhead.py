@@ -0,0 +1,28 @@
+import overhead
+from overhead import DriverOverhead
+
+
+def test_overhead_between_evaluations(monkeypatch):
+    times = iter([0.0, 2.0, 12.0, 15.0, 25.0])
+    monkeypatch.setattr(overhead.time, "perf_counter", lambda: next(times))
+    driver_overhead = DriverOverhead()
+    driver_overhead.start()
+    driver_overhead.start_evaluation()
+    driver_overhead.end_evaluation()
+    driver_overhead.start_evaluation()
+    driver_overhead.end_evaluation()
+    assert driver_overhead.overhead == 5.0
+    assert driver_overhead.evaluation_time == 20.0
+    assert driver_overhead.evaluations == 2
+    assert str(driver_overhead) == "2 evaluations took 20s, driver overhead: 5s (20.0%)"
+
+
+def test_without_start(monkeypatch):
+    times = iter([1.0, 3.0])
+    monkeypatch.setattr(overhead.time, "perf_counter", lambda: next(times))
+    driver_overhead = DriverOverhead()
+    assert str(driver_overhead) == "0 evaluations took 0s, driver overhead: 0s (0.0%)"
+    driver_overhead.start_evaluation()
+    driver_overhead.end_evaluation()
+    assert driver_overhead.overhead == 0.0
+    assert driver_overhead.evaluation_time == 2.0
@@ -0,0 +1,70 @@
+import pytest
+
+import hashing
+import pddl_scanner
+
+
+def write(tmp_path, content, name="task.pddl"):
+    path = tmp_path / name
+    path.write_text(content)
+    return path
+
+
+def test_scan_problem(tmp_path):
+    path = write(tmp_path, """\
+(define (problem p) (:domain d)
+  (:objects a b - block c)  ; a comment (with parentheses
+  (:init (on a b) (on a b) (clear c))
+  (:goal (and (on b a) (not (clear c)))))
+""")
+    # Duplicate init facts are counted once.
+    assert pddl_scanner.scan_problem(path) == (3, 2, 2)
+
+
+@pytest.mark.parametrize("content", [
+    "(define (problem p) (:init (on a b))",
+    "(define (problem p) (:init (on a b)))) x",
+    "(problem p)",
+    "(define (problem p) :init)",
+    "",
+])
+def test_malformed_files(tmp_path, content):
+    path = write(tmp_path, content)
+    with pytest.raises(pddl_scanner.PDDLError):
+        pddl_scanner.scan_problem(path)
+
+
+def test_iter_typed_list():
+    assert list(pddl_scanner.iter_typed_list(["a", "b", "-", "block", "c"])) == [
+        ("a", "block"), ("b", "block"), ("c", "object")]
+    assert list(pddl_scanner.iter_typed_names(["a", "b", "-", "block", "c"])) == ["a", "b", "c"]
+
+
+def test_tasks_with_equal_hashes_have_equal_signatures(write_task, tmp_path):
+    domain_file, problem1 = write_task(["a", "b", "c"], problem_name="p1.pddl")
+    # Split the init section in two.
+    problem2 = write(tmp_path, problem1.read_text().replace("(:init (arm-empty)", "(:init").replace(
+        "(:goal", "(:init (arm-empty))\n  (:goal"), "p2.pddl")
+    assert hashing.hash_task(domain_file, problem1) == hashing.hash_task(domain_file, problem2)
+    assert hashing.get_task_signature(domain_file, problem1) == \
+        hashing.get_task_signature(domain_file, problem2)
+    _, problem3 = write_task(["a", "b"], problem_name="p3.pddl")
+    assert hashing.get_task_signature(domain_file, problem1) != \
+        hashing.get_task_signature(domain_file, problem3)
+    assert hashing.try_to_compute_signature((0, (domain_file, tmp_path / "missing.pddl"))) == (0, None)
+
+
+def test_iter_sections_streams_elements(tmp_path):
+    path = write(tmp_path, "(define (problem p) (:objects a - block) (:init (on a a)) (:goal (on a a)))")
+    sections = pddl_scanner.iter_sections(path)
+    assert next(sections) == ("problem", "p")
+    assert list(sections) == [
+        (":objects", "a"), (":objects", "-"), (":objects", "block"),
+        (":init", ("on", "a", "a")), (":goal", ("on", "a", "a"))]
+
+
+def test_parse_sections(write_task):
+    domain_file, _ = write_task()
+    sections = dict(pddl_scanner.parse_sections(domain_file))
+    assert sections["domain"] == ("blocksworld",)
+    assert sections[":predicates"][0] == ("clear", "?x")
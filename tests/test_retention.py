@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+import retention
+from retention import KEEP, KEEP_PROPERTIES, PRUNE
+
+
+def _make_run(tmp_path, name, runtime, size=100):
+    plan_dir = tmp_path / name
+    plan_dir.mkdir()
+    (plan_dir / "properties.json").write_text("x" * 10)
+    (plan_dir / "run.log").write_text("x" * (size - 10))
+    props = {"planner_exitcode": 0 if runtime is not None else 99, "runtime": runtime}
+    return plan_dir, props
+
+
+def test_get_size(tmp_path):
+    plan_dir, _ = _make_run(tmp_path, "a", 1, size=100)
+    (plan_dir / "sub").mkdir()
+    (plan_dir / "sub" / "file").write_text("x" * 5)
+    assert retention.get_size(plan_dir) == 105
+
+
+def test_get_size_counts_hard_links_once(tmp_path):
+    plan_dir, _ = _make_run(tmp_path, "a", 1, size=100)
+    for planner in ["lama", "fdss"]:
+        (plan_dir / planner).mkdir()
+        os.link(plan_dir / "run.log", plan_dir / planner / "run.log")
+    assert retention.get_size(plan_dir) == 100
+
+
+def test_is_solved():
+    assert retention.is_solved({"planner_exitcode": 0})
+    assert not retention.is_solved({"planner_exitcode": 0, "plan_valid": False})
+    assert not retention.is_solved({"planner_exitcode": None})
+
+
+def test_invalid_policies():
+    with pytest.raises(ValueError):
+        retention.RetentionPolicy("some")
+    with pytest.raises(ValueError):
+        retention.RetentionPolicy("top-k")
+
+
+@pytest.mark.parametrize("policy, prune_failed, action", [
+    ("all", False, KEEP), ("solved", False, KEEP_PROPERTIES), ("all", True, PRUNE)])
+def test_failed_runs(tmp_path, policy, prune_failed, action):
+    plan_dir, props = _make_run(tmp_path, "a", None)
+    policy = retention.RetentionPolicy(policy, prune_failed=prune_failed)
+    assert policy.add(plan_dir, props) == [(action, plan_dir, props)]
+
+
+def test_top_k_keeps_slowest_runs_per_bucket(tmp_path):
+    policy = retention.RetentionPolicy("top-k", top_k=2)
+    runs = {name: _make_run(tmp_path, name, runtime) for name, runtime in
+            [("a", 11), ("b", 15), ("c", 12), ("d", 150)]}
+    assert policy.add(*runs["a"])[0][0] == KEEP
+    assert policy.add(*runs["b"])[0][0] == KEEP
+    # The fastest run in the bucket (10, 20] is evicted.
+    actions = policy.add(*runs["c"])
+    assert [(action, path.name) for action, path, _ in actions] == [(KEEP, "c"), (PRUNE, "a")]
+    assert policy.add(*runs["d"]) == [(KEEP,) + runs["d"]]
+    # The new run itself may be the fastest one.
+    plan_dir, props = _make_run(tmp_path, "e", 11.5)
+    assert policy.add(plan_dir, props) == [(PRUNE, plan_dir, props)]
+
+
+def test_disk_quota_prunes_failed_runs_first(tmp_path):
+    policy = retention.RetentionPolicy("all", disk_quota=250)
+    failed = _make_run(tmp_path, "failed", None)
+    policy.add(*failed)
+    policy.add(*_make_run(tmp_path, "a", 1.5))
+    actions = policy.add(*_make_run(tmp_path, "b", 1.6))
+    assert [(action, path.name) for action, path, _ in actions] == [(KEEP, "b"), (PRUNE, "failed")]
+    assert policy.get_total_size() == 200
+
+
+def test_disk_quota_prunes_fastest_run_of_largest_bucket(tmp_path):
+    policy = retention.RetentionPolicy("all", disk_quota=250)
+    for name, runtime in [("a", 1.5), ("b", 1.2), ("c", 150)]:
+        actions = policy.add(*_make_run(tmp_path, name, runtime))
+    assert [(action, path.name) for action, path, _ in actions] == [(KEEP, "c"), (PRUNE, "b")]
@@ -0,0 +1,93 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from run_index import RunIndex
+
+
+def write_run(expdir, name, seed, exitcode=0, runtime=10.0, plan_valid=None, problem="(define (problem p))"):
+    plan_dir = expdir / "smac-output-bw" / "run_0" / "plan" / name / str(seed)
+    plan_dir.mkdir(parents=True, exist_ok=True)
+    (plan_dir / "problem.pddl").write_text(problem)
+    props = {"domain": "bw", "parameters": {"n": int(name)}, "seed": seed,
+             "planner_exitcode": exitcode, "runtime": runtime}
+    if plan_valid is not None:
+        props["plan_valid"] = plan_valid
+    # Like the search, replace the file atomically.
+    tmp_file = plan_dir / "properties.json.tmp"
+    tmp_file.write_text(json.dumps(props))
+    os.replace(tmp_file, plan_dir / "properties.json")
+    return plan_dir
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = RunIndex(tmp_path / "index.sqlite")
+    yield index
+    index.close()
+
+
+def test_incremental_updates(tmp_path, index):
+    expdir = tmp_path / "exp"
+    write_run(expdir, "3", 0)
+    write_run(expdir, "4", 0)
+    assert index.update(expdir, jobs=1) == (2, 0)
+    assert index.update(expdir, jobs=1) == (0, 0)
+
+    write_run(expdir, "4", 1)
+    assert index.update(expdir, jobs=1) == (1, 0)
+
+    shutil.rmtree(expdir / "smac-output-bw" / "run_0" / "plan" / "3")
+    assert index.update(expdir, jobs=1) == (0, 1)
+    assert [run.parameters for run in index.get_solved_runs()] == [{"n": 4}, {"n": 4}]
+
+
+def test_rewritten_properties_are_indexed_again(tmp_path, index):
+    expdir = tmp_path / "exp"
+    write_run(expdir, "3", 0)
+    index.update(expdir, jobs=1)
+    assert len(index.get_solved_runs()) == 1
+    # Deferred validation rejects the plan.
+    write_run(expdir, "3", 0, plan_valid=False)
+    assert index.update(expdir, jobs=1) == (1, 0)
+    assert index.get_solved_runs() == []
+
+
+def test_unfinished_runs_are_picked_up_later(tmp_path, index):
+    expdir = tmp_path / "exp"
+    plan_dir = write_run(expdir, "3", 0)
+    properties = (plan_dir / "properties.json").read_text()
+    (plan_dir / "properties.json").unlink()
+    assert index.update(expdir, jobs=1) == (0, 0)
+    (plan_dir / "properties.json").write_text(properties)
+    assert index.update(expdir, jobs=1) == (1, 0)
+
+
+def test_solved_runs(tmp_path, index):
+    expdir = tmp_path / "exp"
+    write_run(expdir, "1", 0, runtime=0.5)
+    write_run(expdir, "2", 0, runtime=5.0, problem="(define (problem p2))")
+    write_run(expdir, "3", 0, exitcode=99, runtime=None)
+    write_run(expdir, "4", 0, plan_valid=False)
+    write_run(expdir, "5", 0, plan_valid=True)
+    index.update(expdir, jobs=2)
+    runs = index.get_solved_runs(min_runtime=1)
+    assert [(run.parameters["n"], run.runtime) for run in runs] == [(2, 5.0), (5, 10.0)]
+    assert runs[0].plan_dir == os.path.join("smac-output-bw", "run_0", "plan", "2", "0")
+    assert runs[0].problem_hash != runs[1].problem_hash
+
+
+def test_unchanged_plan_dirs_are_not_read(tmp_path, index):
+    expdir = tmp_path / "exp"
+    plan_dir = write_run(expdir, "3", 0, runtime=10.0)
+    index.update(expdir, jobs=1)
+
+    # Change the file in place and restore the modification time of the plan dir.
+    stat = plan_dir.stat()
+    properties_file = plan_dir / "properties.json"
+    properties_file.write_text(properties_file.read_text().replace("10.0", "20.0"))
+    os.utime(plan_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert index.update(expdir, jobs=1) == (0, 0)
+    assert [run.runtime for run in index.get_solved_runs()] == [10.0]
@@ -0,0 +1,83 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import signal
+import sys
+import threading
+
+import runner
+from conftest import SRC
+
+
+def _make_runner(time_limit=10, seconds_per_atom=0.0):
+    command = [sys.executable, SRC / "fake-planner.py", "--seconds-per-atom", str(seconds_per_atom),
+               "domain.pddl", "problem.pddl", "sas_plan"]
+    return runner.Runner(None, runner.Backend(command), time_limit, 1024, None)
+
+
+def test_limited_command():
+    command = _make_runner(time_limit=1.5).get_limited_command()
+    assert command[:5] == ["prlimit", "--cpu=2:3", f"--as={1024 ** 3}", "--core=0", "--"]
+
+
+def test_run_planner(tmp_path, write_task):
+    write_task()
+    assert _make_runner().run_planner(tmp_path) == 0
+    assert (tmp_path / "sas_plan").is_file()
+    assert (tmp_path / "run.log").read_text().strip() == "Solution found."
+    # Empty error logs are removed.
+    assert not (tmp_path / "run.err").exists()
+
+
+def test_cpu_limit(tmp_path, write_task):
+    write_task()
+    exitcode = _make_runner(time_limit=1, seconds_per_atom=1).run_planner(tmp_path)
+    assert exitcode in [-signal.SIGXCPU, -signal.SIGKILL]
+    assert not (tmp_path / "sas_plan").exists()
+
+
+def test_concurrent_runs(tmp_path, write_task):
+    plan_dirs = [tmp_path / str(i) for i in range(8)]
+    for plan_dir in plan_dirs:
+        write_task(directory=plan_dir)
+    planner = _make_runner(seconds_per_atom=0.001)
+    with ThreadPoolExecutor(max_workers=len(plan_dirs)) as executor:
+        assert list(executor.map(planner.run_planner, plan_dirs)) == [0] * len(plan_dirs)
+
+
+def test_instance_backend_mounts_absolute_existing_home(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(runner.subprocess, "run", lambda command, **kwargs: calls.append(command))
+    monkeypatch.chdir(tmp_path)
+    backend = runner.SingularityInstanceBackend(["run.sh"], "planner.img")
+    backend.start("smac/run_0/plan")
+    backend.stop()
+    home = tmp_path / "smac" / "run_0" / "plan"
+    assert home.is_dir()
+    assert calls[0] == ["singularity", "instance", "start", "-C", "-H", str(home), "planner.img", backend.instance]
+    assert calls[1] == ["singularity", "instance", "stop", backend.instance]
+    assert backend.env["PLANNER_INSTANCE"] == backend.instance
+    assert backend.startup_time is not None
+
+
+def test_core_pool_hands_out_each_core_once():
+    pool = runner.CorePool(cores=[2, 5])
+    with pool.reserve() as first, pool.reserve() as second:
+        assert {first, second} == {2, 5}
+        waiting = []
+        thread = threading.Thread(target=lambda: waiting.append(pool.reserve().__enter__()))
+        thread.start()
+        thread.join(timeout=0.1)
+        # All cores are in use, so the third run waits.
+        assert thread.is_alive()
+    thread.join()
+    assert waiting[0] in {2, 5}
+
+
+def test_pinned_runs(tmp_path, write_task):
+    plan_dirs = [tmp_path / str(i) for i in range(4)]
+    for plan_dir in plan_dirs:
+        write_task(directory=plan_dir)
+    planner = _make_runner()
+    planner.cores = runner.CorePool(cores=[min(os.sched_getaffinity(0))])
+    with ThreadPoolExecutor(max_workers=len(plan_dirs)) as executor:
+        assert list(executor.map(planner.run_planner, plan_dirs)) == [0] * len(plan_dirs)
@@ -0,0 +1,93 @@
+import json
+import os
+import threading
+
+import seen_tasks
+
+
+HASH = "ab" + "0" * 62
+
+
+def test_claim_once(tmp_path):
+    tasks = seen_tasks.SeenTasks(tmp_path)
+    assert tasks.claim(HASH)
+    assert not tasks.claim(HASH)
+    assert not seen_tasks.SeenTasks(tmp_path).claim(HASH)
+
+
+def test_result_is_shared(tmp_path):
+    tasks = seen_tasks.SeenTasks(tmp_path)
+    tasks.claim(HASH)
+    tasks.set_result(HASH, -12.5)
+    assert seen_tasks.SeenTasks(tmp_path).get_result(HASH) == -12.5
+    assert not tasks.claim(HASH)
+
+
+def test_get_result_waits_for_owner(tmp_path):
+    tasks = seen_tasks.SeenTasks(tmp_path)
+    tasks.claim(HASH)
+    timer = threading.Timer(0.1, tasks.set_result, [HASH, 100])
+    timer.start()
+    assert tasks.get_result(HASH, interval=0.01) == 100
+    timer.join()
+
+
+def test_release_unblocks_waiters(tmp_path):
+    tasks = seen_tasks.SeenTasks(tmp_path)
+    tasks.claim(HASH)
+    timer = threading.Timer(0.1, tasks.release, [HASH])
+    timer.start()
+    assert tasks.get_result(HASH, interval=0.01) is None
+    timer.join()
+    assert tasks.claim(HASH)
+
+
+def _write_marker(tmp_path, content):
+    path = tmp_path / HASH[:2] / HASH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return path
+
+
+def test_claim_of_dead_process_is_stale(tmp_path):
+    tasks = seen_tasks.SeenTasks(tmp_path)
+    # PIDs are at most 2 ** 22 on Linux.
+    _write_marker(tmp_path, json.dumps({"host": tasks.owner["host"], "pid": 2 ** 22 + 1}))
+    assert tasks.get_result(HASH, interval=0.01) is None
+    assert tasks.claim(HASH)
+
+
+def test_empty_marker_of_older_version_is_stale(tmp_path):
+    _write_marker(tmp_path, "")
+    assert seen_tasks.SeenTasks(tmp_path).claim(HASH)
+
+
+def test_old_claim_is_stale(tmp_path):
+    path = _write_marker(tmp_path, json.dumps({"host": "other-host", "pid": 1}))
+    assert not seen_tasks.SeenTasks(tmp_path, max_age=60).claim(HASH)
+    os.utime(path, (0, 0))
+    assert seen_tasks.SeenTasks(tmp_path, max_age=60).claim(HASH)
+
+
+def test_result_of_older_version(tmp_path):
+    _write_marker(tmp_path, "-3.0")
+    tasks = seen_tasks.SeenTasks(tmp_path)
+    assert tasks.get_result(HASH) == -3.0
+    assert not tasks.claim(HASH)
+
+
+def test_hash_generated_task(tmp_path, write_task):
+    write_task()
+    assert seen_tasks.try_to_hash_generated_task(tmp_path)
+    assert seen_tasks.try_to_hash_generated_task(tmp_path / "missing") is None
+
+
+def test_get_result_wait_is_bounded(tmp_path):
+    tasks = seen_tasks.SeenTasks(tmp_path)
+    tasks.claim(HASH)
+    assert tasks.get_result(HASH, interval=10, timeout=0) is None
+    assert tasks.get_result(HASH, interval=10, timeout=0.05) is None
+    # The claim stays valid.
+    assert not tasks.claim(HASH)
+    tasks.set_result(HASH, 7)
+    assert tasks.get_result(HASH, timeout=0) == 7
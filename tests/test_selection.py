@@ -0,0 +1,75 @@
+from collections import namedtuple
+import random
+
+import numpy as np
+import pytest
+
+import selection
+
+
+Run = namedtuple("Run", ["domain", "parameters", "runtime", "problem_hash"])
+
+
+def test_runtime_buckets_match_runtime_bounds():
+    import utils
+    runtimes = [0.1, 1, 1.5, 2, 99, 100, 100.5, 1e6]
+    expected = [utils.RUNTIME_BOUNDS.index(utils.get_runtime_bound(runtime)) for runtime in runtimes]
+    assert list(selection.get_runtime_buckets(np.array(runtimes))) == expected
+
+
+def test_drop_duplicates_keeps_one_run_per_hash_and_domain():
+    runs = [Run("bw", {}, 1, "h1"), Run("bw", {}, 2, "h1"), Run("bw", {}, 3, "h2"), Run("gripper", {}, 4, "h1")]
+    distinct = selection.drop_duplicates(runs, seed=0)
+    assert sorted((run.domain, run.problem_hash) for run in distinct) == [
+        ("bw", "h1"), ("bw", "h2"), ("gripper", "h1")]
+    assert selection.drop_duplicates([], seed=0) == []
+
+
+def test_parameter_matrix():
+    matrix = selection.get_parameter_matrix([
+        {"n": 2, "kind": "a"}, {"n": 4, "kind": "b"}, {"n": 6, "kind": "a"}])
+    # Columns: kind=a, kind=b, n.
+    assert matrix.tolist() == [[1, 0, 0], [0, 1, 0.5], [1, 0, 1]]
+
+
+def test_parameter_matrix_with_constant_parameter():
+    assert selection.get_parameter_matrix([{"n": 3}, {"n": 3}]).tolist() == [[0], [0]]
+
+
+def test_farthest_point_sampling():
+    points = np.array([[0.0], [0.1], [1.0], [0.5], [0.9]])
+    assert selection.farthest_point_sampling(points, 3) == [0, 2, 3]
+    assert sorted(selection.farthest_point_sampling(points, 10)) == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("k", [0, -1])
+def test_farthest_point_sampling_without_quota(k):
+    assert selection.farthest_point_sampling(np.zeros((3, 2)), k) == []
+
+
+@pytest.mark.parametrize("method", selection.SELECTION_METHODS)
+def test_select_runs_respects_quota_per_bucket(method):
+    values = random.Random(0).sample(range(100), 26)
+    runs = [Run(domain, {"n": values.pop()}, runtime, None)
+            for domain in ["bw", "gripper"] for runtime in [1.5] * 10 + [30] * 3]
+    selected = selection.select_runs(runs, 4, method)
+    assert len(selected) == 2 * (4 + 3)
+    # The selected runs keep their relative order.
+    assert [runs.index(run) for run in selected] == sorted(runs.index(run) for run in selected)
+
+
+@pytest.mark.parametrize("method", selection.SELECTION_METHODS)
+def test_select_runs_with_zero_quota(method):
+    runs = [Run("bw", {"n": n}, 1.5, None) for n in range(3)]
+    assert selection.select_runs(runs, 0, method) == []
+
+
+def test_coverage_selection_spreads_parameters():
+    runs = [Run("bw", {"n": n}, 1.5, None) for n in [1, 2, 3, 4, 50, 100]]
+    selected = selection.select_runs(runs, 3, "coverage")
+    assert [run.parameters["n"] for run in selected] == [1, 50, 100]
+
+
+def test_select_all_runs_without_limit():
+    runs = [Run("bw", {"n": n}, 1.5, None) for n in range(3)]
+    assert selection.select_runs(runs, float("inf")) == runs
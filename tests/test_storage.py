@@ -0,0 +1,55 @@
+import json
+
+import storage
+
+
+def _make_plan_dir(root, name, files=("properties.json", "problem.pddl", "run.log")):
+    plan_dir = root / name / "0"
+    plan_dir.mkdir(parents=True)
+    for filename in files:
+        (plan_dir / filename).write_text(filename)
+    return plan_dir
+
+
+def test_keep_in_output_dir(tmp_path):
+    plan_storage = storage.PlanStorage(tmp_path / "out", tmp_path / "out")
+    assert not plan_storage.uses_work_dir()
+    kept = _make_plan_dir(tmp_path / "out", "a")
+    reduced = _make_plan_dir(tmp_path / "out", "b")
+    plan_storage.keep(kept)
+    plan_storage.keep(reduced, ["properties.json"])
+    plan_storage.shutdown()
+    assert sorted(path.name for path in kept.iterdir()) == ["problem.pddl", "properties.json", "run.log"]
+    assert [path.name for path in reduced.iterdir()] == ["properties.json"]
+
+
+def test_promote_from_work_dir(tmp_path):
+    work_dir = tmp_path / "scratch"
+    plan_storage = storage.PlanStorage(work_dir, tmp_path / "out")
+    kept = _make_plan_dir(work_dir, "a")
+    reduced = _make_plan_dir(work_dir, "b")
+    plan_storage.keep(kept)
+    plan_storage.keep(reduced, ["properties.json"])
+    plan_storage.shutdown()
+    assert (tmp_path / "out" / "a" / "0" / "run.log").read_text() == "run.log"
+    assert [path.name for path in (tmp_path / "out" / "b" / "0").iterdir()] == ["properties.json"]
+    # The work dir is removed at shutdown.
+    assert not work_dir.exists()
+
+
+def test_prune_writes_summary(tmp_path):
+    summary_file = tmp_path / "pruned-runs.jsonl"
+    plan_storage = storage.PlanStorage(tmp_path / "out", tmp_path / "out", summary_file)
+    plan_dir = _make_plan_dir(tmp_path / "out", "a")
+    plan_storage.prune(plan_dir, {"runtime": None})
+    plan_storage.shutdown()
+    assert not plan_dir.exists()
+    [record] = [json.loads(line) for line in summary_file.read_text().splitlines()]
+    assert record == {"runtime": None, "plan_dir": str(plan_dir)}
+
+
+def test_failing_operations_are_logged(tmp_path, caplog):
+    plan_storage = storage.PlanStorage(tmp_path / "scratch", tmp_path / "out")
+    plan_storage.keep(tmp_path / "scratch" / "missing")
+    plan_storage.shutdown()
+    assert "Plan storage operation failed" in caplog.text
@@ -0,0 +1,63 @@
+import re
+
+import pytest
+
+import pddl_scanner
+import syntax_check
+
+
+def write_problem(tmp_path, content):
+    path = tmp_path / "problem.pddl"
+    path.write_text(content)
+    return path
+
+
+def test_valid_task(write_task):
+    assert syntax_check.check_task(*write_task()) is None
+
+
+def test_quantified_goals_and_numbers_are_allowed(write_task, tmp_path):
+    domain_file, _ = write_task()
+    problem_file = write_problem(tmp_path, """\
+(define (problem p) (:domain blocksworld)
+  (:objects a b)
+  (:init (clear a) (= (cost a) 2.5))
+  (:goal (forall (?x ?y) (or (on ?x ?y) (exists (?z) (on ?x ?z))))))
+""")
+    syntax_check.check_task(domain_file, problem_file)
+
+
+@pytest.mark.parametrize("problem, message", [
+    ("(define (problem p) (:domain blocksworld) (:objects a) (:init (clear a)) (:goal (clear a))",
+     "missing closing parenthesis"),
+    ("(define (problem p) (:domain blocksworld) (:objects a) (:goal (clear a)))",
+     "no :init section"),
+    ("(define (problem p) (:domain blocksworld) (:objects a) (:init (clear a)))",
+     "no :goal section"),
+    ("(define (problem p) (:domain blocksworld) (:objects a) (:init (on a b)) (:goal (clear a)))",
+     "undeclared object 'b'"),
+    ("(define (problem p) (:domain blocksworld) (:objects a) (:init) (:goal (forall (?x) (on ?x c))))",
+     "undeclared object 'c'"),
+    ("", "expected '('"),
+])
+def test_malformed_problems(write_task, tmp_path, problem, message):
+    domain_file, _ = write_task()
+    with pytest.raises(pddl_scanner.PDDLError, match=re.escape(message)):
+        syntax_check.check_task(domain_file, write_problem(tmp_path, problem))
+
+
+def test_domain_constants_are_declared(tmp_path):
+    domain_file = tmp_path / "domain.pddl"
+    domain_file.write_text("(define (domain d) (:constants depot) (:predicates (at ?x)))")
+    problem_file = write_problem(
+        tmp_path, "(define (problem p) (:domain d) (:objects a) (:init (at depot)) (:goal (at a)))")
+    syntax_check.check_task(domain_file, problem_file)
+
+
+def test_try_to_check_generated_task(write_task, tmp_path):
+    write_task(directory=tmp_path)
+    assert syntax_check.try_to_check_generated_task(tmp_path) is None
+    (tmp_path / "problem.pddl").write_text("")
+    assert syntax_check.try_to_check_generated_task(tmp_path) == "expected '(', found None"
+    (tmp_path / "problem.pddl").unlink()
+    assert "No such file" in syntax_check.try_to_check_generated_task(tmp_path)
@@ -0,0 +1,40 @@
+import task_finder
+
+
+def test_find_tasks_in_nested_directories(tmp_path, write_task):
+    write_task(directory=tmp_path / "a", problem_name="p01.pddl")
+    write_task(directory=tmp_path / "a", problem_name="p02.pddl")
+    write_task(directory=tmp_path / "b" / "c", problem_name="p01.pddl")
+    tasks = list(task_finder.find_tasks([tmp_path]))
+    assert [task.problem_file.relative_to(tmp_path).as_posix() for task in tasks] == [
+        "a/p01.pddl", "a/p02.pddl", "b/c/p01.pddl"]
+    assert all(task.domain_file == task.problem_file.parent / "domain.pddl" for task in tasks)
+
+
+def test_find_tasks_is_lazy(tmp_path, write_task):
+    write_task(directory=tmp_path / "a")
+    tasks = task_finder.find_tasks([tmp_path])
+    write_task(directory=tmp_path / "b")
+    assert len(list(tasks)) == 2
+
+
+def test_per_problem_domain_files(tmp_path, write_task):
+    domain_file, problem_file = write_task(problem_name="p01.pddl")
+    domain_file.rename(tmp_path / "p01-domain.pddl")
+    [task] = task_finder.find_tasks([tmp_path])
+    assert task.domain_file == tmp_path / "p01-domain.pddl"
+
+
+def test_skip_problems_without_domain_file(tmp_path, write_task, caplog):
+    write_task(directory=tmp_path / "a")
+    (tmp_path / "b").mkdir()
+    (tmp_path / "b" / "orphan.pddl").write_text("(define (problem p))")
+    tasks = list(task_finder.find_tasks([tmp_path]))
+    assert [task.problem_file for task in tasks] == [tmp_path / "a" / "problem.pddl"]
+    assert "orphan.pddl" in caplog.text
+
+
+def test_explicit_problem_file(write_task):
+    domain_file, problem_file = write_task()
+    [task] = task_finder.find_tasks([problem_file])
+    assert task.domain_file == domain_file
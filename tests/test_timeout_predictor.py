@@ -0,0 +1,35 @@
+from timeout_predictor import TimeoutPredictor
+
+
+def test_no_prediction_before_training():
+    predictor = TimeoutPredictor(min_samples=4, retrain_interval=1)
+    assert predictor.predict_failure_probability({"size": 1}, [10]) is None
+    # Without failures, there is nothing to learn.
+    for size in range(10):
+        predictor.add({"size": size}, [size * 10], solved=True)
+    assert predictor.predict_failure_probability({"size": 1}, [10]) is None
+
+
+def test_predicts_failures_of_large_tasks():
+    predictor = TimeoutPredictor(min_samples=20, retrain_interval=10)
+    for size in range(40):
+        predictor.add({"size": size, "kind": "a" if size % 2 else "b"}, [size * 10], solved=size < 20)
+    assert predictor.predict_failure_probability({"size": 35, "kind": "a"}, [350]) > 0.8
+    assert predictor.predict_failure_probability({"size": 5, "kind": "b"}, [50]) < 0.2
+
+
+def test_retrains_only_after_interval():
+    predictor = TimeoutPredictor(min_samples=2, retrain_interval=5)
+    for size in range(5):
+        predictor.add({"size": size}, [], solved=size < 3)
+    model = predictor._model
+    assert model is not None
+    predictor.add({"size": 5}, [], solved=False)
+    assert predictor._model is model
+
+
+def test_add_many_trains_once():
+    predictor = TimeoutPredictor(min_samples=20, retrain_interval=10)
+    predictor.add_many(({"size": size}, [size], size < 20) for size in range(40))
+    assert predictor._num_samples_at_training == 40
+    assert predictor.predict_failure_probability({"size": 35}, [35]) > 0.8
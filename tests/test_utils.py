@@ -0,0 +1,66 @@
+import pytest
+
+import utils
+
+
+class FakeDomain:
+    def __init__(self, name, per_instance_domain_file=False):
+        self.name = name
+        self.per_instance_domain_file = per_instance_domain_file
+
+    def uses_per_instance_domain_file(self):
+        return self.per_instance_domain_file
+
+
+def test_join_parameters():
+    assert utils.join_parameters({"b": 0.25, "a": 3, "c": "--flag", "d": ""}) == "3-0.25-flag-empty"
+
+
+@pytest.mark.parametrize("runtime, bound", [(0.1, 1), (1, 1), (1.5, 2), (100, 100), (1e9, float("inf"))])
+def test_get_runtime_bound(runtime, bound):
+    assert utils.get_runtime_bound(runtime) == bound
+
+
+def test_get_plan_dir(tmp_path):
+    assert utils.get_plan_dir(tmp_path, {"n": 3, "m": 1}, 7) == tmp_path / "1-3" / "7"
+
+
+def test_collect_task_without_shared_domain_file(tmp_path, write_task):
+    write_task(directory=tmp_path / "run")
+    destdir = tmp_path / "benchmarks"
+    utils.collect_task(FakeDomain("bw"), {"n": 3}, 7, tmp_path / "run", destdir, copy_domain=False)
+    assert sorted(path.name for path in (destdir / "bw").iterdir()) == ["README", "p-3-7.pddl"]
+    utils.copy_domain_file(FakeDomain("bw"), {"n": 3}, 7, tmp_path / "run", destdir)
+    assert (destdir / "bw" / "domain.pddl").is_file()
+
+
+def test_collect_task_copies_per_instance_domain_files(tmp_path, write_task):
+    write_task(directory=tmp_path / "run")
+    destdir = tmp_path / "benchmarks"
+    utils.collect_task(
+        FakeDomain("pathways", per_instance_domain_file=True), {"n": 3}, 7, tmp_path / "run", destdir,
+        write_readme=False, copy_domain=False)
+    assert sorted(path.name for path in (destdir / "pathways").iterdir()) == [
+        "domain-p-3-7.pddl", "p-3-7.pddl"]
+
+
+def test_collect_task_copies_single_planner_log(tmp_path, write_task):
+    write_task(directory=tmp_path / "run")
+    (tmp_path / "run" / "run.log.xz").write_text("log")
+    destdir = tmp_path / "benchmarks"
+    utils.collect_task(FakeDomain("bw"), {"n": 3}, 7, tmp_path / "run", destdir, copy_logs=True)
+    assert (destdir / "bw" / "p-3-7.log.xz").read_text() == "log"
+
+
+def test_collect_task_copies_portfolio_logs(tmp_path, write_task):
+    write_task(directory=tmp_path / "run")
+    for planner in ["lama.sif", "fdss.sif", "sse.sif"]:
+        write_task(directory=tmp_path / "run" / planner)
+    (tmp_path / "run" / "lama.sif" / "run.log.xz").write_text("lama")
+    (tmp_path / "run" / "fdss.sif" / "run.log").write_text("fdss")
+    destdir = tmp_path / "benchmarks"
+    # The log of sse.sif is missing.
+    utils.collect_task(FakeDomain("bw"), {"n": 3}, 7, tmp_path / "run", destdir, copy_logs=True)
+    assert sorted(path.name for path in (destdir / "bw").iterdir()) == [
+        "README", "domain.pddl", "p-3-7-fdss.sif.log", "p-3-7-lama.sif.log.xz", "p-3-7.pddl"]
+    assert (destdir / "bw" / "p-3-7-lama.sif.log.xz").read_text() == "lama"
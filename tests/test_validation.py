@@ -0,0 +1,48 @@
+import threading
+
+import validation
+
+
+def test_deferred_validator_reports_all_plans(tmp_path, monkeypatch):
+    monkeypatch.setattr(validation, "validate_plan", lambda planner_dir: planner_dir.name != "bad")
+    results = {}
+    lock = threading.Lock()
+
+    def callback(plan_dir, valid):
+        with lock:
+            results[plan_dir.name] = valid
+
+    validator = validation.DeferredValidator(2, callback)
+    validator.submit(tmp_path / "task1", [tmp_path / "good"])
+    validator.submit(tmp_path / "task2", [tmp_path / "good", tmp_path / "bad"])
+    validator.shutdown()
+    assert results == {"task1": True, "task2": False}
+
+
+def test_deferred_validator_survives_errors(tmp_path, monkeypatch):
+    def fail(planner_dir):
+        raise OSError("validate not found")
+
+    monkeypatch.setattr(validation, "validate_plan", fail)
+    results = []
+    validator = validation.DeferredValidator(1, lambda plan_dir, valid: results.append(valid))
+    validator.submit(tmp_path, [tmp_path])
+    validator.submit(tmp_path, [])
+    validator.shutdown()
+    # The result is unknown if VAL fails. Tasks without plans to validate are valid.
+    assert results == [None, True]
+
+
+def test_deferred_validator_survives_callback_errors(tmp_path, monkeypatch):
+    monkeypatch.setattr(validation, "validate_plan", lambda planner_dir: True)
+    results = []
+
+    def callback(plan_dir, valid):
+        results.append(valid)
+        raise OSError("properties.json missing")
+
+    validator = validation.DeferredValidator(1, callback)
+    validator.submit(tmp_path, [tmp_path])
+    validator.submit(tmp_path, [tmp_path])
+    validator.shutdown()
+    assert results == [True, True]